@@ -1,8 +1,88 @@
-import networkx as nx
-import matplotlib.pyplot as plt
+from itertools import chain
+
+import numpy as np
+
+import perfil
+
+# codigos das acoes (mesmos nomes de get_relative_direction)
+ACTIONS = ("move", "esq", "dir", "volta")
+MOVE, ESQ, DIR, VOLTA = range(4)
+
+
+def _as_cells(path):
+    # (n, 2) int64; listas de tuplas sem passar por np.asarray (lento)
+    if isinstance(path, np.ndarray):
+        return path.astype(np.int64, copy=False).reshape(-1, 2)
+    return np.fromiter(chain.from_iterable(path), dtype=np.int64, count=2 * len(path)).reshape(-1, 2)
+
+
+def _classify(v1, v2):
+    # acao de cada par (vetor anterior, vetor atual), vetorizado
+    cross = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
+    out = np.full(len(v1), VOLTA, dtype=np.uint8)
+    out[cross > 0] = ESQ
+    out[cross < 0] = DIR
+    out[(v1 == v2).all(axis=1)] = MOVE
+    return out
+
+
+def path_actions(path):
+    """Acoes (codigos de ACTIONS) de um caminho [(y, x), ...].
+
+    O item i e a acao na celula path[i + 1], entre os movimentos
+    path[i] -> path[i + 1] e path[i + 1] -> path[i + 2] (n - 2 acoes).
+    """
+    p = _as_cells(path)
+    if len(p) < 3:
+        return np.zeros(0, dtype=np.uint8)
+    v = np.diff(p, axis=0)
+    return _classify(v[:-1], v[1:])
+
+
+def batch_actions(paths):
+    """path_actions para varios caminhos numa passada so (lista de arrays)"""
+    if not len(paths):
+        return []
+    lengths = np.array([len(p) for p in paths])
+    cells = np.concatenate([_as_cells(p) for p in paths])
+    v = np.diff(cells, axis=0)
+    actions = _classify(v[:-1], v[1:])
+
+    # triplas validas comecam em i com i, i+1, i+2 no mesmo caminho
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    counts = np.maximum(lengths - 2, 0)
+    return [actions[s:s + c] for s, c in zip(starts.tolist(), counts.tolist())]
+
+
+def run_length(actions):
+    """Compacta uma sequencia de codigos em (codigos, repeticoes)"""
+    actions = np.asarray(actions)
+    if not len(actions):
+        return np.zeros(0, dtype=np.uint8), np.zeros(0, dtype=np.int64)
+    change = np.flatnonzero(actions[1:] != actions[:-1]) + 1
+    starts = np.concatenate([[0], change])
+    return actions[starts], np.diff(np.concatenate([starts, [len(actions)]]))
+
+
+def turn_instructions(path):
+    """Instrucoes para um agente real: [(acao, passos), ...].
+
+    Cada movimento do caminho recebe a acao feita antes dele (o primeiro
+    e 'move', na direcao inicial); repeticoes viram uma instrucao so, ex.
+    [("move", 3), ("esq", 1), ("move", 5)].
+    """
+    if len(path) < 2:
+        return []
+    per_move = np.concatenate([[MOVE], path_actions(path)])
+    codes, counts = run_length(per_move)
+    return [(ACTIONS[c], n) for c, n in zip(codes.tolist(), counts.tolist())]
+
 
 class VisualizadorAcoes:
     def __init__(self):
+        # networkx so quando ha desenho (path_actions etc. ficam so com numpy)
+        import networkx as nx
+
         self.G = nx.DiGraph()
         self.pos = {}
         
@@ -44,7 +124,16 @@ class VisualizadorAcoes:
         elif cross < 0: return "dir"
         else: return "volta"
 
+    def path_actions(self, path):
+        """Nomes das acoes ao longo de um caminho inteiro"""
+        return [ACTIONS[c] for c in path_actions(path).tolist()]
+
+    def turn_instructions(self, path):
+        return turn_instructions(path)
+
     def draw(self, ax, p1, p2, p3):
+        import networkx as nx
+
         ax.clear()
         
         # descobre a acao
@@ -74,6 +163,9 @@ class VisualizadorAcoes:
                              node_size=sizes, edgecolors='black')
         
         # textos
-        nx.draw_networkx_labels(self.G, self.pos, ax=ax, font_size=8)
+        labels = nx.draw_networkx_labels(self.G, self.pos, ax=ax, font_size=8)
+
+        # recriados a cada chamada (ax.clear)
+        perfil.count("artists_created", 2 + len(labels))
     
         ax.axis('off')
\ No newline at end of file
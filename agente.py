@@ -1,95 +1,413 @@
-from queue import PriorityQueue
-from collections import defaultdict
+import heapq
+from collections import namedtuple
+from collections.abc import Mapping, Set
 
-class Agente:  
-    def __init__(self, maze, start, goal):
+import numpy as np
+
+from mazeStore import passable_bytes
+
+# valor de g para nos ainda nao alcancados
+INF = np.iinfo(np.int32).max
+
+# resultado de Agente.solve()
+SolveResult = namedtuple("SolveResult", ["status", "path", "cost", "expanded"])
+
+
+class _NodeSet(Set):
+    """Conjunto (somente leitura) de nos fechados sobre o array closed"""
+
+    def __init__(self, agente):
+        self._agente = agente
+
+    def __contains__(self, node):
+        idx = self._agente._index(node)
+        return idx >= 0 and self._agente.closed[idx] != 0
+
+    def __len__(self):
+        # nos distintos; 'expanded' conta reexpansoes (bidirecional, IDA*)
+        return int(np.count_nonzero(self._agente.closed))
+
+    def __iter__(self):
+        w = self._agente.width
+        for idx in np.flatnonzero(self._agente.closed).tolist():
+            yield divmod(idx, w)
+
+
+class _ParentMap(Mapping):
+    """Dict came_from (somente leitura) sobre o array parent, em ordem de descoberta"""
+
+    def __init__(self, agente):
+        self._agente = agente
+
+    def __getitem__(self, node):
+        idx = self._agente._index(node)
+        if idx < 0 or self._agente.parent[idx] < 0:
+            raise KeyError(node)
+        return divmod(int(self._agente.parent[idx]), self._agente.width)
+
+    def __contains__(self, node):
+        idx = self._agente._index(node)
+        return idx >= 0 and self._agente.parent[idx] >= 0
+
+    def __len__(self):
+        return self._agente.discovered
+
+    def __iter__(self):
+        w = self._agente.width
+        for idx in self._agente.order[:self._agente.discovered].tolist():
+            yield divmod(idx, w)
+
+
+class _ScoreMap(Mapping):
+    """Scores g/f com semantica de defaultdict(inf) sobre um array"""
+
+    def __init__(self, agente, values):
+        self._agente = agente
+        self._values = values
+
+    def __getitem__(self, node):
+        idx = self._agente._index(node)
+        if idx < 0 or self._values[idx] == INF:
+            return float('inf')
+        return int(self._values[idx])
+
+    def __contains__(self, node):
+        idx = self._agente._index(node)
+        return idx >= 0 and self._values[idx] != INF
+
+    def __len__(self):
+        return int(np.count_nonzero(self._values != INF))
+
+    def __iter__(self):
+        w = self._agente.width
+        for idx in np.flatnonzero(self._values != INF).tolist():
+            yield divmod(idx, w)
+
+
+class Agente:
+    def __init__(self, maze, start, goal, index=None):
         self.maze = maze
         self.start = start
-        self.goal = goal   
-        
+        self.goal = goal
+
         self.PATH = 0
         self.WALL = 1
-        
+
+        # indices planos: idx = y * w + x
+        self.height, self.width = maze.shape
+        self.size = self.height * self.width
+        idx_dtype = np.int32 if self.size < 2**31 else np.int64
+
+        # celulas livres (bytes: acesso escalar rapido); reaproveita o indice se houver
+        if index is not None:
+            self._passable = index.passable
+        else:
+            self._passable = passable_bytes(maze, self.PATH)
+
         # armazena explorados
         self.path = []
-        self.explored_nodes = set()
-        
-        # Estruturas de dados do A*
-        self.open_set = PriorityQueue()
-        self.came_from = {}
-        
-        self.g_score = defaultdict(lambda: float('inf'))
-        self.g_score[self.start] = 0
-        
-        self.f_score = defaultdict(lambda: float('inf'))
-        self.f_score[self.start] = self._calculate_heuristic(self.start)
+        self.expanded = 0
+        self.discovered = 0
+        self.stale_pops = 0
+        self.current = None
+
+        # Estruturas de dados do A* e visoes com a interface antiga
+        self._init_state(idx_dtype)
+
+        # heap sem lock, com remocao preguicosa (entradas velhas sao ignoradas)
+        self.open_set = []
+
+        self._start_idx = self._index(start)
+        self._goal_idx = self._index(goal)
 
         # add no inicial
-        self.open_set.put((self.f_score[self.start], self.start))
+        s = self._start_idx
+        self.g[s] = 0
+        self.f[s] = self._calculate_heuristic(self.start)
+        heapq.heappush(self.open_set, (int(self.f[s]), s))
 
-        self.status = "searching" 
+        self.status = "searching"
+
+        # componentes diferentes: sem caminho, nem precisa buscar
+        if index is not None and not index.connected(start, goal):
+            self.open_set.clear()
+            self.status = "no_path"
+
+    def _init_state(self, idx_dtype):
+        # arrays planos do tamanho da grade
+        self.g = np.full(self.size, INF, dtype=np.int32)
+        self.f = np.full(self.size, INF, dtype=np.int32)
+        self.parent = np.full(self.size, -1, dtype=idx_dtype)
+        self.closed = np.zeros(self.size, dtype=np.uint8)
+        self.order = np.empty(self.size, dtype=idx_dtype)  # ordem de descoberta
+
+        # interface antiga (came_from, g_score, f_score, explored_nodes)
+        self.explored_nodes = _NodeSet(self)
+        self.came_from = _ParentMap(self)
+        self.g_score = _ScoreMap(self, self.g)
+        self.f_score = _ScoreMap(self, self.f)
+
+    def _index(self, node):
+        # nos que nao sao (y, x) (ex: dummies do grafo) nao pertencem a grade
+        if not isinstance(node, tuple) or len(node) != 2:
+            return -1
+        (y, x) = node
+        if 0 <= y < self.height and 0 <= x < self.width:
+            return int(y) * self.width + int(x)
+        return -1
 
     def _calculate_heuristic(self, node):
         (y1, x1) = node
         (y2, x2) = self.goal
         return abs(y1 - y2) + abs(x1 - x2)
 
-    def _get_neighbors(self, node):
-        (y, x) = node
-        neighbors = []
-        for dy, dx in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            ny, nx = y + dy, x + dx
-
-            # verifica se vizinho dentro limites labirinto
-            if 0 <= ny < self.maze.shape[0] and 0 <= nx < self.maze.shape[1]:
-
-                # verifica se vizinho = caminho ou parede
-                if self.maze[ny, nx] == self.PATH:
-                    neighbors.append((ny, nx))
-        return neighbors
-
     def _reconstruct_path(self):
-        current = self.goal
-        path = [current]
-        while current in self.came_from:
-            current = self.came_from[current]
-            path.append(current)
+        w = self.width
+        parent = self.parent
+        current = self._goal_idx
+        path = [divmod(current, w)]
+        while parent[current] >= 0:
+            current = int(parent[current])
+            path.append(divmod(current, w))
 
         # inverte lista p/ (ini -> obj)
         self.path = path[::-1]
 
-    def solve_step(self):
-        # checa status
+    def _expand(self, limit):
+        """Expande ate 'limit' nos (None = ate terminar) num laco local"""
         if self.status != "searching":
             return self.status
 
-        # se fila vazia finaliza
-        if self.open_set.empty():
+        # memoryviews: leitura/escrita escalar sem criar escalares numpy
+        g = memoryview(self.g)
+        f = memoryview(self.f)
+        parent = memoryview(self.parent)
+        closed = memoryview(self.closed)
+        order = memoryview(self.order)
+        passable = self._passable
+
+        heap = self.open_set
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+
+        w = self.width
+        size = self.size
+        goal = self._goal_idx
+        gy, gx = divmod(goal, w)
+
+        expanded = self.expanded
+        discovered = self.discovered
+        stale = self.stale_pops
+        last = -1
+        steps = 0
+
+        try:
+            while heap:
+                if limit is not None and steps >= limit:
+                    return self.status
+
+                # pega menor no
+                _, current = heappop(heap)
+                if closed[current]:
+                    stale += 1
+                    continue  # entrada velha
+
+                # add no atual explorados
+                closed[current] = 1
+                expanded += 1
+                steps += 1
+                last = current
+
+                # testa se objetivo
+                if current == goal:
+                    self._reconstruct_path()
+                    self.status = "goal_found"
+                    return self.status
+
+                # se != objetivo verifica vizinhos
+                x = current % w
+                tentative_g_score = g[current] + 1
+                for neighbor, inside in ((current + 1, x + 1 < w), (current - 1, x > 0),
+                                         (current + w, current + w < size), (current - w, current >= w)):
+                    if not inside or not passable[neighbor] or tentative_g_score >= g[neighbor]:
+                        continue
+
+                    if parent[neighbor] < 0:
+                        order[discovered] = neighbor
+                        discovered += 1
+                    parent[neighbor] = current
+                    g[neighbor] = tentative_g_score
+
+                    ny, nx = divmod(neighbor, w)
+                    f_neighbor = tentative_g_score + abs(ny - gy) + abs(nx - gx)
+                    f[neighbor] = f_neighbor
+
+                    # add vizinho a fila para explorar
+                    heappush(heap, (f_neighbor, neighbor))
+
+            # se fila vazia finaliza
             self.status = "no_path"
             return self.status
+        finally:
+            self.expanded = expanded
+            self.discovered = discovered
+            self.stale_pops = stale
+            if last >= 0:
+                self.current = divmod(last, w)
+
+    def last_triple(self):
+        """(avo, pai, filho) do ultimo no descoberto em O(1).
+
+        Equivale a pegar o ultimo item de came_from e o pai do pai (None
+        onde nao houver); antes da primeira descoberta, (None, None, start).
+        """
+        if not self.discovered:
+            return None, None, self.start
+        w = self.width
+        node = int(self.order[self.discovered - 1])
+        parent = int(self.parent[node])
+        grandparent = int(self.parent[parent])
+        return (divmod(grandparent, w) if grandparent >= 0 else None), divmod(parent, w), divmod(node, w)
+
+    @property
+    def heap_pushes(self):
+        # toda entrada da fila ja saiu (expandida ou velha) ou ainda esta nela
+        return self.expanded + self.stale_pops + len(self.open_set)
+
+    def solve_step(self):
+        # expande um no por chamada (usado pela animacao)
+        return self._expand(1)
+
+    def solve(self):
+        """Roda a busca ate o fim sem animacao e retorna o resultado"""
+        status = self._expand(None)
+        cost = len(self.path) - 1 if status == "goal_found" else None
+        return SolveResult(status, self.path, cost, self.expanded)
+
+
+class AgenteJuncoes(Agente):
+    """A* sobre o grafo de juncoes (corredores comprimidos em arestas).
 
-        # pega menor no
-        current_f, current = self.open_set.get()
+    Mesma interface do Agente; explored_nodes/came_from contem so juncoes e
+    path e expandido de volta para a sequencia completa de celulas.
+    """
 
-        # add no atual explorados
-        self.explored_nodes.add(current)
+    def __init__(self, maze, start, goal, graph=None, index=None):
+        super().__init__(maze, start, goal, index=index)
 
-        # testa se objetivo    
-        if current == self.goal:
-            self._reconstruct_path()
-            self.status = "goal_found"
+        from mazeGraph import JunctionGraph
+        self.graph = graph if graph is not None else JunctionGraph(maze)
+
+        # primeira celula do corredor usado para chegar em cada no
+        self.via = np.full(self.size, -1, dtype=self.parent.dtype)
+
+        # arestas virtuais p/ partida/objetivo no meio de corredores
+        self._extra = {}
+        s, t = self._start_idx, self._goal_idx
+        if self._passable[t] and not self.graph.is_junction(t):
+            for first in self.graph.neighbors(t):
+                end, length, before = self.graph.walk(t, first, stop=(t,))
+                self._extra.setdefault(end, []).append((t, length, before))
+        if self._passable[s] and not self.graph.is_junction(s):
+            self._extra[s] = [self.graph.walk(s, first, stop=(s, t))[:2] + (first,)
+                              for first in self.graph.neighbors(s)]
+
+    def _reconstruct_path(self):
+        w = self.width
+        parent, via = self.parent, self.via
+        current = self._goal_idx
+        cells = [current]
+        while parent[current] >= 0:
+            prev = int(parent[current])
+            # corredor prev -> current (sem prev), de tras para frente
+            cells.extend(reversed(self.graph.corridor(prev, int(via[current]), current)[:-1]))
+            cells.append(prev)
+            current = prev
+
+        # inverte lista p/ (ini -> obj)
+        self.path = [divmod(c, w) for c in reversed(cells)]
+
+    def _edges(self, cell):
+        # (destino, peso, primeira celula) das arestas que saem de cell
+        graph = self.graph
+        edges = self._extra.get(cell, [])
+        jid = graph.node_id[cell]
+        if jid >= 0:
+            lo, hi = graph.edge_ptr[jid], graph.edge_ptr[jid + 1]
+            edges = edges + list(zip(graph.edge_target[lo:hi].tolist(),
+                                     graph.edge_weight[lo:hi].tolist(),
+                                     graph.edge_first[lo:hi].tolist()))
+        return edges
+
+    def _expand(self, limit):
+        if self.status != "searching":
             return self.status
 
-        # se != objetivo verifica vizinhos    
-        for neighbor in self._get_neighbors(current):
-            tentative_g_score = self.g_score[current] + 1
-            
-            if tentative_g_score < self.g_score[neighbor]:
-                self.came_from[neighbor] = current
-                self.g_score[neighbor] = tentative_g_score
-                self.f_score[neighbor] = tentative_g_score + self._calculate_heuristic(neighbor)
-                
-                # add vizinho a fila para explorar
-                self.open_set.put((self.f_score[neighbor], neighbor))
-        
-        return self.status
\ No newline at end of file
+        g = memoryview(self.g)
+        f = memoryview(self.f)
+        parent = memoryview(self.parent)
+        via = memoryview(self.via)
+        closed = memoryview(self.closed)
+        order = memoryview(self.order)
+
+        heap = self.open_set
+        w = self.width
+        goal = self._goal_idx
+        gy, gx = divmod(goal, w)
+
+        expanded = self.expanded
+        discovered = self.discovered
+        stale = self.stale_pops
+        last = -1
+        steps = 0
+
+        try:
+            while heap:
+                if limit is not None and steps >= limit:
+                    return self.status
+
+                # pega menor no
+                _, current = heapq.heappop(heap)
+                if closed[current]:
+                    stale += 1
+                    continue  # entrada velha
+
+                closed[current] = 1
+                expanded += 1
+                steps += 1
+                last = current
+
+                # testa se objetivo
+                if current == goal:
+                    self._reconstruct_path()
+                    self.status = "goal_found"
+                    return self.status
+
+                # arestas ponderadas ate as proximas juncoes
+                g_current = g[current]
+                for neighbor, weight, first in self._edges(current):
+                    tentative_g_score = g_current + weight
+                    if tentative_g_score >= g[neighbor]:
+                        continue
+
+                    if parent[neighbor] < 0:
+                        order[discovered] = neighbor
+                        discovered += 1
+                    parent[neighbor] = current
+                    via[neighbor] = first
+                    g[neighbor] = tentative_g_score
+
+                    ny, nx = divmod(neighbor, w)
+                    f_neighbor = tentative_g_score + abs(ny - gy) + abs(nx - gx)
+                    f[neighbor] = f_neighbor
+                    heapq.heappush(heap, (f_neighbor, neighbor))
+
+            # se fila vazia finaliza
+            self.status = "no_path"
+            return self.status
+        finally:
+            self.expanded = expanded
+            self.discovered = discovered
+            self.stale_pops = stale
+            if last >= 0:
+                self.current = divmod(last, w)
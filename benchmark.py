@@ -0,0 +1,628 @@
+"""Benchmarks de desempenho do projeto.
+
+Uso:
+    python benchmark.py gen [--sizes 16 64 256] [--algorithm backtracker eller] [--braid 0.5]
+    python benchmark.py graph [--sizes 16 64 128]
+    python benchmark.py tree [--sizes 64 256 1024]
+    python benchmark.py junction [--sizes 64 256] [--seeds 20]
+    python benchmark.py lca [--size 512] [--queries 1000000]
+    python benchmark.py engines [--sizes 16 32] [--seeds 10] [--engines astar jps ...]
+    python benchmark.py actions [--size 64] [--paths 200]
+    python benchmark.py replan [--sizes 32 64 128] [--toggles 4]
+    python benchmark.py multi [--size 32] [--queries 1000] [--goals 8] [--workers 4]
+    python benchmark.py field [--sizes 64 256] [--queries 20] [--sources 1 4] [--braid 0.5]
+    python benchmark.py imports [--modules nucleo main acoes] [--budget-ms 400]
+    python benchmark.py world [--tiles 8 32] [--tile 32] [--queries 5] [--cache 256]
+    python benchmark.py lod [--sizes 32 128 256] [--frames 30]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from mazeGen import MazeGenerator
+
+
+def _timeit(fn, repeat):
+    # melhor tempo de 'repeat' execucoes
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def bench_gen(args):
+    print(f"{'algoritmo':>12} {'tamanho':>11} {'tempo (s)':>10} {'celulas/s':>14} {'ciclos':>8}")
+    for algorithm in args.algorithm:
+        for size in args.sizes:
+            def run():
+                return MazeGenerator(size, size, seed=args.seed, algorithm=algorithm,
+                                     braid=args.braid).generate()
+
+            elapsed, maze = _timeit(run, args.repeat)
+            cells = size * size
+            # passagens abertas alem das de uma arvore
+            cycles = int((maze[1::2, 2:-1:2] == 0).sum() + (maze[2:-1:2, 1::2] == 0).sum()) - (cells - 1)
+            print(f"{algorithm:>12} {f'{size}x{size}':>11} {elapsed:>10.4f} {cells / elapsed:>14,.0f} "
+                  f"{cycles:>8}")
+
+
+def _legacy_grid_graph(maze):
+    # construcao original: lacos aninhados + nx.bfs_tree (referencia)
+    import networkx as nx
+
+    G = nx.Graph()
+    h, w = maze.shape
+    for y in range(h):
+        for x in range(w):
+            if maze[y, x] == MazeGenerator.PATH:
+                node = (y, x)
+                G.add_node(node)
+                if x+1 < w and maze[y, x+1] == MazeGenerator.PATH:
+                    G.add_edge(node, (y, x+1))
+                if y+1 < h and maze[y+1, x] == MazeGenerator.PATH:
+                    G.add_edge(node, (y+1, x))
+    return G, nx.bfs_tree(G, source=(1, 1))
+
+
+def _bare_visualizer(maze):
+    from grafos import visualizadorGrafos
+
+    # so os atributos usados na construcao dos grafos
+    vis = visualizadorGrafos.__new__(visualizadorGrafos)
+    vis.maze = maze
+    vis.start = (1, 1)
+    vis.PATH = MazeGenerator.PATH
+    vis._full_grid_graph = None
+    vis._full_tree = None
+    return vis
+
+
+def _csr_tree(maze):
+    # o que o construtor do visualizadorGrafos faz hoje
+    vis = _bare_visualizer(maze)
+    vis._build_bfs_arrays()
+    return vis
+
+
+def _bulk_networkx(maze):
+    # grafo + arvore NetworkX montados em bloco a partir da CSR
+    vis = _csr_tree(maze)
+    return vis.full_grid_graph, vis.full_tree
+
+
+def bench_graph(args):
+    import grafos  # noqa: F401 (importacao fora da medicao)
+
+    print(f"{'tamanho':>11} {'original (s)':>13} {'nx em bloco (s)':>16} {'CSR (s)':>9} {'ganho CSR':>10}")
+    for size in args.sizes:
+        maze = MazeGenerator(size, size, seed=args.seed).generate()
+
+        legacy, _ = _timeit(lambda: _legacy_grid_graph(maze), args.repeat)
+        bulk, _ = _timeit(lambda: _bulk_networkx(maze), args.repeat)
+        csr, _ = _timeit(lambda: _csr_tree(maze), args.repeat)
+        print(f"{f'{size}x{size}':>11} {legacy:>13.4f} {bulk:>16.4f} {csr:>9.4f} {legacy / csr:>9.1f}x")
+
+
+def _legacy_compressed_tree(vis):
+    # construcao original: lista como fila (pop(0)) e lista de filhos por celula
+    import networkx as nx
+
+    tree, dummies = nx.DiGraph(), set()
+    queue = [vis.start]
+    visited = {vis.start}
+    tree.add_node(vis.start)
+    while queue:
+        curr = queue.pop(0)
+        for child in vis._successors(curr):
+            temp = child
+            segment = [temp]
+            while temp != vis.goal:
+                successors = vis._successors(temp)
+                if len(successors) != 1:
+                    break
+                temp = successors[0]
+                segment.append(temp)
+            if len(segment) > 2:
+                dummy = f"cut_{curr}_{temp}"
+                dummies.add(dummy)
+                tree.add_node(dummy)
+                tree.add_node(temp)
+                tree.add_edge(curr, dummy)
+                tree.add_edge(dummy, temp)
+            else:
+                tree.add_node(temp)
+                tree.add_edge(curr, temp)
+            if temp not in visited:
+                visited.add(temp)
+                queue.append(temp)
+    return tree, dummies
+
+
+def bench_tree(args):
+    import networkx as nx
+
+    print(f"{'tamanho':>11} {'celulas':>10} {'original (s)':>13} {'deque (s)':>10} "
+          f"{'us/celula':>10} {'ganho':>7} {'igual':>6}")
+    for size in args.sizes:
+        maze = MazeGenerator(size, size, seed=args.seed, algorithm=args.algorithm).generate()
+        vis = _csr_tree(maze)
+        vis.goal = (maze.shape[0] - 2, maze.shape[1] - 2)
+
+        def build():
+            vis.display_tree = nx.DiGraph()
+            vis.dummy_nodes = set()
+            vis._build_compressed_tree()
+            return vis.display_tree, vis.dummy_nodes
+
+        t_new, (tree, dummies) = _timeit(build, args.repeat)
+        cells = size * size
+        if size <= args.legacy_max:
+            t_old, (old_tree, old_dummies) = _timeit(lambda: _legacy_compressed_tree(vis), 1)
+            same = (list(tree.nodes()) == list(old_tree.nodes()) and list(tree.edges()) == list(old_tree.edges())
+                    and dummies == old_dummies)
+            old, gain, same = f"{t_old:>13.4f}", f"{t_old / t_new:>6.1f}x", "ok" if same else "ERRO"
+        else:
+            old, gain, same = f"{'-':>13}", f"{'-':>7}", "-"
+        print(f"{f'{size}x{size}':>11} {cells:>10,} {old} {t_new:>10.4f} "
+              f"{t_new * 1e6 / cells:>10.3f} {gain} {same:>6}")
+
+
+def bench_junction(args):
+    from agente import Agente, AgenteJuncoes
+    from nucleo import build_scenario
+    from mazeGraph import JunctionGraph
+
+    print(f"{'tamanho':>11} {'exp. grade':>11} {'exp. juncoes':>13} {'reducao':>8} "
+          f"{'A* grade (s)':>13} {'A* juncoes (s)':>15} {'grafo (s)':>10}")
+    for size in args.sizes:
+        exp_grid = exp_junction = 0
+        t_grid = t_junction = t_build = 0.0
+        for seed in range(args.seeds):
+            labirinto, start, goal = build_scenario(seed, size, size)
+
+            t0 = time.perf_counter()
+            exp_grid += Agente(labirinto, start, goal).solve().expanded
+            t1 = time.perf_counter()
+            graph = JunctionGraph(labirinto)
+            t2 = time.perf_counter()
+            exp_junction += AgenteJuncoes(labirinto, start, goal, graph=graph).solve().expanded
+            t3 = time.perf_counter()
+
+            t_grid += t1 - t0
+            t_build += t2 - t1
+            t_junction += t3 - t2
+
+        print(f"{f'{size}x{size}':>11} {exp_grid / args.seeds:>11.0f} {exp_junction / args.seeds:>13.0f} "
+              f"{exp_grid / max(exp_junction, 1):>7.1f}x {t_grid / args.seeds:>13.4f} "
+              f"{t_junction / args.seeds:>15.4f} {t_build / args.seeds:>10.4f}")
+
+
+def bench_lca(args):
+    import numpy as np
+    from mazeIndex import MazeIndex
+
+    maze = MazeGenerator(args.size, args.size, seed=args.seed).generate()
+
+    t0 = time.perf_counter()
+    index = MazeIndex(maze)
+    index._build_lifting()
+    t_index = time.perf_counter() - t0
+
+    # pares aleatorios de celulas livres
+    ys, xs = np.nonzero(maze == MazeGenerator.PATH)
+    pick = np.random.default_rng(args.seed).integers(len(ys), size=(args.queries, 2))
+    pairs = np.stack([ys[pick[:, 0]], xs[pick[:, 0]], ys[pick[:, 1]], xs[pick[:, 1]]], axis=1)
+
+    t_query, dist = _timeit(lambda: index.distances(pairs), args.repeat)
+    print(f"labirinto {args.size}x{args.size}: indice + lifting em {t_index:.3f}s")
+    print(f"{args.queries:,} distancias em {t_query:.3f}s ({args.queries / t_query:,.0f} consultas/s), "
+          f"media {dist.mean():.1f} passos")
+
+
+def bench_engines(args):
+    import tracemalloc
+    from buscas import make_engine
+    from nucleo import build_scenario
+
+    print(f"{'tamanho':>11} {'busca':>9} {'expandidos':>11} {'tempo (s)':>10} {'pico (KiB)':>11} {'custo':>6}")
+    for size in args.sizes:
+        scenarios = [build_scenario(seed, size, size) for seed in range(args.seeds)]
+        costs = [make_engine("astar", *s).solve().cost for s in scenarios]
+
+        for name in args.engines:
+            expanded = 0
+            elapsed = peak = 0.0
+            optimal = True
+            for scenario, cost in zip(scenarios, costs):
+                t, result = _timeit(lambda: make_engine(name, *scenario).solve(), args.repeat)
+                elapsed += t
+                expanded += result.expanded
+                optimal &= result.cost == cost
+
+                # memoria medida a parte (tracemalloc deixa tudo mais lento)
+                tracemalloc.start()
+                make_engine(name, *scenario).solve()
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+            print(f"{f'{size}x{size}':>11} {name:>9} {expanded / args.seeds:>11.0f} "
+                  f"{elapsed / args.seeds:>10.4f} {peak / 1024:>11.1f} {'ok' if optimal else 'ERRO':>6}")
+
+
+def bench_actions(args):
+    import numpy as np
+    from acoes import VisualizadorAcoes, batch_actions
+    from agente import Agente
+    from nucleo import build_scenario
+
+    paths = []
+    for seed in range(args.paths):
+        labirinto, start, goal = build_scenario(seed, args.size, args.size)
+        paths.append(Agente(labirinto, start, goal).solve().path)
+    vis = VisualizadorAcoes()
+
+    def scalar():
+        return [[vis.get_relative_direction(p[i], p[i + 1], p[i + 2]) for i in range(len(p) - 2)]
+                for p in paths]
+
+    t_scalar, _ = _timeit(scalar, args.repeat)
+    t_batch, actions = _timeit(lambda: batch_actions(paths), args.repeat)
+    arrays = [np.array(p) for p in paths]
+    t_arrays, _ = _timeit(lambda: batch_actions(arrays), args.repeat)
+    total = sum(len(a) for a in actions)
+    print(f"{len(paths)} caminhos, {total:,} acoes")
+    print(f"por tripla: {t_scalar:.4f}s   vetorizado: {t_batch:.4f}s ({t_scalar / t_batch:.1f}x)   "
+          f"vetorizado a partir de arrays: {t_arrays:.4f}s ({t_scalar / t_arrays:.1f}x)")
+
+
+def bench_replan(args):
+    import numpy as np
+    from agente import Agente
+    from nucleo import build_scenario
+    from replanejador import AgenteLPA
+
+    print(f"{'tamanho':>11} {'lote':>5} {'exp. LPA*':>10} {'exp. A*':>9} {'LPA* (s)':>9} "
+          f"{'A* (s)':>9} {'ganho':>6} {'custo':>6}")
+    for size in args.sizes:
+        rng = np.random.default_rng(args.seed)
+        exp_lpa = exp_full = 0
+        t_lpa = t_full = 0.0
+        same = True
+        for seed in range(args.seeds):
+            labirinto, start, goal = build_scenario(seed, size, size)
+            agente = AgenteLPA(labirinto, start, goal)
+            agente.solve()
+            h, w = agente.maze.shape
+            # paredes entre celulas (uma coordenada par, outra impar)
+            ys, xs = np.nonzero((np.add.outer(np.arange(h), np.arange(w)) % 2 == 1))
+            inner = (ys > 0) & (ys < h - 1) & (xs > 0) & (xs < w - 1)
+            ys, xs = ys[inner], xs[inner]
+
+            for _ in range(args.batches):
+                pick = rng.integers(len(ys), size=args.toggles)
+                changes = [((y, x), 1 - int(agente.maze[y, x]))
+                           for y, x in zip(ys[pick].tolist(), xs[pick].tolist())]
+                antes = agente.expanded
+                t0 = time.perf_counter()
+                agente.update_cells(changes)
+                result = agente.solve()
+                t_lpa += time.perf_counter() - t0
+                exp_lpa += agente.expanded - antes
+
+                t0 = time.perf_counter()
+                full = Agente(agente.maze.copy(), start, goal).solve()
+                t_full += time.perf_counter() - t0
+                exp_full += full.expanded
+                same &= result.cost == full.cost
+
+        n = args.seeds * args.batches
+        print(f"{f'{size}x{size}':>11} {args.toggles:>5} {exp_lpa / n:>10.0f} {exp_full / n:>9.0f} "
+              f"{t_lpa / n:>9.5f} {t_full / n:>9.5f} {t_full / t_lpa:>5.1f}x {'ok' if same else 'ERRO':>6}")
+
+
+def bench_multi(args):
+    import numpy as np
+    from agente import Agente
+    from nucleo import build_scenario
+    from multiagente import SharedMaze, solve_batch
+
+    labirinto, _, _ = build_scenario(args.seed, args.size, args.size)
+    rng = np.random.default_rng(args.seed)
+    ys, xs = np.nonzero(labirinto == MazeGenerator.PATH)
+    cells = list(zip(ys.tolist(), xs.tolist()))
+    starts = rng.integers(len(cells), size=args.queries)
+    # --goals N: so N objetivos distintos (0 = um objetivo aleatorio por consulta)
+    goals = rng.integers(len(cells), size=args.goals or args.queries)
+    pairs = [(cells[s], cells[goals[k % len(goals)]]) for k, s in enumerate(starts.tolist())]
+
+    t_copy, expected = _timeit(lambda: [Agente(labirinto, s, g).solve().cost for s, g in pairs], 1)
+    print(f"labirinto {args.size}x{args.size}, {args.queries:,} consultas, "
+          f"{args.goals or args.queries} objetivos, {args.workers} processos/threads")
+    print(f"{'modo':>26} {'tempo (s)':>10} {'consultas/s':>12} {'custo':>6}")
+    print(f"{'serial (copia por agente)':>26} {t_copy:>10.3f} {args.queries / t_copy:>12,.0f} {'ok':>6}")
+
+    with SharedMaze.create(labirinto) as shared:
+        for mode in ("serial", "thread", "process"):
+            for grouped in (False, True):
+                t, results = _timeit(lambda: solve_batch(shared, pairs, args.workers, mode,
+                                                         group_goals=grouped), 1)
+                ok = [r.cost for r in results] == expected
+                name = f"{mode}{' + objetivos' if grouped else ''}"
+                print(f"{name:>26} {t:>10.3f} {args.queries / t:>12,.0f} {'ok' if ok else 'ERRO':>6}")
+        print(f"bloco compartilhado: {shared.nbytes / 1024:.1f} KiB (uma copia para todos os agentes)")
+
+
+def bench_field(args):
+    import numpy as np
+    from agente import Agente
+    from mazeField import distance_field, flow_field
+
+    print(f"{'tamanho':>11} {'fontes':>6} {'campo (s)':>10} {'fluxo (s)':>10} "
+          f"{f'{args.queries} A* (s)':>12} {'ganho':>7} {'custo':>6}")
+    for size in args.sizes:
+        labirinto = MazeGenerator(width=size, height=size, seed=args.seed, braid=args.braid).generate()
+        rng = np.random.default_rng(args.seed)
+        ys, xs = np.nonzero(labirinto == MazeGenerator.PATH)
+        cells = list(zip(ys.tolist(), xs.tolist()))
+        queries = [cells[i] for i in rng.integers(len(cells), size=args.queries).tolist()]
+        for n in args.sources:
+            sources = [cells[i] for i in rng.integers(len(cells), size=n).tolist()]
+            t_field, dist = _timeit(lambda: distance_field(labirinto, sources), args.repeat)
+            t_flow, _ = _timeit(lambda: flow_field(dist), args.repeat)
+
+            # a mesma resposta com A*: uma busca por (celula, fonte), fica a menor
+            t0 = time.perf_counter()
+            costs = [min(Agente(labirinto, q, s).solve().cost for s in sources) for q in queries]
+            t_astar = time.perf_counter() - t0
+            ok = costs == [int(dist[q]) for q in queries]
+            print(f"{f'{size}x{size}':>11} {n:>6} {t_field:>10.4f} {t_flow:>10.4f} {t_astar:>12.3f} "
+                  f"{t_astar / (t_field + t_flow):>6.1f}x {'ok' if ok else 'ERRO':>6}")
+
+
+def bench_world(args):
+    import numpy as np
+    from agente import Agente
+    from mazeWorld import HPAStar, MazeWorld
+
+    print(f"{'mundo (celulas)':>16} {'HPA* (s)':>9} {'de novo':>8} {'abstratos':>10} {'tiles gerados':>13} "
+          f"{'residente':>10} {'mundo':>10} {'A* (s)':>8} {'custo':>6}")
+    for n in args.tiles:
+        world = MazeWorld(args.seed, n, n, tile=args.tile, cache=args.cache, algorithm=args.algorithm)
+        planner = HPAStar(world)
+        rng = np.random.default_rng(args.seed)
+        # celulas logicas (coordenadas impares) sorteadas no mundo inteiro
+        side = n * args.tile
+        cells = 2 * rng.integers(side, size=(args.queries, 2, 2)) + 1
+        queries = [(tuple(s.tolist()), tuple(g.tolist())) for s, g in cells]
+
+        t0 = time.perf_counter()
+        results = [planner.solve(s, g) for s, g in queries]
+        t_cold = (time.perf_counter() - t0) / args.queries
+        expanded = sum(r.expanded for r in results) / args.queries
+        generated = world.misses
+        # de novo: arestas abstratas ja calculadas, tiles no LRU se couberem
+        t0 = time.perf_counter()
+        for s, g in queries:
+            planner.solve(s, g)
+        t_warm = (time.perf_counter() - t0) / args.queries
+        resident = world.nbytes
+
+        flat, ok = "-", "-"
+        if n <= args.flat_max:
+            full = world.window(0, world.shape[0], 0, world.shape[1])
+            t0 = time.perf_counter()
+            costs = [Agente(full, s, g).solve().cost for s, g in queries]
+            flat = f"{(time.perf_counter() - t0) / args.queries:.3f}"
+            ok = "ok" if costs == [r.cost for r in results] else "ERRO"
+        total = world.shape[0] * world.shape[1]
+        print(f"{f'{side}x{side}':>16} {t_cold:>9.3f} {t_warm:>8.3f} {expanded:>10.0f} {generated:>13} "
+              f"{resident / 2**20:>7.1f} MB {total / 2**20:>7.1f} MB {flat:>8} {ok:>6}")
+
+
+# modulos sem interface: so numpy + biblioteca padrao, dentro do orcamento
+CORE_MODULES = ("nucleo", "main", "lote", "multiagente", "mazeField", "acoes")
+HEAVY_MODULES = ("matplotlib", "networkx", "PIL", "scipy")
+
+
+def _import_time(module):
+    # -X importtime num processo novo: (cumulativo do modulo em us, modulos carregados)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, check=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    total, loaded = 0, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if name == module:
+            total = int(cumulative)
+    return total, loaded
+
+
+def bench_imports(args):
+    print(f"{'modulo':>12} {'import (ms)':>12} {'pesados':>22} {'orcamento':>10}")
+    over = False
+    for module in args.modules:
+        best, loaded = min(_import_time(module) for _ in range(args.repeat))
+        heavy = sorted(loaded.intersection(HEAVY_MODULES))
+        if module in CORE_MODULES:
+            ok = best / 1e3 <= args.budget_ms and not heavy
+            over |= not ok
+            status = "ok" if ok else "ACIMA"
+        else:
+            status = "-"
+        print(f"{module:>12} {best / 1e3:>12.1f} {','.join(heavy) or '-':>22} {status:>10}")
+    if over:
+        sys.exit(1)
+
+
+def bench_lod(args):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from acoes import VisualizadorAcoes
+    from agente import Agente
+    from grafos import visualizadorGrafos
+    from main import live_frames, paint_explored, setup_panels
+    from nucleo import build_scenario
+
+    def run(labirinto, start, goal, max_nodes):
+        grafo_vis = visualizadorGrafos(labirinto, start, goal, seed=args.seed, max_nodes=max_nodes)
+        fig = plt.figure(figsize=(12, 6), dpi=80)
+        ax_graph, ax_action, ax_maze, img_plot, base = setup_panels(
+            fig, labirinto, start, goal, args.seed, grafo_vis, VisualizadorAcoes())
+        fig.canvas.draw()
+        visual = base.copy()
+        explored = set()
+        times = []
+        frames = live_frames(Agente(labirinto, start, goal), args.steps_per_frame)
+        for _, (status, novos, _) in zip(range(args.frames), frames):
+            t0 = time.perf_counter()
+            explored.update(novos)
+            paint_explored(visual, novos, start, goal)
+            img_plot.set_data(visual, novos)
+            grafo_vis.draw_graph(ax_graph, explored, [], goal, novos=novos)
+            fig.canvas.draw()
+            times.append(time.perf_counter() - t0)
+        plt.close(fig)
+        return np.median(times), len(grafo_vis.display_tree)
+
+    print(f"{'tamanho':>11} {'nos arvore':>10} {'completo (ms)':>13} {'LOD (ms)':>9} {'ganho':>6}")
+    for size in args.sizes:
+        labirinto, start, goal = build_scenario(args.seed, size, size)
+        t_lod, n = run(labirinto, start, goal, args.max_nodes)
+        if size <= args.full_max:
+            t_full, _ = run(labirinto, start, goal, None)
+            full, gain = f"{t_full * 1e3:>13.1f}", f"{t_full / t_lod:>5.1f}x"
+        else:
+            full, gain = f"{'-':>13}", f"{'-':>6}"
+        print(f"{f'{size}x{size}':>11} {n:>10} {full} {t_lod * 1e3:>9.1f} {gain}")
+
+
+def main():
+    from buscas import ENGINES
+
+    parser = argparse.ArgumentParser(description="Benchmarks do labirinto")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("gen", help="velocidade de geracao (celulas/s)")
+    p.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 256, 1024])
+    p.add_argument("--algorithm", nargs="+", default=list(MazeGenerator.ALGORITHMS),
+                   choices=MazeGenerator.ALGORITHMS)
+    p.add_argument("--braid", type=float, default=0.0,
+                   help="fracao dos becos sem saida removidos (0 = labirinto perfeito)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_gen)
+
+    p = sub.add_parser("graph", help="construcao do grafo da grade: original x vetorizada")
+    p.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 128, 256])
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_graph)
+
+    p = sub.add_parser("tree", help="arvore resumida do grafo: fila em lista x deque (escala linear)")
+    p.add_argument("--sizes", type=int, nargs="+", default=[64, 128, 256, 512, 1024])
+    p.add_argument("--algorithm", default="backtracker", choices=MazeGenerator.ALGORITHMS)
+    p.add_argument("--legacy-max", type=int, default=256,
+                   help="maior tamanho em que a versao original tambem roda")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_tree)
+
+    p = sub.add_parser("junction", help="A* na grade x A* no grafo de juncoes")
+    p.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 256])
+    p.add_argument("--seeds", type=int, default=20)
+    p.set_defaults(func=bench_junction)
+
+    p = sub.add_parser("lca", help="distancias em lote via ancestral comum")
+    p.add_argument("--size", type=int, default=512)
+    p.add_argument("--queries", type=int, default=1_000_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=1)
+    p.set_defaults(func=bench_lca)
+
+    p = sub.add_parser("engines", help="motores de busca: expansoes, tempo e pico de memoria")
+    p.add_argument("--sizes", type=int, nargs="+", default=[16, 32])
+    p.add_argument("--seeds", type=int, default=10)
+    p.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    p.add_argument("--repeat", type=int, default=1)
+    p.set_defaults(func=bench_engines)
+
+    p = sub.add_parser("actions", help="acoes de caminhos inteiros: por tripla x vetorizado")
+    p.add_argument("--size", type=int, default=64)
+    p.add_argument("--paths", type=int, default=200)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_actions)
+
+    p = sub.add_parser("multi", help="varios agentes num labirinto compartilhado (consultas/s)")
+    p.add_argument("--size", type=int, default=32)
+    p.add_argument("--queries", type=int, default=1000)
+    p.add_argument("--goals", type=int, default=0)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_multi)
+
+    p = sub.add_parser("replan", help="replanejamento incremental (LPA*) x A* do zero")
+    p.add_argument("--sizes", type=int, nargs="+", default=[32, 64, 128])
+    p.add_argument("--seeds", type=int, default=5)
+    p.add_argument("--batches", type=int, default=20)
+    p.add_argument("--toggles", type=int, default=4)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_replan)
+
+    p = sub.add_parser("field", help="campo de distancias (frente de onda) x A* repetido")
+    p.add_argument("--sizes", type=int, nargs="+", default=[64, 256])
+    p.add_argument("--queries", type=int, default=20)
+    p.add_argument("--sources", type=int, nargs="+", default=[1, 4])
+    p.add_argument("--braid", type=float, default=0.0)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_field)
+
+    p = sub.add_parser("imports", help="tempo de importacao (-X importtime) e orcamento do nucleo")
+    p.add_argument("--modules", nargs="+",
+                   default=["numpy"] + list(CORE_MODULES) + ["lod", "grafos", "exportar"])
+    p.add_argument("--budget-ms", type=float, default=400.0,
+                   help="teto para os modulos sem interface (falha com codigo 1)")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_imports)
+
+    p = sub.add_parser("world", help="mundo em tiles sob demanda: HPA* x A* no labirinto inteiro")
+    p.add_argument("--tiles", type=int, nargs="+", default=[8, 32],
+                   help="tiles por lado do mundo")
+    p.add_argument("--tile", type=int, default=32, help="celulas por lado de cada tile")
+    p.add_argument("--queries", type=int, default=5)
+    p.add_argument("--cache", type=int, default=256, help="tiles residentes (LRU)")
+    p.add_argument("--algorithm", default="backtracker", choices=MazeGenerator.ALGORITHMS)
+    p.add_argument("--flat-max", type=int, default=8,
+                   help="maior mundo (tiles por lado) tambem resolvido inteiro com A*")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_world)
+
+    p = sub.add_parser("lod", help="tempo por quadro da animacao: desenho completo x nivel de detalhe")
+    p.add_argument("--sizes", type=int, nargs="+", default=[32, 128, 256])
+    p.add_argument("--frames", type=int, default=30)
+    p.add_argument("--steps-per-frame", type=int, default=20)
+    p.add_argument("--max-nodes", type=int, default=1500)
+    p.add_argument("--full-max", type=int, default=128,
+                   help="maior tamanho em que o desenho completo tambem roda")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_lod)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
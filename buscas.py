@@ -0,0 +1,733 @@
+"""Familia de motores de busca com a mesma interface do Agente.
+
+Todos herdam de Agente e reimplementam so o _expand(limit): solve_step,
+solve, path, expanded, current e as visoes (explored_nodes, came_from,
+g_score, f_score) continuam iguais, entao animacao, rastro e exportacao
+funcionam com qualquer um. Escolha pelo nome com make_engine:
+
+    astar     A* na grade (Agente)
+    dijkstra  A* sem heuristica
+    bfs       busca em largura (fila FIFO, custo unitario)
+    jps       Jump Point Search 4-conexo: so celulas com saida lateral viram nos
+    bidir     A* bidirecional (partida -> objetivo e objetivo -> partida)
+    idastar   IDA*: aprofundamento iterativo em f, com tabela de transposicao
+    fringe    Fringe search: lista ligada now/later com limiar em f
+    juncoes   A* no grafo de juncoes (AgenteJuncoes)
+    lpa       LPA* incremental (replanejador.AgenteLPA)
+
+idastar e fringe guardam o estado por no em dicts so com os nos
+alcancados (_AgenteEsparso), em vez dos arrays do tamanho da grade.
+"""
+import heapq
+from collections import deque
+
+import numpy as np
+
+from agente import INF, Agente, AgenteJuncoes, _NodeSet, _ParentMap, _ScoreMap
+from replanejador import AgenteLPA
+
+
+def _open_neighbors(passable, idx, w, size):
+    # vizinhos livres na ordem do Agente: direita, esquerda, baixo, cima
+    x = idx % w
+    return [v for v, inside in ((idx + 1, x + 1 < w), (idx - 1, x > 0),
+                                (idx + w, idx + w < size), (idx - w, idx >= w))
+            if inside and passable[v]]
+
+
+class AgenteDijkstra(Agente):
+    """Dijkstra: o laco do A* sem heuristica (referencia para comparacao)"""
+
+    def _calculate_heuristic(self, node):
+        return 0
+
+    def _expand(self, limit):
+        if self.status != "searching":
+            return self.status
+
+        g = memoryview(self.g)
+        f = memoryview(self.f)
+        parent = memoryview(self.parent)
+        closed = memoryview(self.closed)
+        order = memoryview(self.order)
+        passable = self._passable
+
+        heap = self.open_set
+        w = self.width
+        size = self.size
+        goal = self._goal_idx
+
+        expanded = self.expanded
+        discovered = self.discovered
+        stale = self.stale_pops
+        last = -1
+        steps = 0
+
+        try:
+            while heap:
+                if limit is not None and steps >= limit:
+                    return self.status
+
+                _, current = heapq.heappop(heap)
+                if closed[current]:
+                    stale += 1
+                    continue
+
+                closed[current] = 1
+                expanded += 1
+                steps += 1
+                last = current
+
+                if current == goal:
+                    self._reconstruct_path()
+                    self.status = "goal_found"
+                    return self.status
+
+                x = current % w
+                tentative_g_score = g[current] + 1
+                for neighbor, inside in ((current + 1, x + 1 < w), (current - 1, x > 0),
+                                         (current + w, current + w < size), (current - w, current >= w)):
+                    if not inside or not passable[neighbor] or tentative_g_score >= g[neighbor]:
+                        continue
+
+                    if parent[neighbor] < 0:
+                        order[discovered] = neighbor
+                        discovered += 1
+                    parent[neighbor] = current
+                    g[neighbor] = f[neighbor] = tentative_g_score
+                    heapq.heappush(heap, (tentative_g_score, neighbor))
+
+            self.status = "no_path"
+            return self.status
+        finally:
+            self.expanded = expanded
+            self.discovered = discovered
+            self.stale_pops = stale
+            if last >= 0:
+                self.current = divmod(last, w)
+
+
+class AgenteBFS(Agente):
+    """Busca em largura: fila FIFO, otima com custo unitario"""
+
+    def __init__(self, maze, start, goal, index=None):
+        super().__init__(maze, start, goal, index=index)
+        self.open_set = deque(node for _, node in self.open_set)
+        self.f[self._start_idx] = 0
+
+    def _expand(self, limit):
+        if self.status != "searching":
+            return self.status
+
+        g = memoryview(self.g)
+        f = memoryview(self.f)
+        parent = memoryview(self.parent)
+        closed = memoryview(self.closed)
+        order = memoryview(self.order)
+        passable = self._passable
+
+        queue = self.open_set
+        w = self.width
+        size = self.size
+        goal = self._goal_idx
+
+        expanded = self.expanded
+        discovered = self.discovered
+        last = -1
+        steps = 0
+
+        try:
+            while queue:
+                if limit is not None and steps >= limit:
+                    return self.status
+
+                current = queue.popleft()
+                closed[current] = 1
+                expanded += 1
+                steps += 1
+                last = current
+
+                if current == goal:
+                    self._reconstruct_path()
+                    self.status = "goal_found"
+                    return self.status
+
+                x = current % w
+                depth = g[current] + 1
+                for neighbor, inside in ((current + 1, x + 1 < w), (current - 1, x > 0),
+                                         (current + w, current + w < size), (current - w, current >= w)):
+                    if not inside or not passable[neighbor] or g[neighbor] != INF:
+                        continue
+                    order[discovered] = neighbor
+                    discovered += 1
+                    parent[neighbor] = current
+                    g[neighbor] = f[neighbor] = depth
+                    queue.append(neighbor)
+
+            self.status = "no_path"
+            return self.status
+        finally:
+            self.expanded = expanded
+            self.discovered = discovered
+            if last >= 0:
+                self.current = divmod(last, w)
+
+
+class AgenteJPS(Agente):
+    """Jump Point Search em grade 4-conexa.
+
+    A partir de cada no a busca salta em linha reta e so para no objetivo
+    ou numa celula com saida lateral (onde o caminho pode virar); as
+    celulas intermediarias nunca entram na fila. Um no alcancado numa
+    direcao nao volta por ela. Em labirintos de corredor unico toda saida
+    lateral e um vizinho forcado, entao isso equivale ao JPS com poda
+    completa. explored_nodes/came_from contem so os pontos de salto; path
+    e preenchido de volta celula a celula.
+    """
+
+    def _jump(self, node, dy, dx):
+        # (ponto de salto, distancia) ou (-1, 0) se bater num beco
+        passable = self._passable
+        w, h = self.width, self.height
+        goal = self._goal_idx
+        y, x = divmod(node, w)
+        step = dy * w + dx
+        n = 0
+        while True:
+            y += dy
+            x += dx
+            node += step
+            if not (0 <= y < h and 0 <= x < w) or not passable[node]:
+                return -1, 0
+            n += 1
+            if node == goal:
+                return node, n
+            if dx:
+                if (y > 0 and passable[node - w]) or (y + 1 < h and passable[node + w]):
+                    return node, n
+            elif (x > 0 and passable[node - 1]) or (x + 1 < w and passable[node + 1]):
+                return node, n
+
+    def _reconstruct_path(self):
+        # pontos de salto ligados por segmentos retos
+        w = self.width
+        parent = self.parent
+        current = self._goal_idx
+        cells = [current]
+        while parent[current] >= 0:
+            prev = int(parent[current])
+            if current // w == prev // w:
+                step = 1 if current > prev else -1
+            else:
+                step = w if current > prev else -w
+            cells.extend(range(current - step, prev - step, -step))
+            current = prev
+        self.path = [divmod(c, w) for c in reversed(cells)]
+
+    def _expand(self, limit):
+        if self.status != "searching":
+            return self.status
+
+        g = memoryview(self.g)
+        f = memoryview(self.f)
+        parent = memoryview(self.parent)
+        closed = memoryview(self.closed)
+        order = memoryview(self.order)
+
+        heap = self.open_set
+        jump = self._jump
+        w = self.width
+        goal = self._goal_idx
+        gy, gx = divmod(goal, w)
+
+        expanded = self.expanded
+        discovered = self.discovered
+        stale = self.stale_pops
+        last = -1
+        steps = 0
+
+        try:
+            while heap:
+                if limit is not None and steps >= limit:
+                    return self.status
+
+                _, current = heapq.heappop(heap)
+                if closed[current]:
+                    stale += 1
+                    continue
+
+                closed[current] = 1
+                expanded += 1
+                steps += 1
+                last = current
+
+                if current == goal:
+                    self._reconstruct_path()
+                    self.status = "goal_found"
+                    return self.status
+
+                # direcoes: todas na partida, senao menos a de volta
+                cy, cx = divmod(current, w)
+                back = None
+                p = parent[current]
+                if p >= 0:
+                    py, px = divmod(p, w)
+                    back = ((py > cy) - (py < cy), (px > cx) - (px < cx))
+
+                g_current = g[current]
+                for dy, dx in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                    if (dy, dx) == back:
+                        continue
+                    neighbor, length = jump(current, dy, dx)
+                    if neighbor < 0:
+                        continue
+                    tentative_g_score = g_current + length
+                    if tentative_g_score >= g[neighbor]:
+                        continue
+
+                    if parent[neighbor] < 0:
+                        order[discovered] = neighbor
+                        discovered += 1
+                    parent[neighbor] = current
+                    g[neighbor] = tentative_g_score
+
+                    ny, nx = divmod(neighbor, w)
+                    f_neighbor = tentative_g_score + abs(ny - gy) + abs(nx - gx)
+                    f[neighbor] = f_neighbor
+                    heapq.heappush(heap, (f_neighbor, neighbor))
+
+            self.status = "no_path"
+            return self.status
+        finally:
+            self.expanded = expanded
+            self.discovered = discovered
+            self.stale_pops = stale
+            if last >= 0:
+                self.current = divmod(last, w)
+
+
+class AgenteBidirecional(Agente):
+    """A* bidirecional: duas buscas se encontrando no meio.
+
+    A direta usa os arrays do Agente (g, parent, came_from); a reversa
+    (objetivo -> partida) tem g2/parent2 proprios. Cada passo expande o
+    lado com a menor fronteira. Para quando o melhor encontro mu nao e
+    maior que max(min f direto, min f reverso), o que garante o caminho
+    otimo com heuristica consistente. explored_nodes junta os dois lados.
+    """
+
+    def __init__(self, maze, start, goal, index=None):
+        super().__init__(maze, start, goal, index=index)
+        self.g2 = np.full(self.size, INF, dtype=np.int32)
+        self.parent2 = np.full(self.size, -1, dtype=self.parent.dtype)
+        self.open_set2 = []
+
+        self.best = INF  # mu: menor caminho ja visto pelo encontro das buscas
+        self.meet = -1
+
+        if self.status == "searching":
+            s, t = self._start_idx, self._goal_idx
+            self.g2[t] = 0
+            (sy, sx), (ty, tx) = self.start, self.goal
+            heapq.heappush(self.open_set2, (abs(ty - sy) + abs(tx - sx), t))
+            if s == t:
+                self.best, self.meet = 0, s
+
+    @property
+    def heap_pushes(self):
+        return self.expanded + self.stale_pops + len(self.open_set) + len(self.open_set2)
+
+    def _reconstruct_path(self):
+        w = self.width
+        left = []
+        current = self.meet
+        while current >= 0:
+            left.append(current)
+            current = int(self.parent[current])
+        right = []
+        current = int(self.parent2[self.meet])
+        while current >= 0:
+            right.append(current)
+            current = int(self.parent2[current])
+        self.path = [divmod(c, w) for c in left[::-1] + right]
+
+    def _top(self, heap, bit):
+        # menor f valido (descarta entradas de nos ja fechados deste lado)
+        closed = self.closed
+        while heap and closed[heap[0][1]] & bit:
+            heapq.heappop(heap)
+            self.stale_pops += 1
+        return heap[0][0] if heap else INF
+
+    def _expand(self, limit):
+        if self.status != "searching":
+            return self.status
+
+        passable = self._passable
+        closed = memoryview(self.closed)
+        order = memoryview(self.order)
+        w = self.width
+        size = self.size
+        sides = (
+            # (heap, bit, g, parent, g do outro lado, alvo da heuristica)
+            (self.open_set, 1, memoryview(self.g), memoryview(self.parent), memoryview(self.g2),
+             divmod(self._goal_idx, w)),
+            (self.open_set2, 2, memoryview(self.g2), memoryview(self.parent2), memoryview(self.g),
+             divmod(self._start_idx, w)),
+        )
+        f = memoryview(self.f)
+
+        expanded = self.expanded
+        discovered = self.discovered
+        last = -1
+        steps = 0
+
+        try:
+            while True:
+                if limit is not None and steps >= limit:
+                    return self.status
+
+                top_f = self._top(self.open_set, 1)
+                top_b = self._top(self.open_set2, 2)
+                if self.meet >= 0 and self.best <= max(top_f, top_b):
+                    self._reconstruct_path()
+                    self.status = "goal_found"
+                    return self.status
+                if top_f == INF or top_b == INF:
+                    self.status = "no_path"
+                    return self.status
+
+                forward = len(self.open_set) <= len(self.open_set2)
+                heap, bit, g, parent, other_g, (ty, tx) = sides[0 if forward else 1]
+
+                _, current = heapq.heappop(heap)
+                closed[current] |= bit
+                expanded += 1
+                steps += 1
+                last = current
+
+                x = current % w
+                tentative_g_score = g[current] + 1
+                for neighbor, inside in ((current + 1, x + 1 < w), (current - 1, x > 0),
+                                         (current + w, current + w < size), (current - w, current >= w)):
+                    if not inside or not passable[neighbor] or tentative_g_score >= g[neighbor]:
+                        continue
+
+                    if forward and parent[neighbor] < 0:
+                        order[discovered] = neighbor
+                        discovered += 1
+                    parent[neighbor] = current
+                    g[neighbor] = tentative_g_score
+
+                    ny, nx = divmod(neighbor, w)
+                    f_neighbor = tentative_g_score + abs(ny - ty) + abs(nx - tx)
+                    if forward:
+                        f[neighbor] = f_neighbor
+                    heapq.heappush(heap, (f_neighbor, neighbor))
+
+                    # encontro com a outra busca
+                    if other_g[neighbor] != INF and tentative_g_score + other_g[neighbor] < self.best:
+                        self.best = tentative_g_score + other_g[neighbor]
+                        self.meet = neighbor
+        finally:
+            self.expanded = expanded
+            self.discovered = discovered
+            if last >= 0:
+                self.current = divmod(last, w)
+
+
+class _Esparso(dict):
+    """Dict com valor padrao para chaves ausentes (sem inserir), lido como os arrays planos"""
+
+    def __init__(self, default):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, idx):
+        return self.default
+
+
+class _NodeSetEsparso(_NodeSet):
+    def __len__(self):
+        return len(self._agente.closed)
+
+    def __iter__(self):
+        w = self._agente.width
+        for idx in list(self._agente.closed):
+            yield divmod(idx, w)
+
+
+class _ParentMapEsparso(_ParentMap):
+    def __iter__(self):
+        w = self._agente.width
+        for idx in self._agente.order[:self._agente.discovered]:
+            yield divmod(idx, w)
+
+
+class _ScoreMapEsparso(_ScoreMap):
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        w = self._agente.width
+        for idx in list(self._values):
+            yield divmod(idx, w)
+
+
+class _AgenteEsparso(Agente):
+    """Base dos motores de pouca memoria: estado por no em dicts do tamanho da busca.
+
+    g, f, parent e closed sao _Esparso (so os nos alcancados ocupam
+    memoria) e order e uma lista; as visoes e o rastro leem tudo como os
+    arrays planos do Agente.
+    """
+
+    def _init_state(self, idx_dtype):
+        self.g = _Esparso(INF)
+        self.f = _Esparso(INF)
+        self.parent = _Esparso(-1)
+        self.closed = _Esparso(0)
+        self.order = []
+
+        self.explored_nodes = _NodeSetEsparso(self)
+        self.came_from = _ParentMapEsparso(self)
+        self.g_score = _ScoreMapEsparso(self, self.g)
+        self.f_score = _ScoreMapEsparso(self, self.f)
+
+
+class AgenteIDAStar(_AgenteEsparso):
+    """IDA*: busca em profundidade com limite em f, aumentado a cada iteracao.
+
+    A fronteira e so a pilha do caminho atual (uma lista de vizinhos por
+    nivel); o limite seguinte e o menor f que passou do atual. g e a
+    tabela de transposicao da iteracao (zerada a cada limite novo): um no
+    alcancado de novo sem g menor ja foi (ou esta sendo) explorado com
+    folga maior e e podado, o que tambem corta ciclos. Cada no empilhado
+    conta como expansao, entao re-expansoes entre iteracoes aparecem em
+    expanded.
+    """
+
+    def __init__(self, maze, start, goal, index=None):
+        super().__init__(maze, start, goal, index=index)
+        self.open_set = []  # pilha de (no, vizinhos restantes)
+        self.seen = _Esparso(0)  # iteracao em que o no foi expandido com g[no]
+        self.bound = -1
+        self.next_bound = self._calculate_heuristic(self.start)
+        self.iterations = 0
+
+    # sem fila de prioridade
+    heap_pushes = None
+
+    def _expand(self, limit):
+        if self.status != "searching":
+            return self.status
+
+        g, f, parent, closed, order = self.g, self.f, self.parent, self.closed, self.order
+        seen = self.seen
+        passable = self._passable
+
+        stack = self.open_set
+        w = self.width
+        size = self.size
+        start, goal = self._start_idx, self._goal_idx
+        gy, gx = divmod(goal, w)
+
+        expanded = self.expanded
+        discovered = self.discovered
+        last = -1
+        steps = 0
+
+        try:
+            while True:
+                if limit is not None and steps >= limit:
+                    return self.status
+
+                if not stack:
+                    # nova iteracao com o proximo limite
+                    if self.next_bound == INF:
+                        self.status = "no_path"
+                        return self.status
+                    self.bound, self.next_bound = self.next_bound, INF
+                    self.iterations += 1
+                    node, depth = start, 0
+                else:
+                    top, rest = stack[-1]
+                    if not rest:
+                        stack.pop()
+                        continue
+                    node = rest.pop()
+                    depth = g[top] + 1
+                    if depth > g[node] or (depth == g[node] and seen[node] == self.iterations):
+                        continue  # transposicao (ou ciclo no caminho atual)
+                    ny, nx = divmod(node, w)
+                    f_node = depth + abs(ny - gy) + abs(nx - gx)
+                    if f_node > self.bound:
+                        self.next_bound = min(self.next_bound, f_node)
+                        continue
+                    if parent[node] < 0:
+                        order.append(node)
+                        discovered += 1
+                    parent[node] = top
+
+                ny, nx = divmod(node, w)
+                g[node] = depth
+                f[node] = depth + abs(ny - gy) + abs(nx - gx)
+                closed[node] = 1
+                seen[node] = self.iterations
+                expanded += 1
+                steps += 1
+                last = node
+
+                if node == goal:
+                    self.path = [divmod(c, w) for c, _ in stack] + [divmod(node, w)]
+                    self.status = "goal_found"
+                    return self.status
+
+                # vizinhos invertidos: pop() devolve na ordem do Agente
+                stack.append((node, _open_neighbors(passable, node, w, size)[::-1]))
+        finally:
+            self.expanded = expanded
+            self.discovered = discovered
+            if last >= 0:
+                self.current = divmod(last, w)
+
+
+class AgenteFringe(_AgenteEsparso):
+    """Fringe search: IDA* sem recomecar do zero a cada iteracao.
+
+    A fronteira e uma lista duplamente ligada em dicts (next/prev), com
+    entrada so para os nos que estao nela. Percorre a lista: nos com f
+    acima do limiar ficam para a proxima passada ('later'), os demais sao
+    expandidos e seus filhos entram logo depois deles ('now'). Ao fim da
+    lista o limiar sobe para o menor f adiado. g guarda o melhor custo
+    visto, evitando reexpandir caminhos piores.
+    """
+
+    def __init__(self, maze, start, goal, index=None):
+        super().__init__(maze, start, goal, index=index)
+        self.next = {}
+        self.prev = {}
+        self.open_set = []
+
+        s = self._start_idx
+        self.head = -1
+        if self.status == "searching":
+            self.head = s
+            self.next[s] = self.prev[s] = -1
+        self.cursor = self.head
+        self.threshold = self._calculate_heuristic(self.start)
+        self.fmin = INF
+
+    # sem fila de prioridade
+    heap_pushes = None
+
+    def _unlink(self, node, nxt, prv):
+        p, q = prv.pop(node), nxt.pop(node)
+        if p >= 0:
+            nxt[p] = q
+        else:
+            self.head = q
+        if q >= 0:
+            prv[q] = p
+
+    def _expand(self, limit):
+        if self.status != "searching":
+            return self.status
+
+        g, f, parent, closed, order = self.g, self.f, self.parent, self.closed, self.order
+        nxt, prv = self.next, self.prev
+        passable = self._passable
+
+        w = self.width
+        size = self.size
+        goal = self._goal_idx
+        gy, gx = divmod(goal, w)
+
+        expanded = self.expanded
+        discovered = self.discovered
+        last = -1
+        steps = 0
+
+        try:
+            while True:
+                if limit is not None and steps >= limit:
+                    return self.status
+
+                node = self.cursor
+                if node < 0:
+                    # fim da lista: proxima passada com o menor f adiado
+                    if self.head < 0 or self.fmin == INF:
+                        self.status = "no_path"
+                        return self.status
+                    self.threshold, self.fmin = self.fmin, INF
+                    self.cursor = self.head
+                    continue
+
+                ny, nx = divmod(node, w)
+                f_node = g[node] + abs(ny - gy) + abs(nx - gx)
+                if f_node > self.threshold:
+                    self.fmin = min(self.fmin, f_node)
+                    self.cursor = nxt[node]
+                    continue
+
+                closed[node] = 1
+                expanded += 1
+                steps += 1
+                last = node
+
+                if node == goal:
+                    self._reconstruct_path()
+                    self.status = "goal_found"
+                    return self.status
+
+                # filhos entram logo apos o no (invertidos: ficam na ordem do Agente)
+                tentative_g_score = g[node] + 1
+                for child in reversed(_open_neighbors(passable, node, w, size)):
+                    if tentative_g_score >= g[child]:
+                        continue
+                    if child in nxt:
+                        self._unlink(child, nxt, prv)
+                    q = nxt[node]
+                    nxt[node] = child
+                    prv[child] = node
+                    nxt[child] = q
+                    if q >= 0:
+                        prv[q] = child
+
+                    if parent[child] < 0:
+                        order.append(child)
+                        discovered += 1
+                    parent[child] = node
+                    g[child] = tentative_g_score
+                    cy, cx = divmod(child, w)
+                    f[child] = tentative_g_score + abs(cy - gy) + abs(cx - gx)
+
+                self.cursor = nxt[node]
+                self._unlink(node, nxt, prv)
+        finally:
+            self.expanded = expanded
+            self.discovered = discovered
+            if last >= 0:
+                self.current = divmod(last, w)
+
+
+ENGINES = {
+    "astar": Agente,
+    "dijkstra": AgenteDijkstra,
+    "bfs": AgenteBFS,
+    "jps": AgenteJPS,
+    "bidir": AgenteBidirecional,
+    "idastar": AgenteIDAStar,
+    "fringe": AgenteFringe,
+    "juncoes": AgenteJuncoes,
+    "lpa": AgenteLPA,
+}
+
+
+def make_engine(name, maze, start, goal, **kwargs):
+    """Cria o motor de busca 'name' (ver ENGINES)"""
+    try:
+        cls = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Busca desconhecida: {name} (opcoes: {', '.join(ENGINES)})") from None
+    return cls(maze, start, goal, **kwargs)
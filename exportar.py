@@ -0,0 +1,247 @@
+"""Exportacao offline da animacao (MP4/GIF) sem backend interativo.
+
+1. roda o solver inteiro gravando o rastro de passos (rastro.py), ou usa
+   um rastro ja gravado;
+2. renderiza os quadros em paralelo (processos, backend Agg), reaproveitando
+   os paineis do main.py (grafo, acoes e labirinto);
+3. envia os quadros em ordem, conforme ficam prontos, para o ffmpeg (ou
+   para o Pillow no caso de GIF sem ffmpeg).
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import perfil
+from buscas import make_engine
+from nucleo import build_scenario
+from rastro import TraceReader, record_trace
+
+# estado de cada processo renderizador (montado em _init_worker)
+_ctx = {}
+
+
+def _init_worker(seed, width, height, trace_path, steps_per_frame, figsize, dpi, layout_cache,
+                 profile=False):
+    # perfil do processo: vai junto de cada bloco e e somado no principal
+    if profile:
+        perfil.enable()
+
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    from grafos import visualizadorGrafos
+    from acoes import VisualizadorAcoes
+    from main import setup_panels
+
+    labirinto, start, goal = build_scenario(seed, width, height)
+    grafo_vis = visualizadorGrafos(labirinto, start, goal, seed=seed, layout_cache=layout_cache)
+    acao_vis = VisualizadorAcoes()
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax_graph, ax_action, ax_maze, img_plot, img_base = setup_panels(
+        fig, labirinto, start, goal, seed, grafo_vis, acao_vis)
+
+    # cada processo le o rastro direto do disco (memmap)
+    trace = TraceReader(trace_path)
+    _ctx.update(seed=seed, start=start, goal=goal, trace=trace, steps_per_frame=steps_per_frame, fig=fig,
+                ax_graph=ax_graph, ax_action=ax_action, ax_maze=ax_maze,
+                img_plot=img_plot, img_base=img_base, grafo_vis=grafo_vis, acao_vis=acao_vis)
+    _reset_state()
+
+
+def _reset_state():
+    _ctx["visual"] = np.copy(_ctx["img_base"])
+    _ctx["explored"] = set()
+    _ctx["step"] = 0
+
+
+def _advance(stop):
+    # aplica os passos [step, stop) e retorna os nos novos
+    from main import paint_explored
+
+    novos = _ctx["trace"].expanded_cells(_ctx["step"], stop)
+    _ctx["explored"].update(novos)
+    paint_explored(_ctx["visual"], novos, _ctx["start"], _ctx["goal"])
+    _ctx["step"] = stop
+    return novos
+
+
+def _render_chunk(frames):
+    """Renderiza os quadros [f0, f1); retorna os bytes RGB de cada um e o perfil do bloco"""
+    from main import draw_result
+
+    f0, f1 = frames
+    trace = _ctx["trace"]
+    spf = _ctx["steps_per_frame"]
+    n_steps = len(trace)
+    fig = _ctx["fig"]
+
+    # cada processo pega blocos em ordem crescente; se nao, recomeca
+    if f0 * spf < _ctx["step"]:
+        _reset_state()
+    _advance(f0 * spf)
+    full_redraw = True
+
+    out = []
+    for f in range(f0, f1):
+        stop = min((f + 1) * spf, n_steps)
+        novos = _advance(stop)
+
+        with perfil.phase("recolor_maze"):
+            _ctx["img_plot"].set_data(_ctx["visual"], None if full_redraw else novos)
+        with perfil.phase("draw_graph"):
+            _ctx["grafo_vis"].draw_graph(_ctx["ax_graph"], _ctx["explored"], [], _ctx["goal"],
+                                         novos=None if full_redraw else novos)
+        full_redraw = False
+
+        with perfil.phase("draw_actions"):
+            grandparent, parent, current = trace.triple(stop - 1)
+            _ctx["acao_vis"].draw(_ctx["ax_action"], grandparent, parent, current)
+
+        # ultimo quadro: resultado final
+        if stop == n_steps:
+            draw_result(fig, _ctx["ax_graph"], _ctx["ax_maze"], _ctx["grafo_vis"], trace.status,
+                        _ctx["explored"], trace.path(), _ctx["goal"], _ctx["seed"])
+
+        with perfil.phase("canvas"):
+            fig.canvas.draw()
+            out.append(np.asarray(fig.canvas.buffer_rgba())[..., :3].tobytes())
+    return out, perfil.collect()
+
+
+class _FfmpegWriter:
+    """Envia quadros RGB crus para o ffmpeg por um pipe"""
+
+    def __init__(self, path, size, fps, ffmpeg):
+        w, h = size
+        cmd = [ffmpeg, "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}", "-r", str(fps), "-i", "-"]
+        if path.lower().endswith(".gif"):
+            cmd += [path]
+        else:
+            # yuv420p exige dimensoes pares
+            cmd += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", path]
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        self._proc.stdin.write(frame)
+
+    def close(self):
+        self._proc.stdin.close()
+        if self._proc.wait() != 0:
+            raise RuntimeError("ffmpeg terminou com erro")
+
+
+class _PillowGifWriter:
+    """GIF via Pillow (sem ffmpeg): guarda os quadros em paleta ate o fim"""
+
+    def __init__(self, path, size, fps):
+        from PIL import Image
+        self._image = Image
+        self._path = path
+        self._size = size
+        self._duration = int(round(1000 / fps))
+        self._frames = []
+
+    def write(self, frame):
+        img = self._image.frombytes("RGB", self._size, frame)
+        self._frames.append(img.quantize(colors=64))
+
+    def close(self):
+        first, rest = self._frames[0], self._frames[1:]
+        first.save(self._path, save_all=True, append_images=rest, duration=self._duration, loop=0)
+
+
+def _open_writer(path, size, fps):
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg:
+        return _FfmpegWriter(path, size, fps, ffmpeg)
+    if path.lower().endswith(".gif"):
+        return _PillowGifWriter(path, size, fps)
+    raise RuntimeError("ffmpeg nao encontrado: instale o ffmpeg ou exporte para .gif")
+
+
+def export_animation(seed, width, height, output, fps=30, steps_per_frame=1, workers=None,
+                     figsize=(12, 6), dpi=80, hold=2.0, layout_cache=None, trace=None, busca="astar"):
+    """Grava a animacao da busca em output (.mp4 ou .gif).
+
+    Sem 'trace' o motor 'busca' (buscas.ENGINES) roda antes gravando um
+    rastro temporario; com 'trace' (arquivo do rastro.py) a busca nao e
+    refeita.
+    """
+    temp = None
+    if trace is None:
+        # 1) rastro do solver
+        labirinto, start, goal = build_scenario(seed, width, height)
+        fd, temp = tempfile.mkstemp(suffix=".trace")
+        os.close(fd)
+        t0 = time.perf_counter()
+        with perfil.phase("record_trace"):
+            record_trace(make_engine(busca, labirinto, start, goal), temp, seed=seed)
+        print(f"Rastro gravado em {time.perf_counter() - t0:.2f}s")
+        trace = temp
+
+    try:
+        _export_trace(seed, width, height, trace, output, fps, steps_per_frame, workers,
+                      figsize, dpi, hold, layout_cache)
+    finally:
+        if temp is not None:
+            os.remove(temp)
+
+
+def _export_trace(seed, width, height, trace, output, fps, steps_per_frame, workers,
+                  figsize, dpi, hold, layout_cache):
+    reader = TraceReader(trace)
+    n_steps = len(reader)
+    n_frames = -(-n_steps // steps_per_frame)
+    print(f"Rastro: {n_steps} passos ({reader.status}) -> {n_frames} quadros")
+
+    # 2) renderizacao paralela em blocos, 3) escrita em ordem
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, min(32, n_frames // (workers * 4) or 1))
+    chunks = [(f, min(f + chunk, n_frames)) for f in range(0, n_frames, chunk)]
+    size = (int(figsize[0] * dpi), int(figsize[1] * dpi))
+
+    t0 = time.perf_counter()
+    writer = None
+    last = None
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(seed, width, height, trace, steps_per_frame, figsize, dpi,
+                                       layout_cache, perfil.enabled())) as pool:
+        results = pool.map(_render_chunk, chunks)
+        while True:
+            # tempo esperando os processos x tempo gravando
+            with perfil.phase("wait_frames"):
+                frames, stats = next(results, (None, None))
+            if frames is None:
+                break
+            perfil.merge(stats)
+            if writer is None:
+                writer = _open_writer(output, size, fps)
+            with perfil.phase("write_frames"):
+                for frame in frames:
+                    writer.write(frame)
+                    written += 1
+            perfil.count("frames", len(frames))
+            last = frames[-1] if frames else last
+
+    # segura o quadro final por 'hold' segundos
+    if writer is not None:
+        for _ in range(int(hold * fps)):
+            writer.write(last)
+            written += 1
+        writer.close()
+
+    elapsed = time.perf_counter() - t0
+    print(f"{written} quadros em {elapsed:.2f}s ({written / elapsed:.1f} quadros/s, "
+          f"{written / fps / elapsed:.1f}x tempo real) -> {output}", file=sys.stderr)
@@ -1,223 +1,592 @@
+import os
+import zipfile
+import zlib
+from collections import deque
+
+import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
+
+import perfil
+from mazeGraph import grid_edges, grid_csr, bfs_tree
+from mazeStore import as_matrix
+from lod import MAX_NODES, TreeLOD
 
 class visualizadorGrafos:
-    def __init__(self, maze_matrix, start_pos, goal_pos):
-        self.maze = maze_matrix
+    def __init__(self, maze_matrix, start_pos, goal_pos, seed=None, layout_cache=None, max_nodes=MAX_NODES):
+        self.maze = as_matrix(maze_matrix)  # PackedMaze e descompactado: o desenho usa a matriz inteira
         self.start = start_pos
         self.goal = goal_pos
         self.PATH = 0
+
+        # acima de max_nodes a arvore e desenhada com nivel de detalhe (lod.py)
+        self.max_nodes = max_nodes
+        self._lod = None
         
-        # Grafo
-        self.full_grid_graph = nx.Graph()
-        self._build_grid_graph()
-        
-        # arvore completa
-        if len(self.full_grid_graph) > 0:
-            self.full_tree = nx.bfs_tree(self.full_grid_graph, source=self.start)
-        else:
-            self.full_tree = nx.DiGraph()
-            self.full_tree.add_node(self.start)
+        # adjacencia CSR + arvore BFS calculadas em bloco (sem NetworkX)
+        self._build_bfs_arrays()
+
+        # grafo/arvore completos em NetworkX so sao montados se acessados
+        self._full_grid_graph = None
+        self._full_tree = None
 
         # arvore resumida
         self.display_tree = nx.DiGraph()
         self.dummy_nodes = set() 
         self._build_compressed_tree()
 
-        self.pos = self._layout_arvore(self.display_tree, root=self.start)
+        # layout (opcionalmente em cache no disco por seed/tamanho/partida/objetivo)
+        self.pos = self._cached_layout(seed, layout_cache)
+
+    @property
+    def full_grid_graph(self):
+        if self._full_grid_graph is None:
+            self._full_grid_graph = nx.Graph()
+            self._build_grid_graph()
+        return self._full_grid_graph
+
+    @property
+    def full_tree(self):
+        # equivalente a nx.bfs_tree(full_grid_graph, start)
+        if self._full_tree is None:
+            w = self._w
+            child = self._bfs_order[1:]
+            cy, cx = np.divmod(child, w)
+            py, px = np.divmod(self._bfs_parent[child], w)
+
+            self._full_tree = nx.DiGraph()
+            self._full_tree.add_node(self.start)
+            self._full_tree.add_edges_from(
+                zip(zip(py.tolist(), px.tolist()), zip(cy.tolist(), cx.tolist())))
+        return self._full_tree
 
     def _build_grid_graph(self):
+        # nos e arestas calculados em bloco com NumPy
+        w = self.maze.shape[1]
+        ys, xs = np.nonzero(np.asarray(self.maze) == self.PATH)
+        self._full_grid_graph.add_nodes_from(zip(ys.tolist(), xs.tolist()))
+
+        u, v = grid_edges(self.maze, self.PATH)
+        uy, ux = np.divmod(u, w)
+        vy, vx = np.divmod(v, w)
+        self._full_grid_graph.add_edges_from(
+            zip(zip(uy.tolist(), ux.tolist()), zip(vy.tolist(), vx.tolist())))
+
+    def _build_bfs_arrays(self):
         h, w = self.maze.shape
-        for y in range(h):
-            for x in range(w):
-                if self.maze[y, x] == self.PATH:
-                    node = (y, x)
-                    self.full_grid_graph.add_node(node)
-                    if x+1 < w and self.maze[y, x+1] == self.PATH:
-                        self.full_grid_graph.add_edge(node, (y, x+1))
-                    if y+1 < h and self.maze[y+1, x] == self.PATH:
-                        self.full_grid_graph.add_edge(node, (y+1, x))
+        self._w = w
+        self._indptr, self._indices = grid_csr(self.maze, self.PATH)
+
+        source = self.start[0] * w + self.start[1]
+        self._bfs_order, self._bfs_parent = bfs_tree(self._indptr, self._indices, source)
+
+        # filhos de cada no em CSR, na ordem da BFS
+        child = self._bfs_order[1:]
+        par = self._bfs_parent[child]
+        self._children = child[np.argsort(par, kind='stable')]
+        self._child_ptr = np.zeros(h * w + 1, dtype=np.int64)
+        np.cumsum(np.bincount(par, minlength=h * w), out=self._child_ptr[1:])
+
+    def _successors(self, node):
+        # filhos de node na arvore BFS
+        w = self._w
+        idx = node[0] * w + node[1]
+        kids = self._children[self._child_ptr[idx]:self._child_ptr[idx + 1]]
+        return [divmod(c, w) for c in kids.tolist()]
 
     def _build_compressed_tree(self):
-        queue = [self.start]
-        visited = {self.start}
+        """Contrai os corredores da arvore BFS numa passada (fila deque, listas planas)"""
+        edges = self._compressed_edges()
+
+        # mesma ordem de nos/arestas da insercao um a um
         self.display_tree.add_node(self.start)
-        
+        self.display_tree.add_edges_from(edges)
+
+    def _compressed_edges(self):
+        w = self._w
+        ptr = self._child_ptr.tolist()
+        kids = self._children.tolist()
+        start = self.start[0] * w + self.start[1]
+        goal = self.goal[0] * w + self.goal[1]
+
+        edges = []
+        visited = bytearray(len(ptr) - 1)
+        visited[start] = 1
+        queue = deque([start])
         while queue:
-            curr = queue.pop(0)
-            children = []
-            if curr in self.full_tree:
-                children = list(self.full_tree.successors(curr))
-
-            for child in children:
-                temp = child
-                path_segment = [temp]
-                
-                # avanca reta
-                while True:
-                    #se no objetivo para
-                    if temp == self.goal:
-                        break
-
-                    successors = list(self.full_tree.successors(temp))
-                    if len(successors) != 1: 
-                        break
-
-                    next_node = successors[0]
-
-                    # avanca se proximo = objetivo
-                    if next_node == self.goal:
-                        temp = next_node
-                        path_segment.append(temp)
-                        break
-
-                    temp = successors[0]
-                    path_segment.append(temp)
-
-                target = temp 
-                
+            curr = queue.popleft()
+            curr_node = divmod(curr, w)
+
+            for child in kids[ptr[curr]:ptr[curr + 1]]:
+                # avanca reta enquanto houver um unico filho (para no objetivo)
+                target = child
+                length = 1
+                while target != goal and ptr[target + 1] - ptr[target] == 1:
+                    target = kids[ptr[target]]
+                    length += 1
+                target_node = divmod(target, w)
+
                 # Se segmento longo cria substituto
-                if len(path_segment) > 2:
-                    dummy = f"cut_{curr}_{target}"
+                if length > 2:
+                    dummy = f"cut_{curr_node}_{target_node}"
                     self.dummy_nodes.add(dummy)
-                    
-                    self.display_tree.add_node(dummy)
-                    self.display_tree.add_node(target)
-                    self.display_tree.add_edge(curr, dummy)
-                    self.display_tree.add_edge(dummy, target)
+                    edges.append((curr_node, dummy))
+                    edges.append((dummy, target_node))
                 else:
-                    self.display_tree.add_node(target)
-                    self.display_tree.add_edge(curr, target)
+                    edges.append((curr_node, target_node))
 
-                if target not in visited:
-                    visited.add(target)
+                if not visited[target]:
+                    visited[target] = 1
                     queue.append(target)
+        return edges
 
     def _layout_arvore(self, G, root=None):
         """Calcula posições X, Y para desenhar a arvore bonita"""
-        pos = {}
-        width = {}
-
         if root not in G: return nx.spring_layout(G)
 
-        # largura de cada sub arvore
-        def get_width(node):
-            children = list(G.successors(node))
-            if not children:
-                width[node] = 1.0
-                return 1.0
-            w = sum(get_width(c) for c in children) + (len(children)-1)*2.0
-            width[node] = w
-            return w
-        
-        get_width(root)
-
-        # Posicao X Y
-        def set_pos(node, left, y):
-            children = list(G.successors(node))
-            
-            if not children:
-                pos[node] = (left + width[node]/2, y)
-                return
-            
-            curr_x = left
-            child_x = []
-            for child in children:
-                set_pos(child, curr_x, y - 6.0)
-                child_x.append(pos[child][0])
-                curr_x += width[child] + 2.0
-            
-            center = sum(child_x) / len(child_x)
-            pos[node] = (center, y)
-
-        set_pos(root, 0, 0)
+        nodes, xy = self._layout_arrays(G, root)
+        return dict(zip(nodes, map(tuple, xy.tolist())))
+
+    def _layout_arrays(self, G, root):
+        """Layout iterativo (sem recursao): retorna (nos, array (N, 2) de x, y)
+
+        Nos sao numerados ao serem descobertos, entao pai < filho: percorrer
+        os indices em ordem crescente equivale a pre-ordem e em ordem
+        decrescente a pos-ordem.
+        """
+        nodes = [root]
+        kids = [None]
+        stack = [0]
+        while stack:
+            i = stack.pop()
+            ids = []
+            for child in G.successors(nodes[i]):
+                ids.append(len(nodes))
+                nodes.append(child)
+                kids.append(None)
+            kids[i] = ids
+            stack.extend(ids)
+
+        n = len(nodes)
+
+        # largura de cada sub arvore (pos-ordem)
+        width = [1.0] * n
+        for i in range(n - 1, -1, -1):
+            ids = kids[i]
+            if ids:
+                w = 0
+                for j in ids:
+                    w += width[j]
+                width[i] = w + (len(ids) - 1) * 2.0
+
+        # canto esquerdo e altura de cada no (pre-ordem)
+        left = [0.0] * n
+        ys = [0.0] * n
+        for i in range(n):
+            curr_x = left[i]
+            for j in kids[i]:
+                left[j] = curr_x
+                ys[j] = ys[i] - 6.0
+                curr_x += width[j] + 2.0
+
+        # x: folhas no meio da largura, pais na media dos filhos (pos-ordem)
+        xs = [0.0] * n
+        for i in range(n - 1, -1, -1):
+            ids = kids[i]
+            if not ids:
+                xs[i] = left[i] + width[i] / 2
+            else:
+                xs[i] = sum([xs[j] for j in ids]) / len(ids)
+
+        return nodes, np.column_stack([xs, ys])
+
+    def _cached_layout(self, seed, cache_dir):
+        """Layout da display_tree, lido/salvo em disco se houver seed e pasta"""
+        if seed is None or cache_dir is None or self.start not in self.display_tree:
+            return self._layout_arvore(self.display_tree, root=self.start)
+
+        h, w = self.maze.shape
+        (sy, sx), (gy, gx) = self.start, self.goal
+        path = os.path.join(cache_dir, f"layout_s{seed}_{h}x{w}_{sy}-{sx}_{gy}-{gx}.npz")
+        checksum = zlib.crc32(np.ascontiguousarray(self.maze).tobytes())
+        nodes = list(self.display_tree.nodes())
+
+        # valida pelo checksum do labirinto e numero de nos
+        try:
+            with np.load(path) as data:
+                if int(data["checksum"]) == checksum and len(data["xy"]) == len(nodes):
+                    return dict(zip(nodes, map(tuple, data["xy"].tolist())))
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            pass  # cache ausente, antigo ou corrompido: refaz
+
+        order, xy = self._layout_arrays(self.display_tree, self.start)
+        pos = dict(zip(order, map(tuple, xy.tolist())))
+
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(path, xy=np.array([pos[n] for n in nodes]), checksum=checksum)
         return pos
 
-    def draw_graph(self, ax, explored, path, goal, show_all=False, came_from=None):
+    # estilos dos nos (face, borda, tamanho) e arestas (cor, largura) por estado
+    NODE_STYLE = {
+        0: ("white", "#8B8B8B", 35),       # nao visitado
+        1: ("black", "black", 80),         # explorado
+        2: ("#FF4444", "#8B0000", 100),    # caminho
+    }
+    EDGE_STYLE = {
+        0: ("#8B8B8B", 1.0),    # arvore ref
+        1: ("#646464", 2.5),    # explorado
+        2: ("#FF4444", 2.5),    # caminho
+    }
+
+    def _init_artists(self, ax, goal):
+        """Desenha a camada estatica uma vez e guarda os artistas"""
         ax.clear()
-        
-        # desenha arvore ref
-        nx.draw_networkx_edges(self.display_tree, self.pos, ax=ax, 
-                             edge_color="#8B8B8B", arrows=False)
-        
-        # nao desenha dummy nodes (retos)
-        unvisited = [n for n in self.display_tree.nodes() 
-                    if n not in explored and n not in self.dummy_nodes]
-        
-        nx.draw_networkx_nodes(self.display_tree, self.pos, ax=ax, 
-                             nodelist=unvisited,
-                             node_color="white", node_size=35, edgecolors="#8B8B8B")
-        
-        # nos para desenhar
-        active = []
-        path_nodes = []
-        
-        # se caminho
-        dummy_path = set()
-        
-        for node in self.display_tree.nodes():
-            if node == self.start or node == goal: continue
-
-            if node in self.dummy_nodes:
-                # pinta linha vermelha mas nao add node
-                preds = list(self.display_tree.predecessors(node))
-                if preds and preds[0] in explored:
-                    succs = list(self.display_tree.successors(node))
-                    if path and preds[0] in path and succs and succs[0] in path:
-                        dummy_path.add(node)
-            
-            elif node in path:
-                path_nodes.append(node)
-            elif node in explored:
-                active.append(node)
-
-        # explorados
-        edges_active = []
-        for u, v in self.display_tree.edges():
-            u_ok = (u in explored) or (u in self.dummy_nodes) or (u == self.start)
-            v_ok = (v in explored) or (v in self.dummy_nodes)
-            
-            # se pai visitado desenha linha
-            if u in explored or u in self.dummy_nodes:
-                 if v in self.dummy_nodes:
-                     ps = list(self.display_tree.predecessors(v))
-                     if ps and ps[0] in explored: edges_active.append((u,v))
-                 elif v in explored:
-                     edges_active.append((u,v))
-
-        nx.draw_networkx_edges(self.display_tree, self.pos, ax=ax, edgelist=edges_active,
-                             edge_color='#646464', width=2.5, arrows=False)
-        
-        # caminho
-        edges_path = []
-        if path:
-            for u, v in self.display_tree.edges():
-                u_ok = (u in path) or (u in dummy_path) or (u == self.start)
-                v_ok = (v in path) or (v in dummy_path) or (v == goal)
-                if u_ok and v_ok: edges_path.append((u,v))
-                    
-        nx.draw_networkx_edges(self.display_tree, self.pos, ax=ax, edgelist=edges_path,
-                             edge_color='#FF4444', width=2.5, arrows=False)
-
-        # explorados
-        nx.draw_networkx_nodes(self.display_tree, self.pos, ax=ax, nodelist=active,
-                             node_color='black', node_size=80, edgecolors="black")
-        
-        # caminho
-        nx.draw_networkx_nodes(self.display_tree, self.pos, ax=ax, nodelist=path_nodes,
-                             node_color='#FF4444', node_size=100, edgecolors='#8B0000')
+        tree = self.display_tree
+
+        # nos desenhaveis (sem dummies, partida e objetivo tem artistas proprios)
+        self._node_list = [n for n in tree.nodes()
+                           if n not in self.dummy_nodes and n != self.start and n != goal]
+        self._node_idx = {n: i for i, n in enumerate(self._node_list)}
+        self._node_state = np.zeros(len(self._node_list), dtype=np.int8)
+
+        self._edge_list = list(tree.edges())
+        self._edge_state = np.zeros(len(self._edge_list), dtype=np.int8)
+
+        # arestas que encostam em cada no (inclusive via dummy)
+        self._incident = {}
+        for e, (u, v) in enumerate(self._edge_list):
+            self._incident.setdefault(u, []).append(e)
+            self._incident.setdefault(v, []).append(e)
+
+        self._edge_artist = nx.draw_networkx_edges(tree, self.pos, ax=ax, edgelist=self._edge_list,
+                                                   edge_color=self.EDGE_STYLE[0][0],
+                                                   width=self.EDGE_STYLE[0][1], arrows=False)
+        face, edge, size = self.NODE_STYLE[0]
+        self._node_artist = nx.draw_networkx_nodes(tree, self.pos, ax=ax, nodelist=self._node_list,
+                                                   node_color=face, node_size=size, edgecolors=edge)
+
+        # arrays de estilo editados in-place a cada passo
+        from matplotlib.colors import to_rgba
+        n, m = len(self._node_list), len(self._edge_list)
+        self._rgba = {c: to_rgba(c) for style in (self.NODE_STYLE, self.EDGE_STYLE)
+                      for st in style.values() for c in st if isinstance(c, str)}
+        self._face = np.tile(self._rgba[face], (n, 1))
+        self._border = np.tile(self._rgba[edge], (n, 1))
+        self._sizes = np.full(n, size, dtype=float)
+        self._edge_colors = np.tile(self._rgba[self.EDGE_STYLE[0][0]], (m, 1))
+        self._edge_widths = np.full(m, self.EDGE_STYLE[0][1])
 
         # inicio
-        nx.draw_networkx_nodes(self.display_tree, self.pos, ax=ax, nodelist=[self.start],
-                             node_color='#4444FF', node_size=130, edgecolors='black')
-        
+        nx.draw_networkx_nodes(tree, self.pos, ax=ax, nodelist=[self.start],
+                               node_color='#4444FF', node_size=130, edgecolors='black')
+
         # fim
-        goal_list = [goal] if goal in explored or show_all else []
-        nx.draw_networkx_nodes(self.display_tree, self.pos, ax=ax, nodelist=goal_list,
-                             node_color='#44FF44', node_size=130, edgecolors='black')
+        if goal in tree:
+            nx.draw_networkx_nodes(tree, self.pos, ax=ax, nodelist=[goal],
+                                   node_color='#44FF44', node_size=150, edgecolors='black')
+
+        self._ax = ax
+        self._ax_goal = goal
+        perfil.count("artists_created", len(ax.collections))
+
+    def _edge_target(self, e, explored, path, dummy_path, goal):
+        # estado desejado de uma aresta (mesmas regras do desenho original)
+        u, v = self._edge_list[e]
+        if path:
+            u_ok = (u in path) or (u in dummy_path) or (u == self.start)
+            v_ok = (v in path) or (v in dummy_path) or (v == goal)
+            if u_ok and v_ok:
+                return 2
+
+        # se pai visitado desenha linha
+        if u in explored or u in self.dummy_nodes:
+            if v in self.dummy_nodes:
+                return 1 if u in explored else 0
+            if v in explored:
+                return 1
+        return 0
+
+    def _set_node(self, i, state):
+        if self._node_state[i] == state:
+            return False
+        face, edge, size = self.NODE_STYLE[state]
+        self._node_state[i] = state
+        self._face[i] = self._rgba[face]
+        self._border[i] = self._rgba[edge]
+        self._sizes[i] = size
+        return True
+
+    def _set_edge(self, e, state):
+        if self._edge_state[e] == state:
+            return False
+        color, width = self.EDGE_STYLE[state]
+        self._edge_state[e] = state
+        self._edge_colors[e] = self._rgba[color]
+        self._edge_widths[e] = width
+        return True
+
+    def draw_graph(self, ax, explored, path, goal, show_all=False, came_from=None, novos=None):
+        """Atualiza o grafo no ax.
+
+        A arvore e desenhada uma vez; depois so os nos/arestas que mudaram de
+        estado sao recoloridos. 'novos' (nos expandidos desde a ultima
+        chamada) evita percorrer a arvore inteira a cada passo. Arvores com
+        mais de max_nodes nos vao para o desenho com nivel de detalhe.
+        """
+        if self.max_nodes is not None and len(self.display_tree) > self.max_nodes:
+            return self._draw_graph_lod(ax, explored, path, goal, novos)
+
+        if (getattr(self, "_ax", None) is not ax or self._ax_goal != goal
+                or (self._node_artist is not None and self._node_artist.axes is None)):
+            self._init_artists(ax, goal)
+            novos = None
+
+        dummy_path = set()
+        if path:
+            # com caminho recalcula tudo (acontece uma vez, no final)
+            path = set(path)
+            for d in self.dummy_nodes:
+                preds = list(self.display_tree.predecessors(d))
+                succs = list(self.display_tree.successors(d))
+                if preds and preds[0] in explored and preds[0] in path and succs and succs[0] in path:
+                    dummy_path.add(d)
+            novos = None
+
+        if novos is None:
+            nodes = range(len(self._node_list))
+            edges = range(len(self._edge_list))
+        else:
+            nodes = [self._node_idx[n] for n in novos if n in self._node_idx]
+            edges = {e for n in novos for e in self._incident.get(n, ())}
+
+        node_changed = False
+        for i in nodes:
+            n = self._node_list[i]
+            state = 2 if path and n in path else (1 if n in explored else 0)
+            node_changed |= self._set_node(i, state)
+
+        edge_changed = False
+        for e in edges:
+            edge_changed |= self._set_edge(e, self._edge_target(e, explored, path, dummy_path, goal))
+
+        perfil.count("graph_nodes_checked", len(nodes))
+        if node_changed and self._node_artist is not None:
+            self._node_artist.set_facecolor(self._face)
+            self._node_artist.set_edgecolor(self._border)
+            self._node_artist.set_sizes(self._sizes)
+        if edge_changed and self._edge_artist is not None:
+            self._edge_artist.set_color(self._edge_colors)
+            self._edge_artist.set_linewidth(self._edge_widths)
+
+        ax.set_title(f"Nos Visitados: {len(explored)}", fontsize=12)
+
+    # --- nivel de detalhe (arvores grandes) ---
+
+    GLYPH_SIZE = 60
+
+    def _init_lod(self, ax, goal):
+        """Arvore inteira na janela, partida/objetivo fixos e selecao inicial"""
+        from matplotlib.colors import to_rgba
+
+        ax.clear()
+        ax.axis('off')
+        if self._lod is None:
+            self._lod = TreeLOD(self.display_tree, self.pos, self.start,
+                                skip=self.dummy_nodes | {self.start, goal})
+            self._lod_dummy = np.zeros(len(self._lod), dtype=bool)
+            self._lod_dummy[[self._lod.index[d] for d in self.dummy_nodes]] = True
+            self._lod_rgba = {c: to_rgba(c) for style in (self.NODE_STYLE, self.EDGE_STYLE)
+                              for st in style.values() for c in st if isinstance(c, str)}
+        self._lod.state[:] = 0
+        self._lod_artists = []
+
+        xy = self._lod.xy
+        pad = 2.0
+        ax.set_xlim(xy[:, 0].min() - pad, xy[:, 0].max() + pad)
+        ax.set_ylim(xy[:, 1].min() - pad, xy[:, 1].max() + pad)
+
+        for node, color, size in ((self.start, '#4444FF', 130), (goal, '#44FF44', 150)):
+            if node in self._lod.index:
+                ax.scatter(*self.pos[node], c=color, s=size, edgecolors='black', zorder=3)
+
+        self._ax = ax
+        self._ax_goal = goal
+        self._lod_select(ax)
+
+        # zoom/pan refazem a selecao (uma conexao por eixo)
+        if getattr(self, "_lod_cids", (None, ()))[0] is not ax:
+            self._lod_cids = (ax, [ax.callbacks.connect(name, self._lod_on_view)
+                                   for name in ('xlim_changed', 'ylim_changed')])
+
+    def _lod_on_view(self, ax):
+        if ax is self._ax:
+            self._lod_select(ax)
+
+    def _lod_effective(self, items):
+        # dummy nao e celula: vale o estado do pai (explorado no maximo)
+        lod = self._lod
+        state = lod.state[items].astype(np.int8)
+        par = lod.parent[items]
+        inherit = self._lod_dummy[items] & (state == 0) & (par >= 0)
+        state[inherit] = np.minimum(lod.state[par[inherit]], 1)
+        return state
+
+    def _lod_select(self, ax):
+        """Refaz a selecao (janela + orcamento) e os artistas do LOD"""
+        from matplotlib.collections import LineCollection
+
+        lod = self._lod
+        for artist in self._lod_artists:
+            artist.remove()
+
+        shown, glyph = lod.select(ax.get_xlim(), ax.get_ylim(), self.max_nodes)
+        self._lod_shown, self._lod_glyph = shown, glyph
+        self._lod_pos = {int(i): p for p, i in enumerate(shown.tolist())}
+
+        # arestas ate o pai de cada item (o pai pode estar fora da janela)
+        has_parent = lod.parent[shown] >= 0
+        self._lod_edge_items = np.flatnonzero(has_parent)
+        self._lod_edge_of = np.full(len(shown), -1, dtype=np.int64)
+        self._lod_edge_of[self._lod_edge_items] = np.arange(len(self._lod_edge_items))
+        child = shown[has_parent]
+        segments = np.stack([lod.xy[child], lod.xy[lod.parent[child]]], axis=1)
+        self._lod_edges = LineCollection(segments, zorder=1)
+        ax.add_collection(self._lod_edges, autolim=False)
+
+        # marcadores: nos com marcador proprio e glifos (sub arvores resumidas)
+        marked = glyph | ~lod.skip[shown]
+        self._lod_marked = np.flatnonzero(marked)
+        xy = lod.xy[shown[marked]]
+        self._lod_nodes = ax.scatter(xy[:, 0], xy[:, 1], zorder=2)
+        self._lod_artists = [self._lod_edges, self._lod_nodes]
+        self._lod_recolor()
+        perfil.count("artists_created", 2)
+
+    def _lod_recolor(self):
+        """Cores de todos os itens selecionados (vetorizado)"""
+        lod = self._lod
+        shown, glyph = self._lod_shown, self._lod_glyph
+        rgba = self._lod_rgba
+
+        # nos: estilo por estado; glifos: cinza pela fracao explorada, vermelho com caminho
+        styles = [self.NODE_STYLE[k] for k in range(3)]
+        state = lod.state[shown]
+        face = np.array([rgba[st[0]] for st in styles])[state]
+        border = np.array([rgba[st[1]] for st in styles])[state]
+        sizes = np.array([st[2] for st in styles], dtype=float)[state]
+
+        self._lod_done, self._lod_total = lod.counts(shown, glyph)
+        g = np.flatnonzero(glyph)
+        face[g] = self._lod_glyph_face(g)
+        border[g] = rgba["black"]
+        sizes[g] = self.GLYPH_SIZE * (1 + np.log2(lod.size[shown[g]]))
+
+        m = self._lod_marked
+        self._lod_nodes.set_facecolor(face[m])
+        self._lod_nodes.set_edgecolor(border[m])
+        self._lod_nodes.set_sizes(sizes[m])
+        self._lod_face, self._lod_border, self._lod_sizes = face, border, sizes
+
+        # arestas: explorada se as duas pontas estao, caminho se as duas sao caminho
+        n = len(self._lod_edge_items)
+        self._lod_edge_colors = np.zeros((n, 4))
+        self._lod_edge_widths = np.zeros(n)
+        self._lod_set_edges(np.arange(n))
+
+    def _lod_set_edges(self, e):
+        lod = self._lod
+        child = self._lod_shown[self._lod_edge_items[e]]
+        a, b = self._lod_effective(child), self._lod_effective(lod.parent[child])
+        state = np.where((a == 2) & (b == 2), 2, np.where((a >= 1) & (b >= 1), 1, 0))
+        colors = np.array([self._lod_rgba[self.EDGE_STYLE[k][0]] for k in range(3)])
+        widths = np.array([self.EDGE_STYLE[k][1] for k in range(3)])
+        self._lod_edge_colors[e] = colors[state]
+        self._lod_edge_widths[e] = widths[state]
+        self._lod_edges.set_color(self._lod_edge_colors)
+        self._lod_edges.set_linewidth(self._lod_edge_widths)
+
+    def _lod_glyph_face(self, g):
+        # branco (nada explorado) -> preto (tudo); caminho passando -> vermelho
+        lod = self._lod
+        shown = self._lod_shown[g]
+        frac = self._lod_done[g] / self._lod_total[g]
+        face = np.column_stack([1 - frac, 1 - frac, 1 - frac, np.ones(len(g))])
+        if len(g):
+            path_inside = np.array([(lod.state[i:i + s] == 2).any() for i, s in
+                                    zip(shown.tolist(), lod.size[shown].tolist())], dtype=bool)
+            face[path_inside] = (1.0, 0.27, 0.27, 1.0)
+        return face
+
+    def _draw_graph_lod(self, ax, explored, path, goal, novos):
+        lod = self._lod
+        if (getattr(self, "_ax", None) is not ax or self._ax_goal != goal or lod is None
+                or self._lod_nodes.axes is None):
+            self._init_lod(ax, goal)
+            lod = self._lod
+            novos = None
+
+        index = lod.index
+        if path:
+            # caminho: recolore tudo (uma vez, no final); dummy entre dois nos do caminho tambem
+            cells = [index[n] for n in path if n in index]
+            lod.state[cells] = 2
+            dummies = np.flatnonzero(self._lod_dummy)
+            between = (lod.state[lod.parent[dummies]] == 2) & (lod.state[dummies + 1] == 2)
+            lod.state[dummies[between]] = 2
+            novos = None
+
+        if novos is None:
+            cells = [index[n] for n in explored if n in index]
+            cells = np.array(cells, dtype=np.int64)
+            lod.state[cells[lod.state[cells] == 0]] = 1
+            self._lod_recolor()
+        else:
+            self._lod_update(novos)
+        perfil.count("graph_nodes_checked", len(self._lod_shown) if novos is None else len(novos))
+        ax.set_title(f"Nos Visitados: {len(explored)}", fontsize=12)
+
+    def _lod_update(self, novos):
+        """Marca os nos novos e recolore so os itens afetados"""
+        lod = self._lod
+        cells = [lod.index[n] for n in novos if n in lod.index]
+        cells = np.array([i for i in cells if lod.state[i] == 0], dtype=np.int64)
+        if not len(cells):
+            return
+        lod.state[cells] = 1
+
+        owner = lod.owners(self._lod_shown, self._lod_glyph, cells)
+        counted = owner[(owner >= 0) & ~lod.skip[cells]]
+        np.add.at(self._lod_done, counted, 1)
+        owner = owner[owner >= 0]
+
+        # itens cujos marcadores ou arestas podem mudar: donos, filhos e netos via dummy
+        items = set(owner.tolist())
+        for i in cells.tolist():
+            c, end = i + 1, i + lod.size[i]
+            while c < end:
+                for j in (c, c + 1) if self._lod_dummy[c] else (c,):
+                    p = self._lod_pos.get(j)
+                    if p is not None:
+                        items.add(p)
+                c += lod.size[c]
+        self._lod_recolor_items(np.array(sorted(items), dtype=np.int64))
 
-        if goal in self.display_tree:
-            nx.draw_networkx_nodes(self.display_tree, self.pos, ax=ax, nodelist=[goal],
-                                 node_color='#44FF44', node_size=150, edgecolors='black')
+    def _lod_recolor_items(self, items):
+        lod = self._lod
+        shown, glyph = self._lod_shown, self._lod_glyph
+        rgba = self._lod_rgba
+        for p in items.tolist():
+            if glyph[p]:
+                self._lod_face[p] = self._lod_glyph_face(np.array([p]))[0]
+            else:
+                face, edge, size = self.NODE_STYLE[int(lod.state[shown[p]])]
+                self._lod_face[p], self._lod_border[p], self._lod_sizes[p] = rgba[face], rgba[edge], size
+        m = self._lod_marked
+        self._lod_nodes.set_facecolor(self._lod_face[m])
+        self._lod_nodes.set_edgecolor(self._lod_border[m])
+        self._lod_nodes.set_sizes(self._lod_sizes[m])
 
-        ax.set_title(f"Nos Visitados: {len(explored)}", fontsize=12)
\ No newline at end of file
+        # arestas ate o pai dos itens afetados
+        e = self._lod_edge_of[items]
+        e = e[e >= 0]
+        if len(e):
+            self._lod_set_edges(e)
@@ -0,0 +1,200 @@
+"""Nivel de detalhe (LOD) para labirintos e arvores grandes.
+
+MazeImageLOD: a imagem do labirinto continua inteira na memoria (e e ali
+que os nos explorados sao pintados), mas o imshow so recebe a regiao
+visivel reduzida ao tamanho do painel em pixels (media de blocos k x k).
+A cada quadro so os blocos das celulas novas sao refeitos.
+
+TreeLOD: arrays da arvore resumida em pre-ordem (pai, profundidade,
+tamanho da sub arvore). select() escolhe, dentro da janela visivel, a
+profundidade de corte que cabe no orcamento de nos; sub arvores abaixo do
+corte viram um unico glifo com a fracao explorada.
+
+Nos dois casos o custo por quadro depende do orcamento (pixels / nos), nao
+do tamanho do labirinto; a area visivel muda com zoom (roda do mouse,
+enable_scroll_zoom) e so entao a selecao e refeita.
+"""
+import numpy as np
+
+# nos desenhados por vez no grafo (acima disso entra o LOD)
+MAX_NODES = 1500
+
+
+class MazeImageLOD:
+    """Imagem (H, W, 3) exibida com no maximo ~1 bloco por pixel da area visivel"""
+
+    def __init__(self, ax, image, **kwargs):
+        self.ax = ax
+        self.image = image
+        self.factor = 1
+        self.window = (0, image.shape[0], 0, image.shape[1])
+        self.artist = ax.imshow(image, interpolation='nearest', **kwargs)
+        self._small = None
+        self._busy = False
+        self._refresh()
+        ax.callbacks.connect('xlim_changed', self._on_view)
+        ax.callbacks.connect('ylim_changed', self._on_view)
+
+    def _budget(self):
+        # pixels do painel (no minimo 1)
+        box = self.ax.get_window_extent()
+        return max(int(box.height), 1), max(int(box.width), 1)
+
+    def _visible(self):
+        h, w = self.image.shape[:2]
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        y0, y1 = max(int(np.floor(y0 + 0.5)), 0), min(int(np.ceil(y1 + 0.5)), h)
+        x0, x1 = max(int(np.floor(x0 + 0.5)), 0), min(int(np.ceil(x1 + 0.5)), w)
+        if y1 <= y0 or x1 <= x0:
+            return 0, h, 0, w
+        return y0, y1, x0, x1
+
+    def _refresh(self):
+        """Recalcula janela, fator e a imagem reduzida inteira"""
+        h, w = self.image.shape[:2]
+        y0, y1, x0, x1 = self._visible()
+        bh, bw = self._budget()
+        k = max(1, -(-(y1 - y0) // bh), -(-(x1 - x0) // bw))
+
+        # janela alinhada aos blocos (mesmos blocos em qualquer zoom com o mesmo k)
+        y0, x0 = y0 // k * k, x0 // k * k
+        self.factor = k
+        self.window = (y0, y1, x0, x1)
+        if k == 1 and (y0, y1, x0, x1) == (0, h, 0, w):
+            # cabe inteira: a propria imagem, sem copia
+            self._small = None
+            self.artist.set_data(self.image)
+            self._set_extent((-0.5, w - 0.5, h - 0.5, -0.5))
+            return
+
+        rows, cols = np.arange(y0, y1, k), np.arange(x0, x1, k)
+        win = self.image[y0:y1, x0:x1]
+        sums = np.add.reduceat(np.add.reduceat(win, rows - y0, axis=0), cols - x0, axis=1)
+        counts = np.outer(np.diff(np.append(rows, y1)), np.diff(np.append(cols, x1)))
+        self._small = sums / counts[..., None]
+        self.artist.set_data(self._small)
+        self._set_extent((x0 - 0.5, x0 + len(cols) * k - 0.5, y0 + len(rows) * k - 0.5, y0 - 0.5))
+
+    def _set_extent(self, extent):
+        # set_extent mexe nos limites (autoscale); a vista e de quem da o zoom
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        self.artist.set_extent(extent)
+        self.ax.set_xlim(xlim, emit=False)
+        self.ax.set_ylim(ylim, emit=False)
+
+    def _on_view(self, ax):
+        if self._busy:
+            return
+        self._busy = True
+        try:
+            self._refresh()
+        finally:
+            self._busy = False
+
+    def set_data(self, image, changed=None):
+        """Troca/atualiza a imagem; 'changed' = celulas (y, x) alteradas desde a ultima vez"""
+        if image is not self.image or changed is None:
+            self.image = image
+            self._refresh()
+            return
+        if self._small is None:
+            self.artist.set_data(image)
+            return
+
+        # refaz so os blocos visiveis que contem celulas alteradas
+        k = self.factor
+        y0, y1, x0, x1 = self.window
+        blocks = {((y - y0) // k, (x - x0) // k) for y, x in changed if y0 <= y < y1 and x0 <= x < x1}
+        for by, bx in blocks:
+            ya, xa = y0 + by * k, x0 + bx * k
+            self._small[by, bx] = image[ya:min(ya + k, y1), xa:min(xa + k, x1)].mean(axis=(0, 1))
+        if blocks:
+            self.artist.set_data(self._small)
+
+
+class TreeLOD:
+    """Arvore resumida em arrays de pre-ordem para selecao por janela/orcamento"""
+
+    def __init__(self, tree, pos, root, skip=()):
+        # pre-ordem iterativa: a sub arvore de i ocupa [i, i + size[i])
+        nodes, parent, depth = [], [], []
+        stack = [(root, -1, 0)]
+        while stack:
+            node, par, d = stack.pop()
+            nodes.append(node)
+            parent.append(par)
+            depth.append(d)
+            i = len(nodes) - 1
+            stack.extend((child, i, d + 1) for child in reversed(list(tree.successors(node))))
+
+        n = len(nodes)
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.parent = np.array(parent, dtype=np.int64)
+        self.depth = np.array(depth, dtype=np.int64)
+        self.xy = np.array([pos[node] for node in nodes], dtype=float)
+        # nos sem marcador proprio (dummies, partida/objetivo desenhados a parte)
+        self.skip = np.zeros(n, dtype=bool)
+        self.skip[[self.index[s] for s in skip if s in self.index]] = True
+
+        size = np.ones(n, dtype=np.int64)
+        for i in range(n - 1, 0, -1):
+            size[parent[i]] += size[i]
+        self.size = size
+
+        # estado por no: 0 nao visitado, 1 explorado, 2 caminho
+        self.state = np.zeros(n, dtype=np.int8)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def select(self, xlim, ylim, budget=MAX_NODES):
+        """Nos a desenhar na janela: (indices em pre-ordem, mascara de glifos)"""
+        (x0, x1), (y0, y1) = sorted(xlim), sorted(ylim)
+        x, y = self.xy[:, 0], self.xy[:, 1]
+        visible = np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+        if len(visible) == 0:
+            return visible, np.zeros(0, dtype=bool)
+
+        # maior profundidade de corte que cabe no orcamento (pelo menos a mais rasa)
+        depth = self.depth[visible]
+        dmin = int(depth.min())
+        per_depth = np.cumsum(np.bincount(depth - dmin))
+        cut = dmin + max(int(np.searchsorted(per_depth, budget, side='right')) - 1, 0)
+
+        shown = visible[depth <= cut]
+        glyph = (self.depth[shown] == cut) & (self.size[shown] > 1)
+        return shown, glyph
+
+    def owners(self, shown, glyph, nodes):
+        """Posicao em 'shown' que representa cada no (ele mesmo ou o glifo acima), -1 se nenhum"""
+        starts = shown
+        ends = shown + np.where(glyph, self.size[shown], 1)
+        pos = np.searchsorted(starts, nodes, side='right') - 1
+        ok = (pos >= 0) & (nodes < ends[np.maximum(pos, 0)])
+        return np.where(ok, pos, -1)
+
+    def counts(self, shown, glyph):
+        """(explorados, total) de nos com marcador dentro de cada item desenhado"""
+        marked = ~self.skip
+        total = np.concatenate(([0], np.cumsum(marked)))
+        done = np.concatenate(([0], np.cumsum(marked & (self.state > 0))))
+        ends = shown + np.where(glyph, self.size[shown], 1)
+        return done[ends] - done[shown], np.maximum(total[ends] - total[shown], 1)
+
+
+def enable_scroll_zoom(fig, axes, factor=1.5):
+    """Zoom com a roda do mouse em volta do cursor nos eixos dados"""
+    axes = list(axes)
+
+    def on_scroll(event):
+        ax = event.inaxes
+        if ax not in axes or event.xdata is None:
+            return
+        scale = 1 / factor if event.button == 'up' else factor
+        for get, set_, c in ((ax.get_xlim, ax.set_xlim, event.xdata), (ax.get_ylim, ax.set_ylim, event.ydata)):
+            lo, hi = get()
+            set_(c + (lo - c) * scale, c + (hi - c) * scale)
+        fig.canvas.draw_idle()
+
+    return fig.canvas.mpl_connect('scroll_event', on_scroll)
@@ -0,0 +1,119 @@
+"""Execucao em lote: gera e resolve uma faixa de seeds num pool de processos.
+
+Uso:
+    python lote.py 0 10000 --width 32 --height 32 --output resultados.csv
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from agente import Agente
+from nucleo import build_scenario, LARGURA, ALTURA
+
+FIELDS = ["seed", "width", "height", "status", "gen_time", "solve_time", "expanded", "path_length"]
+
+
+def solve_seed(seed, width, height):
+    """Gera + resolve uma seed (mesmo cenario do main.py)"""
+    t0 = time.perf_counter()
+    labirinto, start, goal = build_scenario(seed, width, height)
+    t1 = time.perf_counter()
+    result = Agente(labirinto, start, goal).solve()
+    t2 = time.perf_counter()
+
+    return {
+        "seed": seed,
+        "width": width,
+        "height": height,
+        "status": result.status,
+        "gen_time": t1 - t0,
+        "solve_time": t2 - t1,
+        "expanded": result.expanded,
+        "path_length": result.cost,  # passos (arestas), como no resto; None sem caminho
+    }
+
+
+def run_batch(seeds, width, height, workers=None):
+    """Gera os resultados conforme ficam prontos (ordem de conclusao)"""
+    workers = workers or os.cpu_count() or 1
+
+    # limita tarefas pendentes para nao enfileirar milhoes de futures
+    max_pending = workers * 4
+    seeds = iter(seeds)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for seed in seeds:
+            pending.add(pool.submit(solve_seed, seed, width, height))
+            if len(pending) < max_pending:
+                continue
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+
+class _CsvWriter:
+    def __init__(self, stream):
+        self._writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row)
+
+
+class _JsonlWriter:
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, row):
+        self._stream.write(json.dumps(row) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve uma faixa de seeds em paralelo")
+    parser.add_argument("start", type=int, help="primeira seed")
+    parser.add_argument("stop", type=int, help="ultima seed (exclusiva)")
+    parser.add_argument("--width", type=int, default=LARGURA)
+    parser.add_argument("--height", type=int, default=ALTURA)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processos (padrao: um por nucleo)")
+    parser.add_argument("--output", default="-",
+                        help="arquivo de saida .csv ou .jsonl ('-' = stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None,
+                        help="formato (padrao: pela extensao do arquivo)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "jsonl" if args.output.endswith(".jsonl") else "csv"
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        writer = _JsonlWriter(stream) if fmt == "jsonl" else _CsvWriter(stream)
+
+        t0 = time.perf_counter()
+        count = 0
+        for row in run_batch(range(args.start, args.stop), args.width, args.height, args.workers):
+            writer.write(row)
+            stream.flush()
+            count += 1
+        elapsed = time.perf_counter() - t0
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    print(f"{count} seeds em {elapsed:.2f}s ({count / elapsed:,.1f} seeds/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,197 @@
+import argparse
 import gc
 import random
+import time
 import numpy as np
-import matplotlib
-try:
-    matplotlib.use('TkAgg')
-except ImportError:
-    matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
-
-from mazeGen import MazeGenerator
-from agente import Agente
-from grafos import visualizadorGrafos
-from acoes import VisualizadorAcoes
-import sys
-
-def main():
-    # defs labirinto
-    if len(sys.argv) > 1:
-        try:
-            SEED = int(sys.argv[1])
-            print(f"Seed manual fornecida: {SEED}")
-        except ValueError:
-            print("Valor de seed inválido. Usando seed aleatória.")
-            SEED = random.randint(0, 1000)
-    else:
-        SEED = random.randint(0, 1000)
 
-    LARGURA = 16
-    ALTURA = 16
+import perfil
+from buscas import ENGINES, make_engine
+# cenario e constantes ficam no nucleo (so numpy)
+from nucleo import ALTURA, LARGURA, build_scenario
 
-    # gera labirinto
-    print(f"Gerando Labirinto {LARGURA}x{ALTURA} (Seed={SEED})")
-    gen1 = MazeGenerator(width=LARGURA, height=ALTURA, seed=SEED)
-    labirinto = gen1.generate()
-  
-    START_POS = (1, 1) 
-    1
-    y_indices, x_indices = np.where(labirinto == gen1.PATH)
 
-    # array lista cordenada 
-    valid_path_coords = list(zip(y_indices, x_indices)) 
+def run_headless(seeds, width, height, busca="astar"):
+    """Resolve varias seeds sem animacao (nao importa matplotlib)"""
+    print(f"{'seed':>8} {'status':>10} {'custo':>7} {'expandidos':>10} {'tempo (s)':>10}")
+    for seed in seeds:
+        with perfil.phase("generate"):
+            labirinto, start, goal = build_scenario(seed, width, height)
+
+        t0 = time.perf_counter()
+        with perfil.phase("solve"):
+            agente = make_engine(busca, labirinto, start, goal)
+            result = agente.solve()
+        elapsed = time.perf_counter() - t0
+        perfil.count_solver(agente)
+
+        cost = "-" if result.cost is None else result.cost
+        print(f"{seed:>8} {result.status:>10} {cost:>7} {result.expanded:>10} {elapsed:>10.4f}")
+
+
+def setup_panels(fig, labirinto, START_POS, GOAL_POS, SEED, grafo_vis, acao_vis):
+    """Monta os paineis (grafo, acoes, labirinto) na figura"""
+    from matplotlib.gridspec import GridSpec
+
+    from lod import MazeImageLOD
+
+    fig.patch.set_facecolor('white')
+    fig.suptitle(f"Simulação - Seed {SEED}", fontsize=16)
+
+    gs = GridSpec(2, 2, figure=fig, width_ratios=[1, 1.5], height_ratios=[5, 1])
+
+    ax_graph = fig.add_subplot(gs[0, 0])
+    ax_action = fig.add_subplot(gs[1, 0])
+    ax_maze = fig.add_subplot(gs[:, 1])
+
+    ax_graph.axis('off')
+    ax_action.axis('off')
+    ax_maze.axis('off')
+
+    # cfg labirinto dir
+    img_pb = np.stack([labirinto]*3, axis=-1).astype(float)
+    img_visual_base = 1.0 - img_pb
+
+    # imagem limitada aos pixels do painel (labirintos grandes sao reduzidos)
+    img_plot = MazeImageLOD(ax_maze, img_visual_base)
+
+    ax_maze.plot(START_POS[1], START_POS[0], 'bo', markersize=10, label='Início')
+    ax_maze.plot(GOAL_POS[1], GOAL_POS[0], 'go', markersize=10, label='Fim')
+
+    ax_maze.set_title("Visualização do Ambiente")
+
+    # cfg grafo esq
+    grafo_vis.draw_graph(ax_graph, set([START_POS]), [], GOAL_POS, show_all=False)
+
+    # cfg acoes esq baixo
+    acao_vis.draw(ax_action, None, None, None)
+
+    return ax_graph, ax_action, ax_maze, img_plot, img_visual_base
+
+
+def paint_explored(current_visual, novos, START_POS, GOAL_POS):
+    # pinta explorados novos (in-place)
+    for (y, x) in novos:
+        if (y, x) != START_POS and (y, x) != GOAL_POS:
+            current_visual[y, x] = [0.7, 0.7, 0.7] # cinza
+
+
+def draw_result(fig, ax_graph, ax_maze, grafo_vis, status, explored, path, GOAL_POS, SEED):
+    # resultado
+    if status == "goal_found":
+        fig.suptitle(f"SUCESSO! Caminho Encontrado (Seed={SEED})", color='green', fontsize=16)
+
+        # desenha linha mapa
+        path_y = [p[0] for p in path]
+        path_x = [p[1] for p in path]
+        ax_maze.plot(path_x, path_y, color='red', linewidth=3, label='Caminho Final')
+
+        # desenha grafo
+        grafo_vis.draw_graph(ax_graph, explored, path, GOAL_POS, show_all=True)
+
+    elif status == "no_path":
+        fig.suptitle(f"FALHA - Sem Caminho (Seed={SEED})", color='red', fontsize=16)
+
+
+def live_frames(agente, steps_per_frame):
+    """Quadros direto do solver: (status, nos novos, (avo, pai, filho))"""
+    status = agente.status
+    while status == "searching":
+        # varios passos do solver por quadro
+        novos = []
+        with perfil.phase("solve_step"):
+            for _ in range(steps_per_frame):
+                antes = agente.expanded
+                status = agente.solve_step()
+                if agente.expanded != antes:
+                    novos.append(agente.current)
+                if status != "searching":
+                    break
+
+        # identifica nos para acoes (ultimo no descoberto, O(1))
+        yield status, novos, agente.last_triple()
+
 
-    # partida valida se != objetivo
-    if START_POS in valid_path_coords:
-        valid_path_coords.remove(START_POS)
-    random.seed(SEED)
+def replay_frames(reader, steps_per_frame, seek=0):
+    """Quadros lidos de um rastro gravado (rastro.py), comecando no passo 'seek'"""
+    frames = reader.frames(steps_per_frame, seek)
+    while True:
+        with perfil.phase("read_trace"):
+            frame = next(frames, None)
+            if frame is None:
+                return
+            status, novos, step = frame
+            triple = reader.triple(step)
+        yield status, novos, triple
 
-    # escolhe objetivo aleatorio
-    GOAL_POS = random.choice(valid_path_coords)
+
+def open_replay(path):
+    """Abre um rastro e confere se ele bate com o cenario da sua seed"""
+    from rastro import TraceReader
+
+    reader = TraceReader(path)
+    if reader.seed is None:
+        raise ValueError(f"Rastro sem seed: {path}")
+    h, w = reader.shape
+    width, height = w // 2, h // 2
+    _, start, goal = build_scenario(reader.seed, width, height)
+    if (start, goal) != (reader.start, reader.goal):
+        raise ValueError(f"Rastro nao corresponde ao cenario da seed {reader.seed}: {path}")
+    return reader, reader.seed, width, height
+
+
+def record_scenario(SEED, width, height, path, busca="astar"):
+    """Resolve a seed sem animacao gravando o rastro binario em path"""
+    from rastro import record_trace
+
+    labirinto, start, goal = build_scenario(SEED, width, height)
+    t0 = time.perf_counter()
+    agente = make_engine(busca, labirinto, start, goal)
+    with perfil.phase("record_trace"):
+        status = record_trace(agente, path, seed=SEED)
+    perfil.count_solver(agente)
+    print(f"Rastro: {agente.expanded} nos expandidos ({status}) em "
+          f"{time.perf_counter() - t0:.2f}s -> {path}")
+
+
+def run_animation(SEED, width, height, steps_per_frame=1, layout_cache=None, replay=None, seek=0,
+                  busca="astar"):
+    import matplotlib
+    try:
+        matplotlib.use('TkAgg')
+    except ImportError:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    from grafos import visualizadorGrafos
+    from acoes import VisualizadorAcoes
+    from lod import enable_scroll_zoom
+
+    # gera labirinto
+    print(f"Gerando Labirinto {width}x{height} (Seed={SEED})")
+    with perfil.phase("generate"):
+        labirinto, START_POS, GOAL_POS = build_scenario(SEED, width, height)
 
     print(f"Partida: {START_POS}")
     print(f"Objetivo: {GOAL_POS}")
 
-    # init agente
-    print(f"Iniciando Agente A* de {START_POS} para {GOAL_POS}")
-    agente = Agente(labirinto, START_POS, GOAL_POS)
+    # fonte dos quadros: agente ao vivo ou rastro gravado
+    if replay is not None:
+        print(f"Reproduzindo rastro {replay.filename} ({len(replay)} passos) a partir do passo {seek}")
+        frames = replay_frames(replay, steps_per_frame, seek)
+    else:
+        print(f"Iniciando Agente ({busca}) de {START_POS} para {GOAL_POS}")
+        agente = make_engine(busca, labirinto, START_POS, GOAL_POS)
+        frames = live_frames(agente, steps_per_frame)
 
     # init visualizadores
-    grafo_vis = visualizadorGrafos(labirinto, START_POS, GOAL_POS)
+    with perfil.phase("build_graph"):
+        grafo_vis = visualizadorGrafos(labirinto, START_POS, GOAL_POS, seed=SEED, layout_cache=layout_cache)
     acao_vis = VisualizadorAcoes()
 
     # cfg animacao
     plt.rcParams['toolbar'] = 'None'
     plt.ion() # ativa modo interativo
-    
+
     # cria figura 2 subplots
     fig = plt.figure(figsize=(18, 9))
     manager = fig.canvas.manager
@@ -87,101 +214,132 @@ def main():
     except:
         pass
 
-    fig.patch.set_facecolor('white')
-    fig.suptitle(f"Simulação - Seed {SEED}", fontsize=16)
-
-    gs = GridSpec(2, 2, width_ratios=[1, 1.5], height_ratios=[5, 1])
-
-    ax_graph = fig.add_subplot(gs[0, 0])  
-    ax_action = fig.add_subplot(gs[1, 0]) 
-    ax_maze = fig.add_subplot(gs[:, 1])
-
-    ax_graph.axis('off')
-    ax_action.axis('off')
-    ax_maze.axis('off')
-
-    # cfg labirinto dir
-    img_pb = np.stack([labirinto]*3, axis=-1).astype(float)
-    img_visual_base = 1.0 - img_pb 
-    
-    img_plot = ax_maze.imshow(img_visual_base, interpolation='nearest')
-    
-    ax_maze.plot(START_POS[1], START_POS[0], 'bo', markersize=10, label='Início') 
-    ax_maze.plot(GOAL_POS[1], GOAL_POS[0], 'go', markersize=10, label='Fim')   
-    
-    ax_maze.set_title("Visualização do Ambiente")
-
-    # cfg grafo esq
-    grafo_vis.draw_graph(ax_graph, set([START_POS]), [], GOAL_POS, show_all=False)
+    with perfil.phase("setup_panels"):
+        ax_graph, ax_action, ax_maze, img_plot, img_visual_base = setup_panels(
+            fig, labirinto, START_POS, GOAL_POS, SEED, grafo_vis, acao_vis)
 
-    # cfg acoes esq baixo
-    acao_vis.draw(ax_action, None, None, None)
+    # roda do mouse: zoom no grafo e no labirinto (o LOD refaz o detalhe da area visivel)
+    enable_scroll_zoom(fig, (ax_graph, ax_maze))
 
     plt.show(block=False)
-    
+
     # loop animacao
     status = "searching"
-    current_visual = None
+    explored = set()
+
+    # imagem atualizada in-place: so os nos novos sao pintados
+    current_visual = np.copy(img_visual_base)
 
-    current_node = START_POS
-    parent_node = None
-    grandparent_node = None
-    
     try:
-        while status == "searching":
-            status = agente.solve_step()
-
-            # identifica nos para acoes
-            if agente.came_from:
-                current_node, parent_node = list(agente.came_from.items())[-1]
-                grandparent_node = agente.came_from.get(parent_node)
-            
-            # att labirinto
-            current_visual = np.copy(img_visual_base)
-            
-            # pinta explorados
-            for (y, x) in agente.explored_nodes:
-                if (y, x) != START_POS and (y, x) != GOAL_POS:
-                    current_visual[y, x] = [0.7, 0.7, 0.7] # cinza
-            
-            img_plot.set_data(current_visual)
-            
+        for status, novos, (grandparent_node, parent_node, current_node) in frames:
+            with perfil.phase("recolor_maze"):
+                explored.update(novos)
+                paint_explored(current_visual, novos, START_POS, GOAL_POS)
+                img_plot.set_data(current_visual, novos)
+
             # att grafo
-            grafo_vis.draw_graph(ax_graph, agente.explored_nodes, [], GOAL_POS, show_all=False)
+            with perfil.phase("draw_graph"):
+                grafo_vis.draw_graph(ax_graph, explored, [], GOAL_POS, show_all=False, novos=novos)
 
             # att acoes
-            acao_vis.draw(ax_action, grandparent_node, parent_node, current_node)
+            with perfil.phase("draw_actions"):
+                acao_vis.draw(ax_action, grandparent_node, parent_node, current_node)
 
-            fig.canvas.draw_idle()
-            plt.pause(0.001)
+            with perfil.phase("canvas"):
+                fig.canvas.draw_idle()
+                plt.pause(0.001)
+            perfil.count("frames")
 
     except Exception as e:
         print(f"\nSimulação interrompida. {e}")
         plt.ioff()
         return
 
-    # resultado
-    if status == "goal_found":
-        fig.suptitle(f"SUCESSO! Caminho Encontrado (Seed={SEED})", color='green', fontsize=16)
- 
-        # desenha linha mapa
-        path_y = [p[0] for p in agente.path]
-        path_x = [p[1] for p in agente.path]
-        ax_maze.plot(path_x, path_y, color='red', linewidth=3, label='Caminho Final') 
-        
-        # desenha grafo
-        grafo_vis.draw_graph(ax_graph, agente.explored_nodes, agente.path, GOAL_POS, show_all=True)
-        
-        fig.canvas.draw_idle()
-        
-    elif status == "no_path":
+    if replay is None:
+        perfil.count_solver(agente)
+    path = replay.path() if replay is not None else agente.path
+    with perfil.phase("draw_result"):
+        draw_result(fig, ax_graph, ax_maze, grafo_vis, status, explored, path, GOAL_POS, SEED)
+    if status == "no_path":
         print("\n FALHA ")
-        fig.suptitle(f"FALHA - Sem Caminho (Seed={SEED})", color='red', fontsize=16)
-        
+    fig.canvas.draw_idle()
+
     print("Simulação concluída.")
     plt.ioff()
     plt.show(block=True)
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Labirinto + agente A*")
+    parser.add_argument("seed", nargs="?", help="seed do labirinto (aleatória se omitida)")
+    parser.add_argument("--headless", action="store_true",
+                        help="resolve sem animação (não importa matplotlib)")
+    parser.add_argument("--count", type=int, default=1,
+                        help="no modo headless, resolve COUNT seeds a partir de SEED")
+    parser.add_argument("--steps-per-frame", type=int, default=1,
+                        help="passos do solver por quadro da animação")
+    parser.add_argument("--layout-cache", metavar="PASTA", default=None,
+                        help="guarda o layout da árvore em disco (por seed/tamanho/partida)")
+    parser.add_argument("--export", metavar="ARQUIVO", default=None,
+                        help="grava a animação em .mp4/.gif sem abrir janela")
+    parser.add_argument("--fps", type=int, default=30, help="quadros por segundo do --export")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processos renderizando quadros no --export (padrão: um por núcleo)")
+    parser.add_argument("--busca", choices=list(ENGINES), default="astar",
+                        help="algoritmo de busca (padrão: astar)")
+    parser.add_argument("--record", metavar="ARQUIVO", default=None,
+                        help="resolve sem animação gravando o rastro binário da busca")
+    parser.add_argument("--replay", metavar="ARQUIVO", default=None,
+                        help="anima (ou exporta) a partir de um rastro gravado com --record")
+    parser.add_argument("--seek", type=int, default=0, metavar="N",
+                        help="no --replay, começa a animação já no passo N")
+    parser.add_argument("--profile", action="store_true",
+                        help="mede tempo por fase e contadores e imprime um resumo no fim "
+                             "(no --export, as fases dos processos renderizadores vêm somadas)")
+    parser.add_argument("--profile-trace", metavar="ARQUIVO", default=None,
+                        help="com --profile, grava a linha do tempo (JSON do Chrome trace; "
+                             "só o processo principal)")
+    parser.add_argument("--width", type=int, default=LARGURA)
+    parser.add_argument("--height", type=int, default=ALTURA)
+    args = parser.parse_args(argv)
+    if args.profile or args.profile_trace:
+        perfil.enable()
+
+    # defs labirinto
+    replay = None
+    if args.replay:
+        replay, SEED, args.width, args.height = open_replay(args.replay)
+        print(f"Rastro {args.replay}: seed {SEED}, {args.width}x{args.height}")
+    elif args.seed is not None:
+        try:
+            SEED = int(args.seed)
+            print(f"Seed manual fornecida: {SEED}")
+        except ValueError:
+            print("Valor de seed inválido. Usando seed aleatória.")
+            SEED = random.randint(0, 1000)
+    else:
+        SEED = random.randint(0, 1000)
+
+    if args.headless:
+        run_headless(range(SEED, SEED + args.count), args.width, args.height, args.busca)
+    elif args.record:
+        record_scenario(SEED, args.width, args.height, args.record, args.busca)
+    elif args.export:
+        from exportar import export_animation
+        export_animation(SEED, args.width, args.height, args.export, fps=args.fps,
+                         steps_per_frame=max(1, args.steps_per_frame), workers=args.workers,
+                         layout_cache=args.layout_cache, trace=args.replay, busca=args.busca)
+    else:
+        run_animation(SEED, args.width, args.height, max(1, args.steps_per_frame),
+                      layout_cache=args.layout_cache, replay=replay, seek=max(0, args.seek),
+                      busca=args.busca)
+
+    if perfil.enabled():
+        print(perfil.summary())
+        if args.profile_trace:
+            perfil.save_trace(args.profile_trace)
+            print(f"Linha do tempo gravada em {args.profile_trace}")
+
 if __name__ == "__main__":
     main()
     gc.collect() # limpa memoria
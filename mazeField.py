@@ -0,0 +1,131 @@
+"""Campos de distancia da grade inteira (BFS por frente de onda).
+
+distance_field(labirinto, fontes) da a distancia (int32) de todas as
+celulas ate a fonte mais proxima, -1 em paredes e celulas inalcancaveis.
+A busca anda uma frente inteira por iteracao sobre a grade achatada com
+borda de parede (sem testes de limite): frentes largas (labirintos com
+ciclos, varias fontes) avancam em bloco com NumPy; frentes estreitas
+(corredores de labirintos perfeitos, poucas celulas por nivel) vao num
+laco escalar, onde o custo fixo de cada chamada NumPy nao compensa.
+
+flow_field(dist) da, para cada celula, a direcao do vizinho um passo mais
+perto de uma fonte (indice em DIRECTIONS), calculada com mascaras
+deslocadas sobre a grade inteira; follow(dist, flow, celula) anda por ela.
+Um campo so serve de tabela de heuristica exata ou de rota para qualquer
+numero de agentes indo para as mesmas fontes.
+"""
+import numpy as np
+
+from mazeStore import as_matrix
+
+PATH = 0
+
+# mesma ordem de vizinhos do Agente: +1, -1, +w, -w
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+# frentes com menos celulas que isso vao pelo laco escalar
+SMALL_FRONT = 48
+
+
+def distance_field(maze, sources, path=PATH, targets=None):
+    """Distancias (H, W) int32 ate a fonte mais proxima; -1 onde nao alcanca.
+
+    sources: celulas (y, x); fontes em parede sao ignoradas. Com targets, a
+    busca para no nivel em que o ultimo alvo e alcancado (celulas mais
+    longe ficam -1).
+    """
+    matrix = np.asarray(as_matrix(maze))
+    h, w = matrix.shape
+    W = w + 2
+
+    # borda de parede: vizinho de celula livre e sempre um indice valido
+    free = np.zeros((h + 2, W), dtype=bool)
+    free[1:-1, 1:-1] = matrix == path
+    free = free.ravel()
+    dist = np.full(free.size, -1, dtype=np.int32)
+
+    sources = np.asarray(sources, dtype=np.int64).reshape(-1, 2)
+    front = (sources[:, 0] + 1) * W + sources[:, 1] + 1
+    front = np.unique(front[free[front]])
+    dist[front] = 0
+
+    pending = None
+    if targets is not None:
+        targets = np.asarray(targets, dtype=np.int64).reshape(-1, 2)
+        pending = ((targets[:, 0] + 1) * W + targets[:, 1] + 1).tolist()
+
+    offsets = np.array([1, -1, W, -W], dtype=np.int64)
+    # ultimo indice que escreveu em cada celula (tira repetidos em O(n))
+    slot = None
+    passable = memoryview(free.view(np.uint8))
+    d_view = memoryview(dist)
+
+    d = 0
+    front = front.tolist()
+    while len(front):
+        d += 1
+        if len(front) < SMALL_FRONT:
+            if not isinstance(front, list):
+                front = front.tolist()
+            nxt = []
+            for u in front:
+                for v in (u + 1, u - 1, u + W, u - W):
+                    if passable[v] and d_view[v] < 0:
+                        d_view[v] = d
+                        nxt.append(v)
+        else:
+            front = np.asarray(front, dtype=np.int64)
+            nxt = (front[:, None] + offsets).ravel()
+            nxt = nxt[free[nxt]]
+            nxt = nxt[dist[nxt] < 0]
+            rank = np.arange(len(nxt))
+            if slot is None:
+                slot = np.zeros(free.size, dtype=np.int64)
+            slot[nxt] = rank
+            nxt = nxt[slot[nxt] == rank]
+            dist[nxt] = d
+        front = nxt
+
+        if pending is not None:
+            pending = [t for t in pending if d_view[t] < 0]
+            if not pending:
+                break
+
+    return dist.reshape(h + 2, W)[1:-1, 1:-1].copy()
+
+
+def flow_field(dist):
+    """Direcao (int8, indice em DIRECTIONS) de cada celula para o vizinho com distancia - 1.
+
+    -1 nas fontes, paredes e celulas inalcancaveis. Com empate vale a
+    primeira direcao de DIRECTIONS.
+    """
+    dist = np.asarray(dist)
+    h, w = dist.shape
+    # distancia do vizinho em cada direcao (-1 fora da grade)
+    pad = np.full((h + 2, w + 2), -1, dtype=dist.dtype)
+    pad[1:-1, 1:-1] = dist
+    target = dist - 1
+
+    flow = np.full((h, w), -1, dtype=np.int8)
+    todo = dist > 0
+    for k, (dy, dx) in enumerate(DIRECTIONS):
+        hit = todo & (pad[1 + dy:h + 1 + dy, 1 + dx:w + 1 + dx] == target)
+        flow[hit] = k
+        todo &= ~hit
+    return flow
+
+
+def follow(dist, flow, cell):
+    """Caminho [(y, x), ...] da celula ate a fonte mais proxima ([] se nao alcanca)"""
+    y, x = cell
+    if dist[y, x] < 0:
+        return []
+    path = [(y, x)]
+    k = int(flow[y, x])
+    while k >= 0:
+        dy, dx = DIRECTIONS[k]
+        y, x = y + dy, x + dx
+        path.append((y, x))
+        k = int(flow[y, x])
+    return path
@@ -4,60 +4,325 @@ import numpy as np
 class MazeGenerator:
     PATH = 0
     WALL = 1
-    
-    def __init__(self, width, height, seed=None):
+
+    # algoritmos disponiveis
+    ALGORITHMS = ("backtracker", "sidewinder", "eller", "kruskal", "wilson")
+
+    # linhas processadas por bloco no modo rapido (limita memoria temporaria)
+    BLOCK_ROWS = 256
+
+    def __init__(self, width, height, seed=None, algorithm="backtracker", braid=0.0):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Algoritmo desconhecido: {algorithm}")
+        if not 0.0 <= braid <= 1.0:
+            raise ValueError(f"braid deve estar entre 0 e 1: {braid}")
+
         self.logical_width = width
         self.logical_height = height
-        
+        self.algorithm = algorithm
+        # fracao dos becos sem saida removidos depois (0 = labirinto perfeito)
+        self.braid = braid
+
         self.matrix_width = (width * 2) + 1
         self.matrix_height = (height * 2) + 1
-        
+
         # Armazena a seed
         self.seed = seed
         random.seed(self.seed)
-        
+
         # paredes
         self.maze = np.ones((self.matrix_height, self.matrix_width), dtype=np.uint8)
-        
-        # celulas visitadas
-        self.visited = np.zeros((self.logical_height, self.logical_width), dtype=bool)
-    
+
+        # celulas visitadas (so o backtracker precisa)
+        if algorithm == "backtracker":
+            self.visited = np.zeros((self.logical_height, self.logical_width), dtype=bool)
+        else:
+            self.visited = None
+
     # Verifica se dentro dos limites
     def _is_valid(self, x, y):
         return 0 <= x < self.logical_width and 0 <= y < self.logical_height
 
     def _carve_passages(self, cx, cy):
-        # (cx, cy) coordenadas celula atual.
-        self.visited[cy, cx] = True
-        
-        # Converte a coordenada celula para a coordenada da matriz
-        mx, my = (cx * 2) + 1, (cy * 2) + 1
-        self.maze[my, mx] = self.PATH  # abre o caminho na celula atual
-        
-        # Define os vizinhos
-        neighbors = [(0, -1), (0, 1), (1, 0), (-1, 0)] # dy, dx
-        random.shuffle(neighbors)
-        
-        for dx, dy in neighbors:
-            nx, ny = cx + dx, cy + dy # novas coordenadas
-            
-            # Verifica se vizinho e válido & nao visitado
-            if self._is_valid(nx, ny) and not self.visited[ny, nx]:
-                # Encontra a parede entre celula atual e vizinho
-                wall_x = mx + dx
-                wall_y = my + dy
-                
-                # derruba a parede
-                self.maze[wall_y, wall_x] = self.PATH
-                
-                # chama recursivamente vizinho
-                self._carve_passages(nx, ny)
+        """Backtracker iterativo: mesma ordem de sorteios da versao recursiva"""
+        w, h = self.logical_width, self.logical_height
+        mw = self.matrix_width
+        path = self.PATH
+
+        # buffers planos (acesso escalar mais rapido que indexar numpy)
+        visited = bytearray(self.visited.tobytes())
+        maze = bytearray(self.maze.tobytes())
+        shuffle = random.shuffle
+
+        def enter(cx, cy):
+            # (cx, cy) coordenadas celula atual.
+            visited[cy * w + cx] = 1
+
+            # Converte a coordenada celula para a coordenada da matriz
+            maze[((cy * 2) + 1) * mw + (cx * 2) + 1] = path  # abre o caminho na celula atual
+
+            # Define os vizinhos
+            neighbors = [(0, -1), (0, 1), (1, 0), (-1, 0)] # dx, dy
+            shuffle(neighbors)
+            return (cx, cy, iter(neighbors))
+
+        # pilha explicita no lugar da recursao
+        stack = [enter(cx, cy)]
+        while stack:
+            cx, cy, neighbors = stack[-1]
+
+            for dx, dy in neighbors:
+                nx, ny = cx + dx, cy + dy # novas coordenadas
+
+                # Verifica se vizinho e válido & nao visitado
+                if 0 <= nx < w and 0 <= ny < h and not visited[ny * w + nx]:
+                    # derruba a parede entre celula atual e vizinho
+                    maze[((cy * 2) + 1 + dy) * mw + (cx * 2) + 1 + dx] = path
+
+                    # empilha vizinho (retoma iterador do atual depois)
+                    stack.append(enter(nx, ny))
+                    break
+            else:
+                # sem vizinhos livres: volta
+                stack.pop()
+
+        self.visited = np.frombuffer(visited, dtype=bool).reshape(h, w)
+        self.maze = np.frombuffer(maze, dtype=np.uint8).reshape(self.matrix_height, self.matrix_width)
+
+    def _carve_sidewinder(self):
+        """Modo rapido: sidewinder vetorizado em blocos de linhas"""
+        w, h = self.logical_width, self.logical_height
+        rng = np.random.default_rng(self.seed)
+        maze = self.maze
+
+        # todas as celulas logicas sao caminho
+        maze[1::2, 1::2] = self.PATH
+
+        for y0 in range(0, h, self.BLOCK_ROWS):
+            y1 = min(y0 + self.BLOCK_ROWS, h)
+            rows = y1 - y0
+
+            # decide se cada celula abre para leste
+            east = rng.random((rows, w - 1)) < 0.5
+            if y0 == 0:
+                # primeira linha e um corredor unico
+                east[0, :] = True
+
+            # abre paredes leste
+            maze[2 * y0 + 1:2 * y1:2, 2:-1:2][east] = self.PATH
+
+            # inicio de cada trecho (run) da linha
+            starts = np.ones((rows, w), dtype=bool)
+            starts[:, 1:] = ~east
+            start_idx = np.flatnonzero(starts)
+            lengths = np.diff(np.append(start_idx, rows * w))
+
+            # sorteia uma celula por trecho para abrir ao norte
+            chosen = start_idx + (rng.random(len(start_idx)) * lengths).astype(np.int64)
+            cy, cx = np.divmod(chosen, w)
+            cy += y0
+
+            # primeira linha nao tem norte
+            keep = cy > 0
+            maze[2 * cy[keep], 2 * cx[keep] + 1] = self.PATH
+
+    def _carve_eller(self):
+        """Eller: uma linha por vez, so os conjuntos da linha atual em memoria"""
+        w, h = self.logical_width, self.logical_height
+        rng = np.random.default_rng(self.seed)
+        maze = self.maze
+        maze[1::2, 1::2] = self.PATH
+
+        sets = list(range(w))
+        next_set = w
+        for y in range(h):
+            last = y == h - 1
+            my = 2 * y + 1
+
+            # uniao-busca dos rotulos da linha (rotulo -> representante)
+            rep = {}
+
+            def find(a):
+                while a in rep:
+                    a = rep[a]
+                return a
+
+            # junta vizinhos de conjuntos diferentes (todos na ultima linha)
+            join = rng.random(w - 1) < 0.5
+            for x in range(w - 1):
+                a, b = find(sets[x]), find(sets[x + 1])
+                if a != b and (last or join[x]):
+                    rep[b] = a
+                    maze[my, 2 * x + 2] = self.PATH
+            sets = [find(s) for s in sets]
+            if last:
+                break
+
+            # cada conjunto desce por pelo menos uma celula
+            down = rng.random(w) < 0.5
+            members = {}
+            for x, s in enumerate(sets):
+                members.setdefault(s, []).append(x)
+            for cells in members.values():
+                if not any(down[x] for x in cells):
+                    down[cells[int(rng.integers(len(cells)))]] = True
+
+            row = []
+            for x, s in enumerate(sets):
+                if down[x]:
+                    maze[my + 1, 2 * x + 1] = self.PATH
+                    row.append(s)
+                else:
+                    row.append(next_set)
+                    next_set += 1
+            sets = row
+
+    def _carve_kruskal(self):
+        """Kruskal: paredes em ordem aleatoria, abre se liga conjuntos diferentes"""
+        w, h = self.logical_width, self.logical_height
+        rng = np.random.default_rng(self.seed)
+        maze = self.maze
+        maze[1::2, 1::2] = self.PATH
+
+        # paredes leste (y, x)-(y, x+1) primeiro, depois sul (y, x)-(y+1, x)
+        n_east = h * (w - 1)
+        total = n_east + (h - 1) * w
+        parent = list(range(w * h))
+        opened = bytearray(total)
+        missing = w * h - 1
+
+        for e in rng.permutation(total).tolist():
+            if e < n_east:
+                y, x = divmod(e, w - 1)
+                a = y * w + x
+                b = a + 1
+            else:
+                a = e - n_east
+                b = a + w
+
+            # busca com compressao pela metade
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b:
+                continue
+            parent[b] = a
+            opened[e] = 1
+            missing -= 1
+            if not missing:
+                break
+
+        opened = np.frombuffer(opened, dtype=bool)
+        maze[1::2, 2:-1:2][opened[:n_east].reshape(h, w - 1)] = self.PATH
+        maze[2:-1:2, 1::2][opened[n_east:].reshape(h - 1, w)] = self.PATH
+
+    def _carve_wilson(self):
+        """Wilson: passeios aleatorios com laco apagado (arvore uniforme)"""
+        w, h = self.logical_width, self.logical_height
+        n = w * h
+        rng = np.random.default_rng(self.seed)
+        maze = self.maze
+        mw = self.matrix_width
+        flat = maze.reshape(-1)
+        flat[(np.arange(n) // w * 2 + 1) * mw + np.arange(n) % w * 2 + 1] = self.PATH
+
+        in_tree = bytearray(n)
+        exit_to = [0] * n
+        order = rng.permutation(n).tolist()
+        in_tree[order[0]] = 1
+
+        # direcoes sorteadas em blocos: 0 leste, 1 oeste, 2 sul, 3 norte
+        dirs = []
+        for start in order[1:]:
+            if in_tree[start]:
+                continue
+
+            # passeio ate a arvore; exit_to guarda so a ultima saida de cada
+            # celula, o que apaga os lacos
+            cell = start
+            while not in_tree[cell]:
+                y, x = divmod(cell, w)
+                while True:
+                    if not dirs:
+                        dirs = rng.integers(4, size=4096).tolist()
+                    d = dirs.pop()
+                    if d == 0 and x + 1 < w:
+                        nxt = cell + 1
+                    elif d == 1 and x > 0:
+                        nxt = cell - 1
+                    elif d == 2 and y + 1 < h:
+                        nxt = cell + w
+                    elif d == 3 and y > 0:
+                        nxt = cell - w
+                    else:
+                        continue
+                    break
+                exit_to[cell] = nxt
+                cell = nxt
+
+            # refaz o caminho sem lacos abrindo as paredes
+            cell = start
+            while not in_tree[cell]:
+                in_tree[cell] = 1
+                nxt = exit_to[cell]
+                (y0, x0), (y1, x1) = divmod(cell, w), divmod(nxt, w)
+                flat[(y0 + y1 + 1) * mw + x0 + x1 + 1] = self.PATH
+                cell = nxt
+
+    def _braid(self):
+        """Remove a fracao 'braid' dos becos sem saida abrindo uma parede (cria ciclos)"""
+        w, h = self.logical_width, self.logical_height
+        rng = np.random.default_rng(None if self.seed is None else [self.seed, 1])
+        maze = self.maze
+
+        # passagens abertas por celula
+        east = maze[1::2, 2:-1:2] == self.PATH
+        south = maze[2:-1:2, 1::2] == self.PATH
+        degree = np.zeros((h, w), dtype=np.int8)
+        degree[:, :-1] += east
+        degree[:, 1:] += east
+        degree[:-1, :] += south
+        degree[1:, :] += south
+        degree = degree.ravel().tolist()
+
+        dead = np.flatnonzero(np.array(degree) == 1)
+        dead = dead[rng.permutation(len(dead))]
+        dead = dead[rng.random(len(dead)) < self.braid].tolist()
+        for cell in dead:
+            # pode ter deixado de ser beco ao abrir um vizinho
+            if degree[cell] != 1:
+                continue
+            y, x = divmod(cell, w)
+            my, mx = 2 * y + 1, 2 * x + 1
+            # (vizinho, parede entre os dois) ainda fechados
+            closed = [(nb, wall) for nb, wall, inside in ((cell + 1, (my, mx + 1), x + 1 < w),
+                                                          (cell - 1, (my, mx - 1), x > 0),
+                                                          (cell + w, (my + 1, mx), y + 1 < h),
+                                                          (cell - w, (my - 1, mx), y > 0))
+                      if inside and maze[wall] != self.PATH]
+            if not closed:
+                continue
+            # prefere outro beco: uma parede resolve os dois
+            both = [c for c in closed if degree[c[0]] == 1]
+            pick = both or closed
+            nb, wall = pick[int(rng.integers(len(pick)))]
+            maze[wall] = self.PATH
+            degree[cell] += 1
+            degree[nb] += 1
 
     def generate(self):
         # gera matriz do labirinto
-        start_x = random.randrange(self.logical_width)
-        start_y = random.randrange(self.logical_height)
-        
-        self._carve_passages(start_x, start_y)
-        
+        if self.algorithm == "backtracker":
+            start_x = random.randrange(self.logical_width)
+            start_y = random.randrange(self.logical_height)
+
+            self._carve_passages(start_x, start_y)
+        else:
+            getattr(self, f"_carve_{self.algorithm}")()
+
+        if self.braid:
+            self._braid()
         return self.maze
@@ -0,0 +1,178 @@
+"""Grafo da grade do labirinto construido em bloco com NumPy.
+
+Os nos sao indices planos idx = y * w + x das celulas livres.
+"""
+from collections import deque
+
+import numpy as np
+
+from mazeStore import as_matrix
+
+PATH = 0
+
+
+def _index_dtype(size):
+    return np.int32 if size < 2**31 else np.int64
+
+
+def grid_edges(maze, path=PATH):
+    """Arestas (u, v) entre celulas livres vizinhas.
+
+    Mesma ordem do laco original: para cada celula em ordem de linha,
+    primeiro a aresta para a direita e depois para baixo.
+    """
+    h, w = maze.shape
+    free = np.asarray(maze) == path
+    dtype = _index_dtype(h * w)
+
+    # pares horizontais e verticais abertos
+    right = np.zeros((h, w), dtype=bool)
+    right[:, :-1] = free[:, :-1] & free[:, 1:]
+    down = np.zeros((h, w), dtype=bool)
+    down[:-1, :] = free[:-1, :] & free[1:, :]
+
+    # intercala (direita, baixo) por celula
+    both = np.stack([right.ravel(), down.ravel()], axis=1)
+    cell, kind = np.nonzero(both)
+    u = cell.astype(dtype)
+    v = np.where(kind == 0, u + 1, u + w).astype(dtype)
+    return u, v
+
+
+def grid_csr(maze, path=PATH):
+    """Adjacencia CSR (indptr, indices) sobre todas as celulas da grade.
+
+    Vizinhos de cada celula em ordem: cima, esquerda, direita, baixo
+    (a mesma ordem de adjacencia do grafo NetworkX original).
+    """
+    h, w = maze.shape
+    free = np.asarray(maze) == path
+    size = h * w
+    dtype = _index_dtype(size)
+
+    # vizinho aberto em cada direcao
+    has = np.zeros((h, w, 4), dtype=bool)
+    has[1:, :, 0] = free[1:, :] & free[:-1, :]   # cima
+    has[:, 1:, 1] = free[:, 1:] & free[:, :-1]   # esquerda
+    has[:, :-1, 2] = free[:, :-1] & free[:, 1:]  # direita
+    has[:-1, :, 3] = free[:-1, :] & free[1:, :]  # baixo
+    has = has.reshape(size, 4)
+
+    offsets = np.array([-w, -1, 1, w], dtype=dtype)
+    cell, slot = np.nonzero(has)
+    indices = (cell + offsets[slot]).astype(dtype)
+
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(has.sum(axis=1), out=indptr[1:])
+    return indptr, indices
+
+
+def bfs_tree(indptr, indices, source):
+    """BFS sobre a CSR: retorna (ordem de visita, pai) com pai = -1 fora da arvore"""
+    size = len(indptr) - 1
+    parent = np.full(size, -1, dtype=indices.dtype)
+    seen = bytearray(size)
+    seen[source] = 1
+
+    ptr = memoryview(indptr)
+    nbrs = indices.tolist()
+    par = memoryview(parent)
+
+    order = [source]
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for v in nbrs[ptr[u]:ptr[u + 1]]:
+            if not seen[v]:
+                seen[v] = 1
+                par[v] = u
+                order.append(v)
+                queue.append(v)
+
+    return np.array(order, dtype=indices.dtype), parent
+
+
+class JunctionGraph:
+    """Grafo de juncoes do labirinto.
+
+    Celulas com grau != 2 (bifurcacoes e becos) viram nos; cada corredor de
+    grau 2 entre duas juncoes vira uma aresta com peso = comprimento. Para
+    cada aresta guarda a primeira celula do corredor, o que basta para
+    reconstruir o caminho celula a celula (corredores nao tem desvios).
+    """
+
+    def __init__(self, maze, keep=(), path=PATH):
+        maze = as_matrix(maze)
+        h, w = maze.shape
+        self.shape = (h, w)
+        self.width = w
+        size = h * w
+        dtype = _index_dtype(size)
+
+        indptr, indices = grid_csr(maze, path)
+        free = np.asarray(maze).ravel() == path
+        junction = free & (np.diff(indptr) != 2)
+        for (y, x) in keep:
+            idx = y * w + x
+            if free[idx]:
+                junction[idx] = True
+
+        self.nodes = np.flatnonzero(junction).astype(dtype)
+        self.node_id = np.full(size, -1, dtype=dtype)
+        self.node_id[self.nodes] = np.arange(len(self.nodes), dtype=dtype)
+
+        # listas Python: acesso escalar rapido nas caminhadas
+        self._ptr = indptr.tolist()
+        self._nbrs = indices.tolist()
+        self._junction = junction.tobytes()
+
+        targets, weights, firsts = [], [], []
+        counts = np.zeros(len(self.nodes), dtype=np.int64)
+        for i, u in enumerate(self.nodes.tolist()):
+            for v in self._nbrs[self._ptr[u]:self._ptr[u + 1]]:
+                end, length, _ = self.walk(u, v)
+                targets.append(end)
+                weights.append(length)
+                firsts.append(v)
+            counts[i] = self._ptr[u + 1] - self._ptr[u]
+
+        # arestas em CSR por id de juncao (destino em indice de celula)
+        self.edge_ptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.edge_ptr[1:])
+        self.edge_target = np.array(targets, dtype=dtype)
+        self.edge_weight = np.array(weights, dtype=np.int32)
+        self.edge_first = np.array(firsts, dtype=dtype)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def is_junction(self, cell):
+        return self._junction[cell] != 0
+
+    def neighbors(self, cell):
+        # vizinhos abertos de uma celula na grade
+        return self._nbrs[self._ptr[cell]:self._ptr[cell + 1]]
+
+    def walk(self, prev, cur, stop=()):
+        """Segue o corredor de prev -> cur ate uma juncao (ou celula em stop).
+
+        Retorna (celula final, comprimento, celula anterior a final).
+        """
+        ptr, nbrs, junction = self._ptr, self._nbrs, self._junction
+        length = 1
+        while not junction[cur] and cur not in stop:
+            a, b = nbrs[ptr[cur]:ptr[cur] + 2]
+            prev, cur = cur, (b if a == prev else a)
+            length += 1
+        return cur, length, prev
+
+    def corridor(self, start, first, end):
+        """Celulas de start (exclusiva) ate end (inclusiva) passando por first"""
+        ptr, nbrs = self._ptr, self._nbrs
+        cells = [first]
+        prev, cur = start, first
+        while cur != end:
+            a, b = nbrs[ptr[cur]:ptr[cur] + 2]
+            prev, cur = cur, (b if a == prev else a)
+            cells.append(cur)
+        return cells
@@ -0,0 +1,262 @@
+"""Indice pre-calculado de um labirinto para responder muitas consultas.
+
+Construido uma vez a partir da matriz: mascara de vizinhos por celula,
+rotulos de componentes conexas e uma floresta BFS (pai/profundidade). Como
+os labirintos do MazeGenerator sao arvores, o caminho entre duas celulas e
+unico e sai da floresta em O(tamanho do caminho); distancias em lote usam o
+ancestral comum mais baixo (binary lifting vetorizado).
+"""
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from mazeGen import MazeGenerator
+from mazeStore import passable_bytes
+
+# bits da mascara de vizinhos (mesma ordem da CSR em mazeGraph)
+UP, LEFT, RIGHT, DOWN = 1, 2, 4, 8
+
+
+class MazeIndex:
+    def __init__(self, maze, root=None, path=MazeGenerator.PATH):
+        self.maze = maze
+        h, w = maze.shape
+        self.shape = (h, w)
+        self.width = w
+        self.size = h * w
+        self.PATH = path
+
+        # PackedMaze vira bytes direto dos bits; free e so uma visao deles
+        self.passable = passable_bytes(maze, path)
+        free = np.frombuffer(self.passable, dtype=np.bool_).reshape(h, w)
+
+        # mascara de vizinhos abertos por celula
+        mask = np.zeros((h, w), dtype=np.uint8)
+        mask[1:, :] |= np.where(free[1:, :] & free[:-1, :], UP, 0).astype(np.uint8)
+        mask[:, 1:] |= np.where(free[:, 1:] & free[:, :-1], LEFT, 0).astype(np.uint8)
+        mask[:, :-1] |= np.where(free[:, :-1] & free[:, 1:], RIGHT, 0).astype(np.uint8)
+        mask[:-1, :] |= np.where(free[:-1, :] & free[1:, :], DOWN, 0).astype(np.uint8)
+        self.neighbor_mask = mask.ravel()
+
+        # floresta BFS: componentes, pai e profundidade
+        self.labels = np.full(self.size, -1, dtype=np.int32)
+        self.parent = np.full(self.size, -1, dtype=np.int32 if self.size < 2**31 else np.int64)
+        self.depth = np.full(self.size, -1, dtype=np.int32)
+
+        self.root = root
+        roots = np.flatnonzero(free.ravel()).tolist()
+        if root is not None:
+            roots.insert(0, root[0] * w + root[1])
+        self.components = self._label(roots)
+
+        # arvore (sem ciclos) se arestas == celulas - componentes
+        edges = (int(np.count_nonzero(mask & RIGHT)) + int(np.count_nonzero(mask & DOWN)))
+        self.is_tree = edges == int(free.sum()) - self.components
+
+    def _label(self, roots):
+        w = self.width
+        mask = self.neighbor_mask.tobytes()
+        labels = memoryview(self.labels)
+        parent = memoryview(self.parent)
+        depth = memoryview(self.depth)
+
+        count = 0
+        for r in roots:
+            if labels[r] >= 0 or not self.passable[r]:
+                continue
+            labels[r] = count
+            depth[r] = 0
+
+            queue = deque([r])
+            while queue:
+                u = queue.popleft()
+                m = mask[u]
+                d = depth[u] + 1
+                for bit, v in ((UP, u - w), (LEFT, u - 1), (RIGHT, u + 1), (DOWN, u + w)):
+                    if m & bit and labels[v] < 0:
+                        labels[v] = count
+                        parent[v] = u
+                        depth[v] = d
+                        queue.append(v)
+            count += 1
+        return count
+
+    def _index(self, node):
+        # fora da grade o indice plano daria a volta (celula errada)
+        y, x = int(node[0]), int(node[1])
+        if not (0 <= y < self.shape[0] and 0 <= x < self.width):
+            raise IndexError(f"Celula fora do labirinto: {node}")
+        return y * self.width + x
+
+    def connected(self, start, goal):
+        """True se existe caminho (mesma componente)"""
+        a, b = self._index(start), self._index(goal)
+        return self.labels[a] >= 0 and self.labels[a] == self.labels[b]
+
+    def _tree_path(self, a, b):
+        # sobe pelos pais a partir do mais profundo ate o ancestral comum
+        parent = memoryview(self.parent)
+        depth = memoryview(self.depth)
+        left, right = [a], [b]
+        da, db = depth[a], depth[b]
+        while da > db:
+            a = parent[a]
+            left.append(a)
+            da -= 1
+        while db > da:
+            b = parent[b]
+            right.append(b)
+            db -= 1
+        while a != b:
+            a, b = parent[a], parent[b]
+            left.append(a)
+            right.append(b)
+        right.pop()  # ancestral comum ja esta em left
+        return left + right[::-1]
+
+    def path(self, start, goal):
+        """Caminho (lista de (y, x)) ou None se nao houver"""
+        if not self.connected(start, goal):
+            return None
+
+        if not self.is_tree:
+            # com ciclos o caminho da floresta pode nao ser o menor: usa A*
+            from agente import Agente
+            return Agente(self.maze, start, goal, index=self).solve().path
+
+        w = self.width
+        return [divmod(c, w) for c in self._tree_path(self._index(start), self._index(goal))]
+
+    def distance(self, start, goal):
+        """Comprimento do menor caminho (em passos) ou None"""
+        path = self.path(start, goal)
+        return None if path is None else len(path) - 1
+
+    def _build_lifting(self):
+        # binary lifting sobre as celulas livres (ids compactos)
+        cells = np.flatnonzero(self.labels >= 0)
+        cid = np.full(self.size, -1, dtype=np.int32)
+        cid[cells] = np.arange(len(cells), dtype=np.int32)
+
+        # raizes apontam para si mesmas
+        up0 = cid[self.parent[cells]]
+        roots = up0 < 0
+        up0[roots] = np.flatnonzero(roots)
+
+        depth = self.depth[cells]
+        levels = max(1, int(depth.max()).bit_length()) if len(cells) else 1
+        up = np.empty((levels, len(cells)), dtype=np.int32)
+        up[0] = up0
+        for k in range(1, levels):
+            up[k] = up[k - 1][up[k - 1]]
+
+        self._cid = cid
+        self._up = up
+        self._cdepth = depth
+
+    def _pair_indices(self, pairs):
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 4)
+        h, w = self.shape
+        ys, xs = pairs[:, 0::2], pairs[:, 1::2]
+        if ((ys < 0) | (ys >= h) | (xs < 0) | (xs >= w)).any():
+            raise IndexError("Par com celula fora do labirinto")
+        return pairs[:, 0] * w + pairs[:, 1], pairs[:, 2] * w + pairs[:, 3]
+
+    def lca(self, a, b):
+        """Ancestral comum (ids compactos) de arrays de celulas da mesma componente"""
+        if not hasattr(self, "_up"):
+            self._build_lifting()
+        up, depth = self._up, self._cdepth
+
+        a = self._cid[a]
+        b = self._cid[b]
+
+        # a fica sempre com o mais profundo
+        swap = depth[a] < depth[b]
+        a, b = np.where(swap, b, a), np.where(swap, a, b)
+
+        # sobe a ate a profundidade de b
+        diff = depth[a] - depth[b]
+        for k in range(len(up)):
+            a = np.where((diff >> k) & 1, up[k][a], a)
+
+        # sobe os dois enquanto os ancestrais forem diferentes
+        for k in range(len(up) - 1, -1, -1):
+            ua, ub = up[k][a], up[k][b]
+            differ = ua != ub
+            a = np.where(differ, ua, a)
+            b = np.where(differ, ub, b)
+
+        return np.where(a == b, a, up[0][a])
+
+    def distances(self, pairs):
+        """Distancias para um array de pares ((sy, sx), (gy, gx)); -1 = sem caminho"""
+        a, b = self._pair_indices(pairs)
+        la, lb = self.labels[a], self.labels[b]
+        ok = (la >= 0) & (la == lb)
+        out = np.full(len(a), -1, dtype=np.int64)
+
+        if not self.is_tree:
+            # com ciclos: A* par a par
+            w = self.width
+            for i in np.flatnonzero(ok).tolist():
+                out[i] = self.distance(divmod(int(a[i]), w), divmod(int(b[i]), w))
+            return out
+
+        if ok.any():
+            a, b = a[ok], b[ok]
+            anc = self.lca(a, b)
+            out[ok] = self.depth[a].astype(np.int64) + self.depth[b] - 2 * self._cdepth[anc]
+        return out
+
+    def paths(self, pairs):
+        """Caminhos (lista de (y, x) ou None) para um array de pares"""
+        a, b = self._pair_indices(pairs)
+        w = self.width
+        return [self.path(divmod(int(u), w), divmod(int(v), w)) for u, v in zip(a, b)]
+
+
+def batch_distances(maze, pairs, index=None):
+    """Distancias em lote; constroi o indice se nao for fornecido"""
+    index = index if index is not None else MazeIndex(maze)
+    return index.distances(pairs)
+
+
+def batch_paths(maze, pairs, index=None):
+    """Caminhos em lote; constroi o indice se nao for fornecido"""
+    index = index if index is not None else MazeIndex(maze)
+    return index.paths(pairs)
+
+
+class MazeCache:
+    """Cache LRU de (labirinto, indice) por (seed, largura, altura)"""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, seed, width, height, algorithm="backtracker"):
+        key = (seed, width, height, algorithm)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        maze = MazeGenerator(width, height, seed=seed, algorithm=algorithm).generate()
+        entry = (maze, MazeIndex(maze))
+        self._entries[key] = entry
+
+        # remove o menos usado
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,175 @@
+"""Armazenamento compacto do labirinto: 2 bits por celula logica.
+
+Na matriz do MazeGenerator ((2h+1) x (2w+1)) as celulas logicas sao sempre
+caminho e os cantos/bordas sempre parede; a informacao real sao as paredes
+entre celulas. Aqui cada celula guarda so dois bits:
+
+    bit 0 -> passagem para leste aberta
+    bit 1 -> passagem para sul aberta
+
+Quatro celulas por byte, linhas alinhadas em bytes. O arquivo em disco e um
+cabecalho fixo de 32 bytes seguido dos bits, e pode ser aberto com np.memmap
+sem carregar tudo na memoria.
+"""
+import struct
+
+import numpy as np
+
+from mazeGen import MazeGenerator
+
+EAST = 1
+SOUTH = 2
+
+MAGIC = b"MAZEPK\x00\x01"
+HEADER = struct.Struct("<8sIIII8x")  # magic, versao, largura, altura, bytes por linha
+VERSION = 1
+
+# linhas logicas convertidas por bloco (limita memoria temporaria)
+BLOCK_ROWS = 1024
+
+
+class PackedMaze:
+    PATH = MazeGenerator.PATH
+    WALL = MazeGenerator.WALL
+
+    def __init__(self, width, height, data=None):
+        self.logical_width = width
+        self.logical_height = height
+        self.row_bytes = (width + 3) // 4
+        if data is None:
+            data = np.zeros((height, self.row_bytes), dtype=np.uint8)
+        self.data = data
+
+    @property
+    def shape(self):
+        # formato da matriz equivalente
+        return (2 * self.logical_height + 1, 2 * self.logical_width + 1)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def _unpack_rows(self, y0, y1):
+        # bits (0..3) de cada celula das linhas y0:y1
+        packed = np.asarray(self.data[y0:y1])
+        shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+        bits = (packed[:, :, None] >> shifts) & 3
+        return bits.reshape(y1 - y0, -1)[:, :self.logical_width]
+
+    @classmethod
+    def from_matrix(cls, matrix, path=MazeGenerator.PATH):
+        """Compacta uma matriz no formato do MazeGenerator"""
+        mh, mw = matrix.shape
+        if mh % 2 == 0 or mw % 2 == 0:
+            raise ValueError("Matriz precisa ter dimensoes impares (2h+1, 2w+1)")
+
+        height, width = mh // 2, mw // 2
+        packed = cls(width, height)
+        pad = packed.row_bytes * 4 - width
+
+        for y0 in range(0, height, BLOCK_ROWS):
+            y1 = min(y0 + BLOCK_ROWS, height)
+            block = np.asarray(matrix[2 * y0:2 * y1 + 1]) == path
+
+            if not block[1::2, 1::2].all():
+                raise ValueError("Celulas logicas fechadas: matriz fora do formato do MazeGenerator")
+
+            east = block[1::2, 2::2]
+            south = block[2::2, 1::2]
+            bits = east.astype(np.uint8) * EAST | south.astype(np.uint8) * SOUTH
+            bits = np.pad(bits, ((0, 0), (0, pad))).reshape(y1 - y0, -1, 4)
+            packed.data[y0:y1] = bits[..., 0] | bits[..., 1] << 2 | bits[..., 2] << 4 | bits[..., 3] << 6
+
+        return packed
+
+    def to_matrix(self, y0=0, y1=None):
+        """Matriz uint8 das linhas logicas y0:y1 (linhas 2*y0 .. 2*y1 da matriz)"""
+        y1 = self.logical_height if y1 is None else y1
+        rows = y1 - y0
+        matrix = np.full((2 * rows + 1, 2 * self.logical_width + 1), self.WALL, dtype=np.uint8)
+        matrix[1::2, 1::2] = self.PATH
+
+        for b0 in range(y0, y1, BLOCK_ROWS):
+            b1 = min(b0 + BLOCK_ROWS, y1)
+            bits = self._unpack_rows(b0, b1)
+            r0 = 2 * (b0 - y0)
+            matrix[r0 + 1:r0 + 2 * (b1 - b0):2, 2::2][(bits & EAST) != 0] = self.PATH
+            matrix[r0 + 2:r0 + 2 * (b1 - b0) + 1:2, 1::2][(bits & SOUTH) != 0] = self.PATH
+
+        # linha de cima: passagens sul da linha logica anterior
+        if y0 > 0:
+            bits = self._unpack_rows(y0 - 1, y0)[0]
+            matrix[0, 1::2][(bits & SOUTH) != 0] = self.PATH
+
+        # bordas sempre fechadas
+        matrix[:, -1] = self.WALL
+        if y1 == self.logical_height:
+            matrix[-1, :] = self.WALL
+        return matrix
+
+    def passable(self, path=MazeGenerator.PATH):
+        """Celulas livres da matriz equivalente (1 byte cada, em ordem de linha).
+
+        Montado direto dos bits, bloco a bloco: o pico e o resultado mais um
+        bloco de linhas, sem a matriz uint8 inteira.
+        """
+        mh, mw = self.shape
+        out = bytearray(mh * mw)
+        free = np.frombuffer(out, dtype=np.uint8).reshape(mh, mw)
+        for y0 in range(0, self.logical_height, BLOCK_ROWS):
+            y1 = min(y0 + BLOCK_ROWS, self.logical_height)
+            # a ultima linha do bloco e a primeira do proximo
+            free[2 * y0:2 * y1 + 1] = self.to_matrix(y0, y1) == path
+        return out
+
+    def cell_bits(self, y, x):
+        return (int(self.data[y, x >> 2]) >> ((x & 3) * 2)) & 3
+
+    def __getitem__(self, pos):
+        # acesso escalar como na matriz: maze[my, mx]
+        my, mx = pos
+        mh, mw = self.shape
+        if not (0 < my < mh - 1 and 0 < mx < mw - 1):
+            return self.WALL
+        if my & 1 and mx & 1:
+            return self.PATH
+        if my & 1:
+            return self.PATH if self.cell_bits(my >> 1, (mx >> 1) - 1) & EAST else self.WALL
+        if mx & 1:
+            return self.PATH if self.cell_bits((my >> 1) - 1, mx >> 1) & SOUTH else self.WALL
+        return self.WALL
+
+    def save(self, path):
+        with open(path, "wb") as fp:
+            fp.write(HEADER.pack(MAGIC, VERSION, self.logical_width, self.logical_height, self.row_bytes))
+            for y0 in range(0, self.logical_height, BLOCK_ROWS):
+                fp.write(np.ascontiguousarray(self.data[y0:y0 + BLOCK_ROWS]).tobytes())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Abre um arquivo salvo; com mmap=True os bits ficam no disco (np.memmap)"""
+        with open(path, "rb") as fp:
+            magic, version, width, height, row_bytes = HEADER.unpack(fp.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Arquivo de labirinto invalido: {path}")
+            if not mmap:
+                data = np.frombuffer(fp.read(), dtype=np.uint8).reshape(height, row_bytes).copy()
+
+        if mmap:
+            data = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.size,
+                             shape=(height, row_bytes))
+        return cls(width, height, data)
+
+
+def as_matrix(maze):
+    """Adaptador: matriz uint8 a partir de matriz ou PackedMaze"""
+    if isinstance(maze, PackedMaze):
+        return maze.to_matrix()
+    return np.asarray(maze)
+
+
+def passable_bytes(maze, path=MazeGenerator.PATH):
+    """Adaptador: 1 byte por celula (1 = livre), de matriz ou PackedMaze (sem descompactar)"""
+    if isinstance(maze, PackedMaze):
+        return maze.passable(path)
+    return (np.asarray(maze).ravel() == path).tobytes()
@@ -0,0 +1,288 @@
+"""Labirintos enormes em tiles gerados sob demanda + planejador hierarquico (HPA*).
+
+MazeWorld divide o mundo em tiles de tile x tile celulas logicas. Cada
+tile e um MazeGenerator com seed derivada de (seed, tx, ty); tiles
+vizinhos dividem a linha de parede da borda, onde portas (derivadas so da
+seed e da borda) ligam um ao outro. Todo tile e conexo e toda borda
+interna tem porta, entao o mundo inteiro e conexo e qualquer tile pode ser
+gerado sozinho, em qualquer ordem. So os tiles usados por ultimo ficam na
+memoria (LRU); o resto e gerado de novo quando preciso.
+
+HPAStar planeja em dois niveis. O grafo abstrato tem as portas como nos e,
+por tile, arestas porta-porta com a distancia dentro do tile (BFS de
+mazeField), calculadas na primeira vez que a busca passa pelo tile e
+guardadas num LRU proprio. O A* no grafo abstrato da a sequencia de
+portas e so os tiles dessa rota sao refinados em celulas. Toda travessia
+entre tiles passa por uma porta e as arestas sao distancias exatas dentro
+do tile, entao o custo e o mesmo do A* na grade inteira.
+
+    world = MazeWorld(seed=7, tiles_x=1000, tiles_y=1000, tile=32)
+    result = HPAStar(world).solve((1, 1), (63999, 63999))
+"""
+import heapq
+from collections import OrderedDict
+
+import numpy as np
+
+from agente import INF, Agente, SolveResult
+from mazeField import distance_field
+from mazeGen import MazeGenerator
+
+# bordas verticais (entre tx - 1 e tx) e horizontais (entre ty - 1 e ty)
+_VERTICAL, _HORIZONTAL = 0, 1
+
+
+class MazeWorld:
+    """Mundo de tiles_y x tiles_x tiles gerados por (seed, tx, ty), com cache LRU"""
+
+    PATH = MazeGenerator.PATH
+    WALL = MazeGenerator.WALL
+
+    def __init__(self, seed, tiles_x, tiles_y, tile=32, doors=1, cache=64,
+                 algorithm="backtracker", braid=0.0):
+        if not 1 <= doors <= tile:
+            raise ValueError(f"doors deve estar entre 1 e {tile}: {doors}")
+        self.seed = seed
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_y
+        self.tile_size = tile
+        self.doors = doors
+        self.algorithm = algorithm
+        self.braid = braid
+
+        # celulas de matriz por tile (a linha de borda e dividida com o vizinho)
+        self.span = 2 * tile
+        self.shape = (tiles_y * self.span + 1, tiles_x * self.span + 1)
+
+        self.maxsize = cache
+        self._tiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # --- portas ---
+
+    def _border_doors(self, kind, tx, ty):
+        # deslocamentos (impares) das portas numa borda, so pela seed e pela borda
+        rng = np.random.default_rng([self.seed, kind, ty, tx])
+        picks = np.sort(rng.choice(self.tile_size, size=self.doors, replace=False))
+        if kind == _VERTICAL:
+            y0, x = ty * self.span, tx * self.span
+            return [(y0 + 2 * k + 1, x) for k in picks.tolist()]
+        y, x0 = ty * self.span, tx * self.span
+        return [(y, x0 + 2 * k + 1) for k in picks.tolist()]
+
+    def tile_doors(self, tx, ty):
+        """Portas (y, x) nas bordas internas do tile"""
+        doors = []
+        if tx > 0:
+            doors += self._border_doors(_VERTICAL, tx, ty)
+        if tx + 1 < self.tiles_x:
+            doors += self._border_doors(_VERTICAL, tx + 1, ty)
+        if ty > 0:
+            doors += self._border_doors(_HORIZONTAL, tx, ty)
+        if ty + 1 < self.tiles_y:
+            doors += self._border_doors(_HORIZONTAL, tx, ty + 1)
+        return doors
+
+    def door_tiles(self, cell):
+        """Os dois tiles que uma porta liga ([] se a celula nao e porta)"""
+        y, x = cell
+        span = self.span
+        if x % span == 0 and y % span and 0 < x < self.shape[1] - 1:
+            tx, ty = x // span, y // span
+            if cell in self._border_doors(_VERTICAL, tx, ty):
+                return [(tx - 1, ty), (tx, ty)]
+        elif y % span == 0 and x % span and 0 < y < self.shape[0] - 1:
+            tx, ty = x // span, y // span
+            if cell in self._border_doors(_HORIZONTAL, tx, ty):
+                return [(tx, ty - 1), (tx, ty)]
+        return []
+
+    # --- tiles ---
+
+    def tile_of(self, cell):
+        """Tile (tx, ty) da celula; na linha de borda, o de baixo/da direita"""
+        y, x = cell
+        return min(x // self.span, self.tiles_x - 1), min(y // self.span, self.tiles_y - 1)
+
+    def origin(self, tx, ty):
+        return ty * self.span, tx * self.span
+
+    def _tile_seed(self, tx, ty):
+        return int(np.random.SeedSequence([self.seed, ty, tx]).generate_state(1)[0])
+
+    def tile(self, tx, ty):
+        """Matriz (2*tile+1, 2*tile+1) do tile, com as portas abertas (somente leitura)"""
+        if not (0 <= tx < self.tiles_x and 0 <= ty < self.tiles_y):
+            raise IndexError(f"Tile fora do mundo: {(tx, ty)}")
+        key = (tx, ty)
+        maze = self._tiles.get(key)
+        if maze is not None:
+            self.hits += 1
+            self._tiles.move_to_end(key)
+            return maze
+
+        self.misses += 1
+        maze = MazeGenerator(self.tile_size, self.tile_size, seed=self._tile_seed(tx, ty),
+                             algorithm=self.algorithm, braid=self.braid).generate()
+        oy, ox = self.origin(tx, ty)
+        for y, x in self.tile_doors(tx, ty):
+            maze[y - oy, x - ox] = self.PATH
+        maze.flags.writeable = False
+        self._tiles[key] = maze
+
+        # remove o menos usado
+        while len(self._tiles) > self.maxsize:
+            self._tiles.popitem(last=False)
+        return maze
+
+    def __getitem__(self, cell):
+        y, x = cell
+        if not (0 <= y < self.shape[0] and 0 <= x < self.shape[1]):
+            raise IndexError(f"Celula fora do mundo: {cell}")
+        tx, ty = self.tile_of(cell)
+        oy, ox = self.origin(tx, ty)
+        return self.tile(tx, ty)[y - oy, x - ox]
+
+    def window(self, y0, y1, x0, x1):
+        """Recorte [y0:y1, x0:x1] montado a partir dos tiles (copia)"""
+        out = np.empty((y1 - y0, x1 - x0), dtype=np.uint8)
+        span = self.span
+        for ty in range(y0 // span, min((y1 - 1) // span, self.tiles_y - 1) + 1):
+            for tx in range(x0 // span, min((x1 - 1) // span, self.tiles_x - 1) + 1):
+                oy, ox = self.origin(tx, ty)
+                ya, yb = max(y0, oy), min(y1, oy + span + 1)
+                xa, xb = max(x0, ox), min(x1, ox + span + 1)
+                out[ya - y0:yb - y0, xa - x0:xb - x0] = self.tile(tx, ty)[ya - oy:yb - oy, xa - ox:xb - ox]
+        return out
+
+    @property
+    def nbytes(self):
+        """Bytes dos tiles residentes"""
+        return sum(maze.nbytes for maze in self._tiles.values())
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def clear(self):
+        self._tiles.clear()
+
+
+class HPAStar:
+    """A* hierarquico: portas como nos abstratos, refinamento so nos tiles da rota"""
+
+    def __init__(self, world, edge_cache=4096):
+        self.world = world
+        self.maxsize = edge_cache
+        self._edges = OrderedDict()
+        self.expanded = 0
+        self.refined = 0
+
+    def tile_edges(self, tx, ty):
+        """{porta: [(outra porta, distancia), ...]} dentro do tile (LRU)"""
+        key = (tx, ty)
+        edges = self._edges.get(key)
+        if edges is not None:
+            self._edges.move_to_end(key)
+            return edges
+
+        maze = self.world.tile(tx, ty)
+        oy, ox = self.world.origin(tx, ty)
+        doors = self.world.tile_doors(tx, ty)
+        local = [(y - oy, x - ox) for y, x in doors]
+        # distancia e simetrica: a porta i so busca as portas depois dela
+        edges = {door: [] for door in doors}
+        for i, door in enumerate(doors[:-1]):
+            dist = distance_field(maze, local[i:i + 1], targets=local[i + 1:])
+            for other, (ly, lx) in zip(doors[i + 1:], local[i + 1:]):
+                d = int(dist[ly, lx])
+                if d >= 0:
+                    edges[door].append((other, d))
+                    edges[other].append((door, d))
+        self._edges[key] = edges
+
+        while len(self._edges) > self.maxsize:
+            self._edges.popitem(last=False)
+        return edges
+
+    def _local_links(self, cell, tile):
+        # distancias dentro do tile da celula ate as portas dele (+ o campo inteiro)
+        maze = self.world.tile(*tile)
+        oy, ox = self.world.origin(*tile)
+        dist = distance_field(maze, [(cell[0] - oy, cell[1] - ox)])
+        links = []
+        for y, x in self.world.tile_doors(*tile):
+            d = int(dist[y - oy, x - ox])
+            if d >= 0 and (y, x) != cell:
+                links.append(((y, x), d))
+        return links, dist
+
+    def solve(self, start, goal):
+        """SolveResult(status, caminho em celulas do mundo, custo, nos abstratos expandidos)"""
+        world = self.world
+        start, goal = tuple(start), tuple(goal)
+        self.expanded = self.refined = 0
+        if world[start] != world.PATH or world[goal] != world.PATH:
+            return SolveResult("no_path", [], None, 0)
+        if start == goal:
+            return SolveResult("goal_found", [start], 0, 0)
+
+        # partida e objetivo entram no grafo abstrato ligados as portas do seu tile
+        start_tile, goal_tile = world.tile_of(start), world.tile_of(goal)
+        start_links, start_dist = self._local_links(start, start_tile)
+        goal_links, _ = self._local_links(goal, goal_tile)
+        to_goal = dict(goal_links)
+        if start_tile == goal_tile:
+            gy, gx = world.origin(*goal_tile)
+            d = int(start_dist[goal[0] - gy, goal[1] - gx])
+            if d >= 0:
+                start_links.append((goal, d))
+
+        def neighbors(u):
+            if u == start:
+                yield from ((v, d, start_tile) for v, d in start_links)
+            for tile in world.door_tiles(u):
+                yield from ((v, d, tile) for v, d in self.tile_edges(*tile).get(u, ()))
+            if u in to_goal:
+                yield goal, to_goal[u], goal_tile
+
+        gy, gx = goal
+        g = {start: 0}
+        parent = {start: None}
+        closed = set()
+        heap = [(abs(start[0] - gy) + abs(start[1] - gx), 0, start)]
+        while heap:
+            _, gu, u = heapq.heappop(heap)
+            if u in closed:
+                continue
+            if u == goal:
+                break
+            closed.add(u)
+            self.expanded += 1
+            for v, d, tile in neighbors(u):
+                gv = gu + d
+                if v not in closed and gv < g.get(v, INF):
+                    g[v] = gv
+                    parent[v] = (u, tile)
+                    heapq.heappush(heap, (gv + abs(v[0] - gy) + abs(v[1] - gx), gv, v))
+        else:
+            return SolveResult("no_path", [], None, self.expanded)
+
+        # rota abstrata (objetivo -> partida) e refinamento tile a tile
+        route = []
+        node = goal
+        while parent[node] is not None:
+            u, tile = parent[node]
+            route.append((u, node, tile))
+            node = u
+        path = [start]
+        for u, v, tile in reversed(route):
+            path.extend(self._refine(u, v, tile)[1:])
+        return SolveResult("goal_found", path, g[goal], self.expanded)
+
+    def _refine(self, u, v, tile):
+        # caminho em celulas de u ate v dentro do tile
+        oy, ox = self.world.origin(*tile)
+        agente = Agente(self.world.tile(*tile), (u[0] - oy, u[1] - ox), (v[0] - oy, v[1] - ox))
+        self.refined += 1
+        return [(y + oy, x + ox) for y, x in agente.solve().path]
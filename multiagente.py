@@ -0,0 +1,250 @@
+"""Varios agentes no mesmo labirinto: um labirinto compartilhado, N consultas.
+
+SharedMaze poe a matriz, as celulas livres e os rotulos de componentes num
+unico bloco de multiprocessing.shared_memory; cada processo do pool so se
+anexa ao bloco (nada e copiado) e o usa como 'index' do Agente, entao o
+labirinto existe uma vez so, qualquer que seja o numero de agentes. Cada
+consulta ainda tem seus arrays de busca, mas so enquanto roda.
+
+solve_batch resolve uma lista de pares (partida, objetivo) em serie, em
+threads ou em processos. Com group_goals=True, pares com o mesmo objetivo
+viram uma unica busca de varias fontes: uma BFS a partir do objetivo que
+para quando todas as partidas do grupo foram alcancadas.
+
+    with SharedMaze.create(labirinto) as shared:
+        results = solve_batch(shared, pares, workers=4)
+"""
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from agente import SolveResult
+from buscas import make_engine
+from mazeIndex import MazeIndex
+from mazeStore import as_matrix
+
+MODES = ("serial", "thread", "process")
+
+
+class SharedMaze:
+    """Matriz (uint8), celulas livres (uint8) e componentes (int32) em memoria compartilhada"""
+
+    def __init__(self, shm, shape, owner=False):
+        self._shm = shm
+        self.owner = owner
+        self.shape = shape
+        self.height, self.width = shape
+        size = self.height * self.width
+
+        buf = shm.buf
+        self.maze = np.ndarray(shape, dtype=np.uint8, buffer=buf)
+        # bytes por celula livre: mesmo papel de MazeIndex.passable no Agente
+        self.passable = buf[size:2 * size]
+        self.labels = np.ndarray(size, dtype=np.int32, buffer=buf, offset=_labels_offset(size))
+        if not owner:
+            self.maze.flags.writeable = False
+            self.labels.flags.writeable = False
+
+    @classmethod
+    def create(cls, maze, index=None):
+        """Copia o labirinto (e os componentes do indice) para um bloco novo"""
+        matrix = as_matrix(maze)
+        if index is None:
+            index = MazeIndex(matrix)
+        size = matrix.size
+        shm = shared_memory.SharedMemory(create=True, size=_labels_offset(size) + 4 * size)
+        shared = cls(shm, matrix.shape, owner=True)
+        shared.maze[...] = matrix
+        shared.passable[:] = index.passable
+        shared.labels[:] = index.labels
+        shared.maze.flags.writeable = False
+        shared.labels.flags.writeable = False
+        return shared
+
+    @classmethod
+    def attach(cls, name, shape):
+        """Abre um bloco criado em outro processo (somente leitura)"""
+        # processos do pool dividem o resource_tracker de quem criou o bloco,
+        # entao so o dono o remove (em close)
+        return cls(shared_memory.SharedMemory(name=name), shape)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def nbytes(self):
+        return self._shm.size
+
+    def connected(self, start, goal):
+        """True se existe caminho (mesma componente)"""
+        a = start[0] * self.width + start[1]
+        b = goal[0] * self.width + goal[1]
+        return self.labels[a] >= 0 and self.labels[a] == self.labels[b]
+
+    def close(self):
+        # as visoes numpy precisam sair antes de fechar o mmap
+        self.maze = self.labels = None
+        self.passable.release()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+            self.owner = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _labels_offset(size):
+    # matriz + livres, alinhado em 8 bytes para o int32
+    return (2 * size + 7) // 8 * 8
+
+
+def solve_pairs(shared, pairs, busca="astar", paths=False):
+    """Resolve [(i, partida, objetivo)] com um agente por par; retorna [(i, resultado)]"""
+    out = []
+    for i, start, goal in pairs:
+        result = make_engine(busca, shared.maze, start, goal, index=shared).solve()
+        out.append((i, result if paths else result._replace(path=None)))
+    return out
+
+
+def solve_shared_goal(shared, goal, starts, paths=False):
+    """Uma BFS a partir do objetivo para varias partidas [(i, partida)].
+
+    Para quando a ultima partida alcancavel e tirada da fila; 'expanded' de
+    cada resultado e quantos nos a busca tinha tirado da fila ao chegar nela.
+    """
+    w = shared.width
+    passable = shared.passable
+    size = shared.height * w
+    g = goal[0] * w + goal[1]
+
+    # partidas em outra componente respondem na hora
+    out = []
+    wanted = defaultdict(list)
+    for i, start in starts:
+        if shared.connected(start, goal):
+            wanted[start[0] * w + start[1]].append(i)
+        else:
+            out.append((i, SolveResult("no_path", [] if paths else None, None, 0)))
+
+    # pai aponta para o objetivo: o caminho sai direto na ordem partida -> objetivo
+    parent = np.full(size, -1, dtype=np.int64 if size >= 2**31 else np.int32)
+    par = memoryview(parent)
+    dist = {g: 0}
+    queue = deque([g])
+    popped = 0
+    found = {}
+    remaining = len(wanted)
+    while queue and remaining:
+        u = queue.popleft()
+        popped += 1
+        if u in wanted:
+            found[u] = popped
+            remaining -= 1
+        x = u % w
+        d = dist[u] + 1
+        for v, inside in ((u + 1, x + 1 < w), (u - 1, x > 0), (u + w, u + w < size), (u - w, u >= w)):
+            if inside and passable[v] and v not in dist:
+                dist[v] = d
+                par[v] = u
+                queue.append(v)
+
+    for s, ids in wanted.items():
+        path = None
+        if paths:
+            path = [divmod(s, w)]
+            node = s
+            while node != g:
+                node = par[node]
+                path.append(divmod(node, w))
+        result = SolveResult("goal_found", path, dist[s], found[s])
+        out.extend((i, result) for i in ids)
+    return out
+
+
+def _tasks(pairs, chunksize, group_goals):
+    # pares soltos em blocos de 'chunksize'; grupos com o mesmo objetivo inteiros
+    loose = list(enumerate(pairs))
+    if group_goals:
+        by_goal = defaultdict(list)
+        for i, (start, goal) in loose:
+            by_goal[tuple(goal)].append((i, tuple(start)))
+        loose = []
+        for goal, starts in by_goal.items():
+            if len(starts) > 1:
+                yield "goal", goal, starts
+            else:
+                loose.append((starts[0][0], (starts[0][1], goal)))
+    for k in range(0, len(loose), chunksize):
+        yield "pairs", [(i, tuple(s), tuple(g)) for i, (s, g) in loose[k:k + chunksize]]
+
+
+def _run_task(shared, task, busca, paths):
+    if task[0] == "goal":
+        return solve_shared_goal(shared, task[1], task[2], paths)
+    return solve_pairs(shared, task[1], busca, paths)
+
+
+# labirinto anexado em cada processo do pool (montado em _init_worker)
+_ctx = {}
+
+
+def _init_worker(name, shape, busca, paths):
+    _ctx["shared"] = SharedMaze.attach(name, shape)
+    _ctx["busca"] = busca
+    _ctx["paths"] = paths
+
+
+def _worker_task(task):
+    return _run_task(_ctx["shared"], task, _ctx["busca"], _ctx["paths"])
+
+
+def solve_batch(maze, pairs, workers=None, mode="process", busca="astar",
+                group_goals=False, paths=False, chunksize=64):
+    """Resolve varios pares (partida, objetivo) no mesmo labirinto.
+
+    maze pode ser um SharedMaze (reaproveitado entre chamadas) ou uma
+    matriz, copiada para um bloco temporario. Retorna um SolveResult por
+    par, na ordem de entrada; 'path' fica None a menos que paths=True (nao
+    ha caminhos para serializar entre processos).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Modo desconhecido: {mode} (opcoes: {', '.join(MODES)})")
+    if isinstance(maze, SharedMaze):
+        shared, temporary = maze, False
+    else:
+        shared, temporary = SharedMaze.create(maze), True
+
+    tasks = list(_tasks(pairs, chunksize, group_goals))
+    workers = workers or os.cpu_count() or 1
+    try:
+        if mode == "serial":
+            done = (_run_task(shared, task, busca, paths) for task in tasks)
+        elif mode == "thread":
+            pool = ThreadPoolExecutor(max_workers=workers)
+            done = pool.map(lambda task: _run_task(shared, task, busca, paths), tasks)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(shared.name, shared.shape, busca, paths))
+            done = pool.map(_worker_task, tasks)
+
+        results = [None] * len(pairs)
+        try:
+            for chunk in done:
+                for i, result in chunk:
+                    results[i] = result
+        finally:
+            if mode != "serial":
+                pool.shutdown()
+        return results
+    finally:
+        if temporary:
+            shared.close()
@@ -0,0 +1,47 @@
+"""Nucleo sem interface: gerador, motores de busca e cenario por seed.
+
+So importa numpy (e a biblioteca padrao); matplotlib e networkx ficam nos
+modulos de visualizacao (grafos, acoes, lod), carregados so quando ha
+desenho. Processos de vida curta (lote, multiagente, --headless) devem
+importar daqui.
+
+    from nucleo import build_scenario, make_engine
+    labirinto, partida, objetivo = build_scenario(42, 64, 64)
+    resultado = make_engine("astar", labirinto, partida, objetivo).solve()
+"""
+import random
+
+import numpy as np
+
+from agente import Agente, SolveResult
+from buscas import ENGINES, make_engine
+from mazeGen import MazeGenerator
+
+# defs labirinto
+LARGURA = 16
+ALTURA = 16
+START_POS = (1, 1)
+
+
+def build_scenario(seed, width=LARGURA, height=ALTURA):
+    """Gera o labirinto e escolhe partida/objetivo para a seed"""
+    gen1 = MazeGenerator(width=width, height=height, seed=seed)
+    labirinto = gen1.generate()
+
+    # celulas livres (indices planos, em ordem de linha)
+    valid_path_coords = np.flatnonzero(labirinto.ravel() == gen1.PATH)
+
+    # partida valida se != objetivo
+    start_idx = START_POS[0] * labirinto.shape[1] + START_POS[1]
+    valid_path_coords = valid_path_coords[valid_path_coords != start_idx]
+    random.seed(seed)
+
+    # escolhe objetivo aleatorio (mesmo sorteio de random.choice)
+    goal_idx = int(valid_path_coords[random.randrange(len(valid_path_coords))])
+    goal_pos = divmod(goal_idx, labirinto.shape[1])
+
+    return labirinto, START_POS, goal_pos
+
+
+__all__ = ["ALTURA", "Agente", "ENGINES", "LARGURA", "MazeGenerator", "START_POS",
+           "SolveResult", "build_scenario", "make_engine"]
@@ -0,0 +1,174 @@
+"""Instrumentacao opcional: tempo por fase e contadores.
+
+Desligado por padrao; nesse estado phase() devolve um contexto nulo
+compartilhado e count() retorna na hora, entao as chamadas podem ficar no
+codigo sem custo perceptivel. Ligado (enable()), cada fase acumula
+chamadas/tempo total/maximo e vira um evento na linha do tempo, que pode
+ser salva no formato Chrome trace (chrome://tracing ou ui.perfetto.dev).
+
+    import perfil
+    perfil.enable()
+    with perfil.phase("solve"):
+        ...
+    perfil.count("frames")
+    print(perfil.summary())
+    perfil.save_trace("perfil.json")
+"""
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+_NULL = nullcontext()
+
+
+class _Phase:
+    __slots__ = ("_perfil", "_name", "_t0")
+
+    def __init__(self, perfil, name):
+        self._perfil = perfil
+        self._name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self._perfil._add(self._name, self._t0, time.perf_counter_ns())
+        return False
+
+
+class Perfil:
+    """Tempos por fase, contadores e eventos de uma execucao"""
+
+    def __init__(self):
+        self.t0 = time.perf_counter_ns()
+        self.calls = {}
+        self.total = {}
+        self.max = {}
+        self.counters = {}
+        self.events = []
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def _add(self, name, t0, t1):
+        dt = t1 - t0
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.total[name] = self.total.get(name, 0) + dt
+        # primeira amostra sempre registra (mesmo com 0 ns)
+        self.max[name] = max(dt, self.max.get(name, 0))
+        self.events.append((name, t0, dt, threading.get_ident()))
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        """Chamadas, tempos e contadores (sem a linha do tempo), para merge() em outro processo"""
+        return {"calls": dict(self.calls), "total": dict(self.total), "max": dict(self.max),
+                "counters": dict(self.counters)}
+
+    def merge(self, stats):
+        """Soma um snapshot() de outro Perfil (ex: processo renderizador)"""
+        for name, n in stats["calls"].items():
+            self.calls[name] = self.calls.get(name, 0) + n
+            self.total[name] = self.total.get(name, 0) + stats["total"][name]
+            self.max[name] = max(stats["max"][name], self.max.get(name, 0))
+        for name, value in stats["counters"].items():
+            self.count(name, value)
+
+    def summary(self):
+        """Tabela com tempo por fase (mais caras primeiro) e contadores"""
+        wall = (time.perf_counter_ns() - self.t0) / 1e9
+        lines = [f"{'fase':<20} {'chamadas':>9} {'total (s)':>10} {'media (ms)':>11} "
+                 f"{'max (ms)':>9} {'% tempo':>8}"]
+        for name in sorted(self.total, key=self.total.get, reverse=True):
+            total = self.total[name] / 1e9
+            calls = self.calls[name]
+            lines.append(f"{name:<20} {calls:>9} {total:>10.4f} {total * 1e3 / calls:>11.3f} "
+                         f"{self.max[name] / 1e6:>9.3f} {100 * total / wall:>7.1f}%")
+        for name, value in self.counters.items():
+            lines.append(f"{name:<20} {value:>9}")
+        lines.append(f"tempo total: {wall:.3f}s")
+        return "\n".join(lines)
+
+    def save_trace(self, path):
+        """Grava a linha do tempo em JSON no formato Chrome trace"""
+        import json
+
+        pid = os.getpid()
+        end = (time.perf_counter_ns() - self.t0) / 1e3
+        events = [{"name": name, "ph": "X", "ts": (t0 - self.t0) / 1e3, "dur": dt / 1e3,
+                   "pid": pid, "tid": tid}
+                  for name, t0, dt, tid in self.events]
+        events += [{"name": name, "ph": "C", "ts": end, "pid": pid, "args": {name: value}}
+                   for name, value in self.counters.items()]
+        with open(path, "w") as fp:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fp)
+
+
+# perfil ativo (None = desligado)
+_atual = None
+
+
+def enable():
+    """Liga a instrumentacao (recomeca do zero) e devolve o Perfil"""
+    global _atual
+    _atual = Perfil()
+    return _atual
+
+
+def disable():
+    global _atual
+    _atual = None
+
+
+def enabled():
+    return _atual is not None
+
+
+def phase(name):
+    """Contexto que mede a fase 'name' (nulo se desligado)"""
+    if _atual is None:
+        return _NULL
+    return _Phase(_atual, name)
+
+
+def count(name, n=1):
+    if _atual is not None:
+        _atual.count(name, n)
+
+
+def count_solver(agente):
+    """Soma os contadores de um agente terminado (expansoes, fila)"""
+    if _atual is None:
+        return
+    _atual.count("expansions", agente.expanded)
+    pushes = agente.heap_pushes
+    if pushes is not None:
+        _atual.count("heap_pushes", pushes)
+        _atual.count("stale_pops", agente.stale_pops)
+
+
+def collect():
+    """snapshot() do perfil ativo, recomecando do zero (None se desligado)"""
+    global _atual
+    if _atual is None:
+        return None
+    stats = _atual.snapshot()
+    _atual = Perfil()
+    return stats
+
+
+def merge(stats):
+    if _atual is not None and stats is not None:
+        _atual.merge(stats)
+
+
+def summary():
+    return _atual.summary() if _atual is not None else ""
+
+
+def save_trace(path):
+    if _atual is not None:
+        _atual.save_trace(path)
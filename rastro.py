@@ -0,0 +1,237 @@
+"""Rastro binario da busca: um registro de tamanho fixo por passo.
+
+Cada chamada de solve_step vira um registro NumPy (RECORD) com o no
+expandido, seu pai, g, f, o status apos o passo e a tripla (avo, pai,
+filho) mostrada no painel de acoes. O arquivo e um cabecalho fixo de 64
+bytes seguido dos registros, gravados em blocos conforme a busca anda;
+se o objetivo e alcancado, o caminho final vem no fim como registros com
+status PATH (uma celula cada). A leitura usa np.memmap, entao da para
+reproduzir (ou comparar) rastros grandes sem carregar tudo e ate
+acompanhar um rastro ainda sendo gravado.
+"""
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"MAZETR\x00\x01"
+HEADER = struct.Struct("<8sIIIiiiiqQ12x")  # magic, versao, altura, largura, partida, objetivo, seed, passos
+VERSION = 2  # v2: caminho final no fim (registros PATH); v1 ainda e lido
+NO_SEED = -2**63
+
+STATUS = ("searching", "goal_found", "no_path")
+PATH = 255  # registro do caminho final (y, x)
+
+RECORD = np.dtype([
+    ("y", "<i4"), ("x", "<i4"),    # no expandido (-1 se o passo nao expandiu)
+    ("py", "<i4"), ("px", "<i4"),  # pai do no expandido
+    ("g", "<i4"), ("f", "<i4"),
+    ("status", "u1"),
+    ("acao", "<i4", (6,)),         # (avo, pai, filho) do ultimo no descoberto
+])
+
+# registros por bloco gravado
+CHUNK = 4096
+
+
+def _last_triple(agente):
+    # tripla do painel de acoes em 6 inteiros (-1 onde nao houver)
+    return sum((tuple(n) if n is not None else (-1, -1) for n in agente.last_triple()), ())
+
+
+class TraceWriter:
+    """Grava registros em blocos; o total de passos vai no cabecalho ao fechar"""
+
+    def __init__(self, path, shape, start, goal, seed=None, chunk=CHUNK):
+        self.filename = path
+        self.count = 0
+        self._header = (shape[0], shape[1], start[0], start[1], goal[0], goal[1],
+                        NO_SEED if seed is None else seed)
+        self._buffer = np.zeros(chunk, dtype=RECORD)
+        self._used = 0
+        self._fp = open(path, "wb")
+        self._fp.write(HEADER.pack(MAGIC, VERSION, *self._header, 0))
+
+    def append(self, agente, status, expanded):
+        rec = self._buffer[self._used]
+        if expanded:
+            node = agente._index(agente.current)
+            parent = int(agente.parent[node])
+            rec["y"], rec["x"] = agente.current
+            rec["py"], rec["px"] = divmod(parent, agente.width) if parent >= 0 else (-1, -1)
+            rec["g"], rec["f"] = agente.g[node], agente.f[node]
+        else:
+            rec["y"] = rec["x"] = rec["py"] = rec["px"] = -1
+            rec["g"] = rec["f"] = -1
+        rec["status"] = STATUS.index(status)
+        rec["acao"] = _last_triple(agente)
+
+        self._used += 1
+        if self._used == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._used:
+            self._fp.write(self._buffer[:self._used].tobytes())
+            self.count += self._used
+            self._used = 0
+            self._fp.flush()
+
+    def write_path(self, path):
+        """Grava o caminho final depois dos passos"""
+        self.flush()
+        cells = np.zeros(len(path), dtype=RECORD)
+        cells["status"] = PATH
+        if len(path):
+            cells["y"], cells["x"] = np.asarray(path, dtype=np.int32).T
+        self._fp.write(cells.tobytes())
+
+    def close(self):
+        if self._fp.closed:
+            return
+        self.flush()
+        self._fp.seek(0)
+        self._fp.write(HEADER.pack(MAGIC, VERSION, *self._header, self.count))
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_trace(agente, path, seed=None, chunk=CHUNK):
+    """Roda o solver passo a passo gravando o rastro em path; retorna o status"""
+    status = agente.status
+    with TraceWriter(path, agente.maze.shape, agente.start, agente.goal, seed, chunk) as writer:
+        while status == "searching":
+            antes = agente.expanded
+            status = agente.solve_step()
+            writer.append(agente, status, agente.expanded != antes)
+        if status == "goal_found":
+            writer.write_path(agente.path)
+    return status
+
+
+class TraceReader:
+    """Le um rastro gravado (np.memmap por padrao)"""
+
+    def __init__(self, path, mmap=True):
+        with open(path, "rb") as fp:
+            magic, version, h, w, sy, sx, gy, gx, seed, count = HEADER.unpack(fp.read(HEADER.size))
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"Arquivo de rastro invalido: {path}")
+
+        self.filename = path
+        self.version = version
+        self.shape = (h, w)
+        self.start = (sy, sx)
+        self.goal = (gy, gx)
+        self.seed = None if seed == NO_SEED else seed
+
+        # rastro ainda sendo gravado (ou interrompido): vale o tamanho do arquivo
+        available = (os.path.getsize(path) - HEADER.size) // RECORD.itemsize
+        if not available:
+            records = np.zeros(0, dtype=RECORD)
+        elif mmap:
+            records = np.memmap(path, dtype=RECORD, mode="r", offset=HEADER.size, shape=(available,))
+        else:
+            records = np.fromfile(path, dtype=RECORD, count=available, offset=HEADER.size)
+
+        # passos primeiro, caminho final (se houver) no fim
+        steps = count if count else available
+        if version > 1 and count == 0 and available and records[-1]["status"] == PATH:
+            steps = int(np.flatnonzero(records["status"] != PATH)[-1]) + 1
+        self.records = records[:steps]
+        self._path = records[steps:]
+        self.complete = count > 0
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def status(self):
+        return STATUS[self.records[-1]["status"]] if len(self.records) else "searching"
+
+    def status_at(self, step):
+        return STATUS[self.records[step]["status"]]
+
+    def expanded_cells(self, i0, i1):
+        """Nos expandidos nos passos [i0, i1) como lista de (y, x)"""
+        rec = self.records[i0:i1]
+        keep = rec["y"] >= 0
+        return list(zip(rec["y"][keep].tolist(), rec["x"][keep].tolist()))
+
+    def triple(self, step):
+        """(avo, pai, filho) do painel de acoes apos o passo 'step'"""
+        gy, gx, py, px, cy, cx = self.records[step]["acao"].tolist()
+        return ((gy, gx) if gy >= 0 else None, (py, px) if py >= 0 else None, (cy, cx))
+
+    def path(self):
+        """Caminho final gravado (vazio se a busca nao achou o objetivo)"""
+        if self.version == 1:
+            return self._path_from_parents()
+        return list(zip(self._path["y"].tolist(), self._path["x"].tolist()))
+
+    def _path_from_parents(self):
+        # v1 nao grava o caminho: segue os pais dos nos expandidos (so A* celula a celula)
+        if self.status != "goal_found":
+            return []
+        rec = self.records
+        done = rec["y"] >= 0
+        w = self.shape[1]
+        node = rec["y"][done].astype(np.int64) * w + rec["x"][done]
+        parent = np.where(rec["py"][done] >= 0, rec["py"][done].astype(np.int64) * w + rec["px"][done], -1)
+        parents = dict(zip(node.tolist(), parent.tolist()))
+
+        current = self.goal[0] * w + self.goal[1]
+        path = [self.goal]
+        while parents.get(current, -1) >= 0:
+            current = parents[current]
+            path.append(divmod(current, w))
+        return path[::-1]
+
+    def frames(self, steps_per_frame=1, seek=0):
+        """Gera (status, nos novos, passo) por quadro; o 1o quadro ja vai ate 'seek'"""
+        total = len(self)
+        i = 0
+        stop = min(max(seek, steps_per_frame), total)
+        while i < total:
+            yield self.status_at(stop - 1), self.expanded_cells(i, stop), stop - 1
+            i, stop = stop, min(stop + steps_per_frame, total)
+
+
+def first_difference(a, b):
+    """Primeiro passo em que dois rastros diferem (-1 se iguais)"""
+    ra, rb = a.records, b.records
+    n = min(len(ra), len(rb))
+    differ = np.flatnonzero(ra[:n].view(np.uint8).reshape(n, -1) != rb[:n].view(np.uint8).reshape(n, -1))
+    if len(differ):
+        return int(differ[0] // RECORD.itemsize)
+    return -1 if len(ra) == len(rb) else n
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compara dois rastros gravados com main.py --record")
+    parser.add_argument("a")
+    parser.add_argument("b")
+    args = parser.parse_args(argv)
+
+    a, b = TraceReader(args.a), TraceReader(args.b)
+    step = first_difference(a, b)
+    if step < 0:
+        print(f"Rastros iguais ({len(a)} passos)")
+        return 0
+
+    print(f"Primeira diferenca no passo {step} ({len(a)} x {len(b)} passos)")
+    for name, trace in (("a", a), ("b", b)):
+        if step < len(trace):
+            print(f"  {name}: {trace.records[step]}")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
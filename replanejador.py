@@ -0,0 +1,234 @@
+"""Replanejamento incremental (LPA*) para labirintos que mudam.
+
+AgenteLPA tem a mesma interface do Agente (solve_step, solve, path,
+g_score, came_from...) e, alem disso, update_cells(mudancas): as celulas
+alteradas e seus vizinhos tem o rhs (melhor g via um vizinho) refeito e
+so os nos que ficaram inconsistentes (g != rhs) voltam para a fila. A
+proxima chamada de solve conserta g/came_from a partir dai em vez de
+refazer a busca inteira.
+
+Partida e objetivo sao fixos (LPA*); para um agente que anda durante a
+busca seria o D* Lite, que e a mesma ideia buscando do objetivo para tras.
+"""
+import heapq
+
+import numpy as np
+
+from agente import INF, Agente
+from mazeGen import MazeGenerator
+from mazeStore import as_matrix
+
+
+class AgenteLPA(Agente):
+    def __init__(self, maze, start, goal, index=None):
+        # matriz e celulas livres (do indice, se houver) sao do chamador ate a
+        # primeira mudanca; update_cells copia antes de alterar
+        super().__init__(maze, start, goal, index=index)
+        self._owned = False
+
+        # LPA*: g comeca infinito em todos, rhs(partida) = 0
+        self.rhs = np.full(self.size, INF, dtype=np.int32)
+        self.g[self._start_idx] = INF
+        self.open_set = []
+        self.updates = 0
+        self.key_updates = 0
+
+        # a partida entra na fila mesmo com componentes diferentes: uma
+        # mudanca pode ligar os dois lados depois
+        s = self._start_idx
+        if self._passable[s]:
+            self.rhs[s] = 0
+            self.f[s] = self._calculate_heuristic(self.start)
+            heapq.heappush(self.open_set, (int(self.f[s]), 0, s))
+
+    def _views(self):
+        # memoryviews: leitura/escrita escalar sem criar escalares numpy
+        return (memoryview(self.g), memoryview(self.rhs), memoryview(self.f),
+                memoryview(self.parent), memoryview(self.order))
+
+    def _update_vertex(self, u, views):
+        """Refaz rhs(u) = min g(vizinho) + 1 e poe u na fila se ficou inconsistente"""
+        g, rhs, f, parent, order = views
+        w = self.width
+        if u == self._start_idx:
+            # partida emparedada deixa de ser fonte (e volta a ser quando reabre)
+            rhs[u] = 0 if self._passable[u] else INF
+        else:
+            best, via = INF, -1
+            if self._passable[u]:
+                passable = self._passable
+                x = u % w
+                for v, inside in ((u + 1, x + 1 < w), (u - 1, x > 0),
+                                  (u + w, u + w < self.size), (u - w, u >= w)):
+                    if inside and passable[v] and g[v] < best - 1:
+                        best, via = g[v] + 1, v
+            rhs[u] = best
+            # came_from guarda o ultimo predecessor valido
+            if via >= 0:
+                if parent[u] < 0:
+                    order[self.discovered] = u
+                    self.discovered += 1
+                parent[u] = via
+        if g[u] != rhs[u]:
+            m = min(g[u], rhs[u])
+            y, x = divmod(u, w)
+            gy, gx = self.goal
+            f[u] = k1 = m + abs(y - gy) + abs(x - gx)
+            heapq.heappush(self.open_set, (k1, m, u))
+
+    def _expand(self, limit):
+        if self.status != "searching":
+            return self.status
+
+        views = self._views()
+        g, rhs, f, parent, order = views
+        closed = memoryview(self.closed)
+        passable = self._passable
+        update = self._update_vertex
+
+        heap = self.open_set
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+
+        w = self.width
+        size = self.size
+        start = self._start_idx
+        goal = self._goal_idx
+        gy, gx = divmod(goal, w)
+
+        steps = 0
+        last = -1
+        try:
+            while True:
+                if limit is not None and steps >= limit:
+                    return self.status
+
+                # topo valido: descarta consistentes e corrige chaves velhas
+                while heap:
+                    k1, k2, u = heap[0]
+                    gu, ru = g[u], rhs[u]
+                    if gu == ru:
+                        heappop(heap)
+                        self.stale_pops += 1
+                        continue
+                    m = gu if gu < ru else ru
+                    if m != k2:
+                        y, x = divmod(u, w)
+                        heapq.heapreplace(heap, (m + abs(y - gy) + abs(x - gx), m, u))
+                        self.key_updates += 1
+                        continue
+                    break
+
+                # para quando o objetivo esta consistente e nada na fila o melhora
+                m = min(g[goal], rhs[goal])
+                if not heap or (g[goal] == rhs[goal] and heap[0][:2] >= (m, m)):
+                    if g[goal] == INF or not self._reconstruct_path():
+                        self.path = []
+                        self.status = "no_path"
+                    else:
+                        self.status = "goal_found"
+                    return self.status
+
+                u = heappop(heap)[2]
+                steps += 1
+                self.expanded += 1
+                last = u
+
+                x = u % w
+                neighbors = [v for v, inside in ((u + 1, x + 1 < w), (u - 1, x > 0),
+                                                 (u + w, u + w < size), (u - w, u >= w))
+                             if inside and passable[v]]
+                if g[u] > rhs[u]:
+                    # sobre-consistente: fixa g e propaga so se melhorar o vizinho
+                    g[u] = gu = rhs[u]
+                    closed[u] = 1
+                    for v in neighbors:
+                        if v != start and gu + 1 < rhs[v]:
+                            if parent[v] < 0:
+                                order[self.discovered] = v
+                                self.discovered += 1
+                            parent[v] = u
+                            rhs[v] = m = gu + 1
+                            if g[v] != m:
+                                ny, nx = divmod(v, w)
+                                f[v] = k1 = m + abs(ny - gy) + abs(nx - gx)
+                                heappush(heap, (k1, m, v))
+                else:
+                    # sub-consistente (caminho piorou): invalida u e quem dependia dele
+                    g[u] = INF
+                    update(u, views)
+                    for v in neighbors:
+                        if parent[v] == u:
+                            update(v, views)
+        finally:
+            if last >= 0:
+                self.current = divmod(last, w)
+
+    def _reconstruct_path(self):
+        """Do objetivo para tras sempre por um vizinho com g = g - 1; False se travar"""
+        g = memoryview(self.g)
+        passable = self._passable
+        w = self.width
+        current = self._goal_idx
+        path = [divmod(current, w)]
+        while current != self._start_idx:
+            x = current % w
+            for v, inside in ((current + 1, x + 1 < w), (current - 1, x > 0),
+                              (current + w, current + w < self.size), (current - w, current >= w)):
+                if inside and passable[v] and g[v] + 1 == g[current]:
+                    current = v
+                    break
+            else:
+                # nenhum predecessor consistente: g desatualizado, nao ha caminho a montar
+                return False
+            path.append(divmod(current, w))
+        self.path = path[::-1]
+        return True
+
+    @property
+    def heap_pushes(self):
+        # correcoes de chave trocam uma entrada por outra (heapreplace)
+        return super().heap_pushes + self.key_updates
+
+    def update_cells(self, changes):
+        """Aplica mudancas [((y, x), PATH ou WALL), ...] e prepara o reparo.
+
+        Retorna quantas celulas mudaram de fato; se alguma mudou, o status
+        volta para "searching" e solve()/solve_step() refazem so o
+        necessario.
+        """
+        w = self.width
+        touched = set()
+        for (y, x), value in changes:
+            idx = y * w + x
+            free = value == MazeGenerator.PATH
+            if bool(self._passable[idx]) == free:
+                continue
+            if not self._owned:
+                self.maze = np.array(as_matrix(self.maze))
+                self._passable = bytearray(self._passable)
+                self._owned = True
+            self.maze[y, x] = value
+            self._passable[idx] = free
+            touched.add(idx)
+
+        if not touched:
+            return 0
+
+        # celulas mudadas e vizinhas (o custo das arestas entre elas mudou)
+        affected = set(touched)
+        for idx in touched:
+            x = idx % w
+            for v, inside in ((idx + 1, x + 1 < w), (idx - 1, x > 0),
+                              (idx + w, idx + w < self.size), (idx - w, idx >= w)):
+                if inside:
+                    affected.add(v)
+        views = self._views()
+        for u in affected:
+            if not self._passable[u]:
+                self.g[u] = INF
+            self._update_vertex(u, views)
+
+        self.updates += 1
+        self.status = "searching"
+        return len(touched)
@@ -0,0 +1,42 @@
+import os
+import sys
+from collections import deque
+
+import numpy as np
+
+# os modulos do projeto ficam na raiz (sem pacote)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def bfs_distance(maze, start, goal):
+    """Distancia de referencia (BFS simples) ou None se nao ha caminho"""
+    maze = np.asarray(maze)
+    h, w = maze.shape
+    if maze[start] != 0 or maze[goal] != 0:
+        return None
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        y, x = queue.popleft()
+        if (y, x) == goal:
+            return dist[(y, x)]
+        for ny, nx in ((y, x + 1), (y, x - 1), (y + 1, x), (y - 1, x)):
+            if 0 <= ny < h and 0 <= nx < w and maze[ny, nx] == 0 and (ny, nx) not in dist:
+                dist[(ny, nx)] = dist[(y, x)] + 1
+                queue.append((ny, nx))
+    return None
+
+
+def assert_valid_path(maze, path, start, goal):
+    assert path[0] == tuple(start) and path[-1] == tuple(goal)
+    for (ay, ax), (by, bx) in zip(path, path[1:]):
+        assert abs(ay - by) + abs(ax - bx) == 1
+        assert maze[by, bx] == 0
+
+
+def corner_scenario(seed, width, height):
+    """Labirinto perfeito da seed, com partida e objetivo em cantos opostos"""
+    from mazeGen import MazeGenerator
+
+    maze = MazeGenerator(width, height, seed=seed).generate()
+    return maze, (1, 1), (maze.shape[0] - 2, maze.shape[1] - 2)
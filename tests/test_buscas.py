@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from buscas import ENGINES, make_engine
+from conftest import assert_valid_path, bfs_distance, corner_scenario
+from mazeGen import MazeGenerator
+
+
+def _open_walls(maze, count, seed):
+    # abre paredes internas ao acaso: varios caminhos de custos diferentes
+    maze = maze.copy()
+    h, w = maze.shape
+    ys, xs = np.nonzero(np.add.outer(np.arange(h), np.arange(w)) % 2 == 1)
+    inner = (ys > 0) & (ys < h - 1) & (xs > 0) & (xs < w - 1)
+    walls = np.flatnonzero(inner & (maze[ys, xs] == MazeGenerator.WALL))
+    picks = np.random.default_rng(seed).choice(walls, size=min(count, len(walls)), replace=False)
+    maze[ys[picks], xs[picks]] = MazeGenerator.PATH
+    return maze
+
+
+def _mazes():
+    # perfeitos (um caminho) e com ciclos
+    for seed in range(3):
+        yield corner_scenario(seed, 8, 8)
+    for seed in range(3):
+        maze, start, goal = corner_scenario(seed, 8, 8)
+        yield _open_walls(maze, 20, seed), start, goal
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_engines_match_bfs_distance(engine):
+    for maze, start, goal in _mazes():
+        result = make_engine(engine, maze, start, goal).solve()
+        assert result.status == "goal_found"
+        assert result.cost == bfs_distance(maze, start, goal)
+        assert_valid_path(maze, result.path, start, goal)
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_engines_report_no_path(engine):
+    maze, start, goal = corner_scenario(1, 8, 8)
+    y, x = goal
+    maze[y - 1:y + 2, x - 1:x + 2] = MazeGenerator.WALL
+    maze[y, x] = MazeGenerator.PATH
+    result = make_engine(engine, maze, start, goal).solve()
+    assert result.status == "no_path"
+    assert result.cost is None
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_explored_nodes_len_matches_iteration(engine):
+    maze, start, goal = corner_scenario(2, 8, 8)
+    agente = make_engine(engine, _open_walls(maze, 20, 2), start, goal)
+    agente.solve()
+    nodes = list(agente.explored_nodes)
+    assert len(agente.explored_nodes) == len(nodes) == len(set(nodes))
+    assert len(agente.came_from) == len(list(agente.came_from))
+
+
+@pytest.mark.parametrize("engine", ["idastar", "fringe"])
+def test_low_memory_engines_keep_only_reached_nodes(engine):
+    maze = MazeGenerator(64, 64, seed=1).generate()
+    agente = make_engine(engine, maze, (1, 1), (9, 9))
+    result = agente.solve()
+    assert result.cost == bfs_distance(maze, (1, 1), (9, 9))
+    for state in (agente.g, agente.f, agente.parent, agente.closed):
+        assert isinstance(state, dict)
+        assert len(state) < agente.size // 10
+
+
+def test_idastar_prunes_transpositions():
+    # grade aberta com um muro no meio: muitos caminhos para as mesmas celulas
+    maze = np.zeros((9, 9), dtype=np.uint8)
+    maze[:8, 4] = MazeGenerator.WALL
+    result = make_engine("idastar", maze, (0, 0), (0, 8)).solve()
+    assert result.cost == 24
+    assert result.expanded < 5 * maze.size
@@ -0,0 +1,19 @@
+import pytest
+
+from conftest import corner_scenario
+from grafos import visualizadorGrafos
+
+
+@pytest.mark.parametrize("junk", [b"", b"lixo" * 20, b"PK\x03\x04" + b"\x00" * 40, "metade"],
+                         ids=["vazio", "lixo", "zip", "metade"])
+def test_corrupt_layout_cache_is_rebuilt(tmp_path, junk):
+    maze, start, goal = corner_scenario(1, 8, 8)
+    pos = visualizadorGrafos(maze, start, goal, seed=1, layout_cache=tmp_path).pos
+    (cache,) = tmp_path.glob("*.npz")
+    if junk == "metade":
+        junk = cache.read_bytes()[:cache.stat().st_size // 2]
+    cache.write_bytes(junk)
+
+    assert visualizadorGrafos(maze, start, goal, seed=1, layout_cache=tmp_path).pos == pos
+    # cache refeito e valido de novo
+    assert visualizadorGrafos(maze, start, goal, seed=1, layout_cache=tmp_path).pos == pos
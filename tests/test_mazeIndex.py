@@ -0,0 +1,31 @@
+import pytest
+
+from conftest import bfs_distance, corner_scenario
+from mazeIndex import MazeIndex
+
+
+def test_connected_and_distance_match_bfs():
+    maze, start, goal = corner_scenario(4, 9, 7)
+    index = MazeIndex(maze)
+    assert index.connected(start, goal)
+    assert index.distance(start, goal) == bfs_distance(maze, start, goal)
+    assert not index.connected(start, (0, 0))
+
+
+@pytest.mark.parametrize("cell", [(-1, 1), (1, -1), (15, 1), (1, 19)])
+def test_cells_outside_the_maze_are_rejected(cell):
+    maze, start, _ = corner_scenario(4, 9, 7)
+    index = MazeIndex(maze)
+    with pytest.raises(IndexError):
+        index.connected(start, cell)
+    with pytest.raises(IndexError):
+        index.path(cell, start)
+
+
+def test_batch_distances_match_single_queries():
+    maze, start, goal = corner_scenario(4, 9, 7)
+    index = MazeIndex(maze)
+    pairs = [(start, goal), (goal, (1, 3)), ((3, 5), (3, 5))]
+    assert index.distances(pairs).tolist() == [index.distance(a, b) for a, b in pairs]
+    with pytest.raises(IndexError):
+        index.distances([(start, (-1, 1))])
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from agente import Agente
+from mazeGen import MazeGenerator
+import mazeStore
+from mazeIndex import MazeIndex
+from mazeStore import PackedMaze, as_matrix, passable_bytes
+
+
+@pytest.mark.parametrize("algorithm", MazeGenerator.ALGORITHMS)
+@pytest.mark.parametrize("size", [(1, 1), (5, 3), (13, 7)])
+def test_matrix_round_trip(algorithm, size):
+    w, h = size
+    maze = MazeGenerator(w, h, seed=4, algorithm=algorithm).generate()
+    packed = PackedMaze.from_matrix(maze)
+    assert packed.shape == maze.shape
+    assert (packed.to_matrix() == maze).all()
+    assert (as_matrix(packed) == maze).all()
+
+
+def test_row_slices_and_scalar_access():
+    maze = MazeGenerator(9, 11, seed=1).generate()
+    packed = PackedMaze.from_matrix(maze)
+    for y0, y1 in ((0, 11), (3, 7), (10, 11)):
+        assert (packed.to_matrix(y0, y1) == maze[2 * y0:2 * y1 + 1]).all()
+    for my in range(maze.shape[0]):
+        for mx in range(maze.shape[1]):
+            assert packed[my, mx] == maze[my, mx]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_file_round_trip(tmp_path, mmap):
+    maze = MazeGenerator(21, 6, seed=2).generate()
+    out = tmp_path / "labirinto.mzp"
+    PackedMaze.from_matrix(maze).save(out)
+    loaded = PackedMaze.load(out, mmap=mmap)
+    assert isinstance(loaded.data, np.memmap) == mmap
+    assert (loaded.to_matrix() == maze).all()
+
+    # o agente aceita o formato compacto direto
+    goal = (maze.shape[0] - 2, maze.shape[1] - 2)
+    assert Agente(loaded, (1, 1), goal).solve().cost == Agente(maze, (1, 1), goal).solve().cost
+
+
+def test_passable_without_full_matrix(monkeypatch):
+    monkeypatch.setattr(mazeStore, "BLOCK_ROWS", 3)
+    maze = MazeGenerator(7, 10, seed=3).generate()
+    packed = PackedMaze.from_matrix(maze)
+    assert bytes(passable_bytes(packed)) == passable_bytes(maze) == (maze == 0).tobytes()
+    assert MazeIndex(packed).passable == MazeIndex(maze).passable
+
+
+def test_load_rejects_other_files(tmp_path):
+    out = tmp_path / "lixo.bin"
+    out.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        PackedMaze.load(out)
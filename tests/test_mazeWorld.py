@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from conftest import assert_valid_path, bfs_distance
+from mazeField import distance_field
+from mazeWorld import HPAStar, MazeWorld
+
+
+def _full(world):
+    return world.window(0, world.shape[0], 0, world.shape[1])
+
+
+@pytest.mark.parametrize("doors,braid", [(1, 0.0), (2, 0.0), (3, 0.5)])
+def test_hpa_cost_matches_flat_bfs(doors, braid):
+    world = MazeWorld(seed=5, tiles_x=3, tiles_y=3, tile=4, doors=doors, braid=braid)
+    maze = _full(world)
+    h, w = maze.shape
+    hpa = HPAStar(world)
+    pairs = [((1, 1), (h - 2, w - 2)), ((h - 2, 1), (1, w - 2)),
+             ((1, 1), (3, 5)), ((9, 9), (15, 1)), ((5, 7), (5, 7))]
+    # celulas de porta tambem como partida e objetivo
+    pairs.append((world.tile_doors(1, 1)[0], world.tile_doors(0, 2)[-1]))
+    for start, goal in pairs:
+        result = hpa.solve(start, goal)
+        assert result.status == "goal_found"
+        assert result.cost == bfs_distance(maze, start, goal)
+        assert len(result.path) == result.cost + 1
+        assert_valid_path(maze, result.path, start, goal)
+
+
+def test_world_is_connected():
+    world = MazeWorld(seed=11, tiles_x=4, tiles_y=3, tile=5, doors=1)
+    maze = _full(world)
+    dist = distance_field(maze, [(1, 1)])
+    assert ((dist >= 0) == (maze == world.PATH)).all()
+
+
+def test_tiles_independent_of_generation_order():
+    a = MazeWorld(seed=3, tiles_x=3, tiles_y=3, tile=4, cache=1)
+    b = MazeWorld(seed=3, tiles_x=3, tiles_y=3, tile=4)
+    full = _full(a)
+    for tx, ty in [(2, 2), (0, 1), (1, 0), (2, 2)]:
+        oy, ox = b.origin(tx, ty)
+        assert (b.tile(tx, ty) == full[oy:oy + b.span + 1, ox:ox + b.span + 1]).all()
+    assert len(a) == 1
+    assert a[full.shape[0] - 2, 1] == full[-2, 1]
+
+
+def test_small_caches_and_walls():
+    world = MazeWorld(seed=9, tiles_x=3, tiles_y=2, tile=4, cache=1)
+    maze = _full(world)
+    hpa = HPAStar(world, edge_cache=1)
+    goal = (maze.shape[0] - 2, maze.shape[1] - 2)
+    assert hpa.solve((1, 1), goal).cost == bfs_distance(maze, (1, 1), goal)
+    assert hpa.solve((0, 0), goal).status == "no_path"
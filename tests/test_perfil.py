@@ -0,0 +1,40 @@
+import perfil
+
+
+def test_zero_duration_phase_in_summary():
+    p = perfil.Perfil()
+    p._add("vazia", 100, 100)
+    p._add("curta", 100, 100)
+    p._add("curta", 100, 150)
+    assert p.max == {"vazia": 0, "curta": 50}
+    assert "vazia" in p.summary()
+
+
+def test_summary_counts_and_trace(tmp_path):
+    import json
+
+    p = perfil.Perfil()
+    with p.phase("solve"):
+        pass
+    p.count("frames", 3)
+    text = p.summary()
+    assert "solve" in text and "frames" in text
+
+    out = tmp_path / "perfil.json"
+    p.save_trace(out)
+    events = json.loads(out.read_text())["traceEvents"]
+    assert {e["name"] for e in events} == {"solve", "frames"}
+
+
+def test_merge_adds_worker_stats():
+    worker = perfil.Perfil()
+    worker._add("canvas", 0, 30)
+    worker.count("frames", 2)
+    main = perfil.Perfil()
+    main._add("canvas", 0, 10)
+    main.merge(worker.snapshot())
+    main.merge(worker.snapshot())
+    assert main.calls["canvas"] == 3
+    assert main.total["canvas"] == 70
+    assert main.max["canvas"] == 30
+    assert main.counters["frames"] == 4
@@ -0,0 +1,92 @@
+import pytest
+
+import rastro
+from agente import Agente
+from conftest import corner_scenario
+from rastro import TraceReader, first_difference, record_trace
+
+
+def _triple(agente):
+    # (avo, pai, filho) do ultimo no descoberto, pela visao came_from
+    if not agente.came_from:
+        return None, None, agente.start
+    node = list(agente.came_from)[-1]
+    parent = agente.came_from[node]
+    return agente.came_from.get(parent), parent, node
+
+
+@pytest.fixture
+def traced(tmp_path):
+    labirinto, start, goal = corner_scenario(5, 10, 10)
+    out = tmp_path / "busca.trace"
+    status = record_trace(Agente(labirinto, start, goal), out, seed=5)
+    return labirinto, start, goal, out, status
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(traced, mmap):
+    labirinto, start, goal, out, status = traced
+    reader = TraceReader(out, mmap=mmap)
+    assert reader.complete
+    assert reader.shape == labirinto.shape
+    assert (reader.start, reader.goal, reader.seed) == (start, goal, 5)
+    assert reader.status == status == "goal_found"
+
+    # mesmos passos, na mesma ordem, que o agente ao vivo
+    agente = Agente(labirinto, start, goal)
+    expanded = []
+    for step in range(len(reader)):
+        antes = agente.expanded
+        agente.solve_step()
+        if agente.expanded != antes:
+            expanded.append(agente.current)
+        assert reader.triple(step) == _triple(agente)
+    assert reader.expanded_cells(0, len(reader)) == expanded
+    assert reader.path() == agente.path
+
+
+def test_seek_and_frames(traced):
+    _, _, _, out, _ = traced
+    reader = TraceReader(out)
+    total = len(reader)
+    everything = reader.expanded_cells(0, total)
+
+    frames = list(reader.frames(steps_per_frame=7))
+    assert sum((novos for _, novos, _ in frames), []) == everything
+    assert frames[-1][0] == "goal_found" and frames[-1][2] == total - 1
+
+    # o primeiro quadro ja cobre tudo ate 'seek'
+    seek = total // 2
+    first = next(reader.frames(steps_per_frame=7, seek=seek))
+    assert first[1] == reader.expanded_cells(0, seek)
+    assert first[2] == seek - 1
+
+
+def test_first_difference(tmp_path, traced):
+    labirinto, start, goal, out, _ = traced
+    same = tmp_path / "igual.trace"
+    record_trace(Agente(labirinto, start, goal), same, seed=5)
+    assert first_difference(TraceReader(out), TraceReader(same)) == -1
+
+    other = tmp_path / "outro.trace"
+    record_trace(Agente(labirinto, start, (1, 3)), other, seed=5)
+    assert first_difference(TraceReader(out), TraceReader(other)) >= 0
+
+
+def test_version_1_still_readable(tmp_path, traced):
+    labirinto, start, goal, out, _ = traced
+    reader = TraceReader(out)
+    assert reader.version == rastro.VERSION
+
+    # v1: mesmo cabecalho com versao 1 e sem os registros do caminho no fim
+    data = out.read_bytes()
+    header = list(rastro.HEADER.unpack(data[:rastro.HEADER.size]))
+    header[1] = 1
+    old = tmp_path / "v1.trace"
+    old.write_bytes(rastro.HEADER.pack(*header)
+                    + data[rastro.HEADER.size:rastro.HEADER.size + len(reader) * rastro.RECORD.itemsize])
+
+    v1 = TraceReader(old)
+    assert v1.version == 1
+    assert len(v1) == len(reader)
+    assert v1.path() == reader.path() == Agente(labirinto, start, goal).solve().path
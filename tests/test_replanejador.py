@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from agente import Agente
+from conftest import assert_valid_path, corner_scenario
+from mazeGen import MazeGenerator
+from replanejador import AgenteLPA
+
+PATH, WALL = MazeGenerator.PATH, MazeGenerator.WALL
+
+
+def _inner_walls(maze):
+    # paredes entre celulas (uma coordenada par, outra impar), sem a borda
+    h, w = maze.shape
+    ys, xs = np.nonzero(np.add.outer(np.arange(h), np.arange(w)) % 2 == 1)
+    inner = (ys > 0) & (ys < h - 1) & (xs > 0) & (xs < w - 1)
+    return list(zip(ys[inner].tolist(), xs[inner].tolist()))
+
+
+def _check_against_full(agente, start, goal):
+    result = agente.solve()
+    full = Agente(agente.maze.copy(), start, goal).solve()
+    assert result.status == full.status
+    assert result.cost == full.cost
+    if result.status == "goal_found":
+        assert_valid_path(agente.maze, result.path, start, goal)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_toggle_batches_match_full_solve(seed):
+    labirinto, start, goal = corner_scenario(seed, 10, 10)
+    agente = AgenteLPA(labirinto, start, goal)
+    _check_against_full(agente, start, goal)
+
+    rng = np.random.default_rng(seed)
+    walls = _inner_walls(agente.maze)
+    for _ in range(15):
+        picks = rng.integers(len(walls), size=3)
+        changes = [(walls[i], 1 - int(agente.maze[walls[i]])) for i in picks.tolist()]
+        agente.update_cells(changes)
+        _check_against_full(agente, start, goal)
+
+
+@pytest.mark.parametrize("which", ["start", "goal"])
+def test_wall_and_unwall_endpoint(which):
+    labirinto, start, goal = corner_scenario(3, 10, 10)
+    agente = AgenteLPA(labirinto, start, goal)
+    cost = agente.solve().cost
+    cell = start if which == "start" else goal
+
+    assert agente.update_cells([(cell, WALL)]) == 1
+    result = agente.solve()
+    assert result.status == "no_path"
+    assert result.path == []
+
+    agente.update_cells([(cell, PATH)])
+    result = agente.solve()
+    assert result.status == "goal_found"
+    assert result.cost == cost
+    assert_valid_path(agente.maze, result.path, start, goal)
+
+
+def test_start_walled_from_the_beginning():
+    labirinto, start, goal = corner_scenario(3, 10, 10)
+    cost = Agente(labirinto, start, goal).solve().cost
+    labirinto = labirinto.copy()
+    labirinto[start] = WALL
+
+    agente = AgenteLPA(labirinto, start, goal)
+    assert agente.solve().status == "no_path"
+    agente.update_cells([(start, PATH)])
+    assert agente.solve().cost == cost
+
+
+def test_update_cells_does_not_touch_caller_maze():
+    labirinto, start, goal = corner_scenario(3, 10, 10)
+    before = labirinto.copy()
+    agente = AgenteLPA(labirinto, start, goal)
+    agente.solve()
+    agente.update_cells([(w, 1 - int(labirinto[w])) for w in _inner_walls(labirinto)[:5]])
+    agente.solve()
+    assert (labirinto == before).all()
+
+
+def test_index_is_shared_until_first_change():
+    from mazeIndex import MazeIndex
+
+    labirinto, start, goal = corner_scenario(3, 10, 10)
+    index = MazeIndex(labirinto)
+    agente = AgenteLPA(labirinto, start, goal, index=index)
+    assert agente.maze is labirinto
+    assert agente._passable is index.passable
+    cost = agente.solve().cost
+
+    # mudanca que nao muda nada nao copia
+    assert agente.update_cells([(start, PATH)]) == 0
+    assert agente.maze is labirinto
+
+    wall = _inner_walls(labirinto)[0]
+    agente.update_cells([(wall, 1 - int(labirinto[wall]))])
+    assert agente.maze is not labirinto
+    assert agente._passable is not index.passable
+    _check_against_full(agente, start, goal)
+    assert index.passable == MazeIndex(labirinto).passable
+    assert cost is not None
+
+
+def test_disconnected_index_can_be_reconnected():
+    from mazeIndex import MazeIndex
+
+    labirinto, start, goal = corner_scenario(3, 10, 10)
+    cost = Agente(labirinto, start, goal).solve().cost
+    blocked = labirinto.copy()
+    blocked[goal] = WALL
+    agente = AgenteLPA(blocked, start, goal, index=MazeIndex(blocked))
+    assert agente.solve().status == "no_path"
+
+    agente.update_cells([(goal, PATH)])
+    assert agente.solve().cost == cost